@@ -0,0 +1,103 @@
+import pandas as pd
+
+# Dimensions tracked per topic by PartialAggregates (processed-frame column names)
+TOPIC_DIMENSIONS = {
+    "travel": ["Location", "State", "Category", "Hour", "Sex", "AgeGroup"],
+    "politics": ["Party", "Politician", "Location", "State", "Hour", "Sex", "AgeGroup"],
+    "sports": ["Sport", "SportsPerson", "Location", "State", "Hour", "Sex", "AgeGroup"],
+    "cinema": ["Movie", "Industry", "Location", "State", "Hour", "Sex", "AgeGroup"],
+}
+
+
+def _empty_table():
+    return pd.DataFrame({"Engagement": pd.Series(dtype="int64"), "Count": pd.Series(dtype="int64")})
+
+
+class PartialAggregates:
+    """
+    Mergeable engagement sums and tweet counts per dimension value.
+
+    Built from processed chunks (update/from_frame) and combined with merge() or `+`,
+    so any number of chunks, workers or time windows can be reduced into one result
+    without keeping their rows around.
+    """
+
+    def __init__(self, topic="travel", dimensions=None):
+        self.topic = topic
+        self.dimensions = list(dimensions or TOPIC_DIMENSIONS.get(topic, ["Location", "State", "Hour"]))
+        self.tables = {dim: _empty_table() for dim in self.dimensions}
+        self.rows = 0
+        self.engagement = 0
+        self.likes = 0
+        self.retweets = 0
+
+    @classmethod
+    def from_frame(cls, df, topic="travel", dimensions=None):
+        return cls(topic, dimensions).update(df)
+
+    def update(self, df):
+        """Fold one processed DataFrame (a chunk) into the running totals."""
+        if df is None or df.empty:
+            return self
+        self.rows += len(df)
+        self.engagement += int(df["Engagement"].sum())
+        self.likes += int(df["Likes"].sum())
+        self.retweets += int(df["Retweets"].sum())
+        for dim in self.dimensions:
+            if dim not in df.columns:
+                continue
+            table = df.groupby(dim, observed=True)["Engagement"].agg(["sum", "count"])
+            table.columns = ["Engagement", "Count"]
+            self.tables[dim] = self._add(self.tables[dim], table)
+        return self
+
+    def merge(self, other):
+        """Fold another PartialAggregates into this one (in place) and return self."""
+        if other.topic != self.topic:
+            raise ValueError(f"Cannot merge {other.topic} aggregates into {self.topic} aggregates")
+        self.rows += other.rows
+        self.engagement += other.engagement
+        self.likes += other.likes
+        self.retweets += other.retweets
+        for dim, table in other.tables.items():
+            self.tables[dim] = self._add(self.tables.get(dim, _empty_table()), table)
+            if dim not in self.dimensions:
+                self.dimensions.append(dim)
+        return self
+
+    def __add__(self, other):
+        return PartialAggregates(self.topic, self.dimensions).merge(self).merge(other)
+
+    @staticmethod
+    def _add(left, right):
+        if left.empty:
+            return right.astype("int64")
+        if right.empty:
+            return left
+        index_name = left.index.name or right.index.name
+        combined = left.add(right, fill_value=0).astype("int64")
+        combined.index.name = index_name
+        return combined
+
+    # --- frame-like read API used by generate_agent_insights ----------------------
+
+    @property
+    def empty(self):
+        return self.rows == 0
+
+    def __len__(self):
+        return self.rows
+
+    def engagement_by(self, dim):
+        """Total Engagement per value of dim (like df.groupby(dim)["Engagement"].sum())."""
+        return self.tables[dim]["Engagement"]
+
+    def count_by(self, dim):
+        """Tweet count per value of dim."""
+        return self.tables[dim]["Count"]
+
+    def nunique(self, dim):
+        return int((self.tables[dim]["Count"] > 0).sum())
+
+    def __repr__(self):
+        return f"PartialAggregates(topic={self.topic!r}, rows={self.rows}, dimensions={self.dimensions})"
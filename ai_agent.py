@@ -1,14 +1,19 @@
 import os
 import google.generativeai as genai
 import pandas as pd
+from engagement_cube import EngagementCube
 from dotenv import load_dotenv
 
 load_dotenv()
 
 class GeminiAgent:
-    def __init__(self):
+    def __init__(self, model=None):
+        """model reuses an already configured GenerativeModel (see conversation())."""
         self.api_key = os.getenv("GEMINI_API_KEY")
-        if self.api_key:
+        if model is not None:
+            self.model = model
+            self.chat = model.start_chat(history=[])
+        elif self.api_key:
             genai.configure(api_key=self.api_key)
             # Use gemini-2.0-flash-exp for better availability
             self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
@@ -18,6 +23,13 @@ class GeminiAgent:
             self.chat = None
             print("Warning: GEMINI_API_KEY not found in environment variables.")
 
+    def conversation(self):
+        """
+        Agent with its own empty chat history on this agent's model, so a long-lived
+        agent can serve independent chats without reconfiguring the client.
+        """
+        return GeminiAgent(model=self.model) if self.model is not None else self
+
     def generate_insights(self, df, topic):
         """
         Generates analytical insights based on the dataframe summary.
@@ -142,29 +154,30 @@ class GeminiAgent:
         """
         if df.empty:
             return "No data available."
-            
-        total_records = len(df)
-        total_engagement = df['Engagement'].sum()
+
+        cube = df if isinstance(df, EngagementCube) else EngagementCube(df)
+        total_records = len(cube)
+        total_engagement = cube.engagement
         
         summary = f"Topic: {topic}\n"
         summary += f"Total Records: {total_records}\n"
         summary += f"Total Engagement: {total_engagement}\n"
         
         # Top entities
-        if 'Location' in df.columns:
-            top_locs = df.groupby('Location')['Engagement'].sum().nlargest(3).to_dict()
+        if 'Location' in cube.dimensions:
+            top_locs = cube.totals('Location').nlargest(3).to_dict()
             summary += f"Top Locations: {top_locs}\n"
             
-        if 'Party' in df.columns:
-            top_parties = df.groupby('Party')['Engagement'].sum().nlargest(3).to_dict()
+        if 'Party' in cube.dimensions:
+            top_parties = cube.totals('Party').nlargest(3).to_dict()
             summary += f"Top Parties: {top_parties}\n"
             
-        if 'Sport' in df.columns:
-            top_sports = df.groupby('Sport')['Engagement'].sum().nlargest(3).to_dict()
+        if 'Sport' in cube.dimensions:
+            top_sports = cube.totals('Sport').nlargest(3).to_dict()
             summary += f"Top Sports: {top_sports}\n"
             
         # Hourly peak
-        hourly_peak = df.groupby('Hour')['Engagement'].sum().idxmax()
+        hourly_peak = cube.totals('Hour').idxmax()
         summary += f"Peak Activity Hour: {hourly_peak}:00\n"
         
         return summary
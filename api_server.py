@@ -1,12 +1,19 @@
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import date, datetime
 from typing import Literal, Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from fetchers import TwitterFetcher
-from data_processor import process_data
+import fetchers
+from fetchers import TWITTER_API_HOST, TwitterFetcher
+from http_client import session
+from stream_ingestor import shared_ingestor
+from data_processor import frame_memory_report, process_data
 from ai_agent import GeminiAgent
 
 
@@ -76,7 +83,82 @@ class AiChatResponse(BaseModel):
   fallback: bool
 
 
-app = FastAPI(title="Social Media Analyser API", version="1.0.0")
+class AppClients:
+  """
+  Clients shared by every request of one worker process: a TwitterFetcher (one
+  tweepy client on the shared connection pool), a configured GeminiAgent and, with
+  TWITTER_STREAM_INGEST=1, the stream ingestor. Each uvicorn worker builds its own
+  set at startup, so no request pays for client construction or a cold TLS handshake.
+  Only the worker that owns the stream connection (see shared_ingestor) has an
+  ingestor; the others poll search/recent.
+  """
+
+  def __init__(self):
+    self.pid = os.getpid()
+    self.started = time.time()
+    self.twitter = TwitterFetcher()
+    self.agent = GeminiAgent()
+    self.ingestor = shared_ingestor()
+    self.requests = 0
+    self._lock = threading.Lock()
+    # Memory footprint of the last processed frame per topic, for /health
+    self.frames = {}
+
+  def count_request(self):
+    with self._lock:
+      self.requests += 1
+
+  def note_frame(self, filters, df):
+    if df is not None and not df.empty:
+      self.frames[filters.topic] = {"mode": filters.mode, **frame_memory_report(df)}
+
+  def warm(self):
+    """Open a pooled connection to the Twitter API host in the background (best effort)."""
+    if self.twitter.client is None:
+      return
+
+    def connect():
+      try:
+        session().head(self.twitter.base_url or TWITTER_API_HOST, timeout=5)
+      except Exception as exc:
+        print(f"Could not pre-connect to the Twitter API: {exc}")
+
+    threading.Thread(target=connect, name="warm-connections", daemon=True).start()
+
+  def close(self):
+    if self.ingestor is not None:
+      self.ingestor.stop()
+
+  def health(self):
+    ingestor = self.ingestor.status() if self.ingestor is not None else None
+    return {
+      "worker": {"pid": self.pid, "uptime_seconds": round(time.time() - self.started, 1), "requests": self.requests},
+      "twitter": {
+        "mode": "api" if self.twitter.client is not None else "mock",
+        "base_url": self.twitter.base_url or TWITTER_API_HOST,
+        "scheduler": fetchers.API_SCHEDULER.stats(),
+      },
+      "gemini": {"configured": self.agent.model is not None},
+      "stream": ingestor,
+      "caches": {
+        "responses": fetchers.RESPONSE_CACHE.stats(),
+        "mock_datasets": fetchers.MOCK_DATASET_CACHE.stats(),
+        "user_profiles": fetchers.USER_PROFILES.stats(),
+      },
+      "frames": self.frames,
+    }
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  clients = AppClients()
+  clients.warm()
+  app.state.clients = clients
+  yield
+  clients.close()
+
+
+app = FastAPI(title="Social Media Analyser API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
   CORSMiddleware,
@@ -87,8 +169,25 @@ app.add_middleware(
 )
 
 
-def _load_dataframe(filters: DashboardFilters):
-  twitter = TwitterFetcher()
+_clients_lock = threading.Lock()
+
+
+def _clients(request: Request) -> AppClients:
+  """This worker's AppClients (built once, on first use, if the lifespan did not run)."""
+  clients = getattr(request.app.state, "clients", None)
+  if clients is None:
+    with _clients_lock:
+      clients = getattr(request.app.state, "clients", None)
+      if clients is None:
+        clients = AppClients()
+        clients.warm()
+        request.app.state.clients = clients
+  clients.count_request()
+  return clients
+
+
+def _load_dataframe(filters: DashboardFilters, clients: AppClients):
+  twitter = clients.twitter
 
   if filters.mode == "realtime":
     trending_queries = []
@@ -101,9 +200,14 @@ def _load_dataframe(filters: DashboardFilters):
     else:
       trending_queries = [{"topic": "sports", "query": "India sports"}]
 
-    raw_tweets = twitter.fetch_realtime_trends(
-      trending_queries, time_window_hrs=1, max_results_per_query=40
-    )
+    # The stream ingestor (TWITTER_STREAM_INGEST=1) serves the last hour from memory
+    ingestor = clients.ingestor
+    if ingestor is not None and ingestor.ready(filters.topic):
+      raw_tweets = ingestor.recent(filters.topic, window_hours=1, as_batch=True)
+    else:
+      raw_tweets = twitter.fetch_realtime_trends(
+        trending_queries, time_window_hrs=1, max_results_per_query=40, as_batch=True
+      )
     proc_topic = (
       "travel"
       if filters.topic == "travel"
@@ -113,32 +217,33 @@ def _load_dataframe(filters: DashboardFilters):
       if filters.topic == "politics"
       else "sports"
     )
-    df = process_data(raw_tweets, topic=proc_topic)
+    df = process_data(raw_tweets, topic=proc_topic, compact=True)
   else:
     from_dt = filters.fromDate
     to_dt = filters.toDate
 
     if filters.topic == "travel":
       raw_tweets = twitter.fetch_trends(
-        query="travel India", topic="travel", from_date=from_dt, end_date=to_dt
+        query="travel India", topic="travel", from_date=from_dt, end_date=to_dt, as_batch=True
       )
-      df = process_data(raw_tweets, topic="travel")
+      df = process_data(raw_tweets, topic="travel", compact=True)
     elif filters.topic == "cinema":
       raw_tweets = twitter.fetch_trends(
-        query="cinema India", topic="cinema", from_date=from_dt, end_date=to_dt
+        query="cinema India", topic="cinema", from_date=from_dt, end_date=to_dt, as_batch=True
       )
-      df = process_data(raw_tweets, topic="cinema")
+      df = process_data(raw_tweets, topic="cinema", compact=True)
     elif filters.topic == "politics":
       raw_tweets = twitter.fetch_politics_trends(
-        from_date=from_dt, end_date=to_dt
+        from_date=from_dt, end_date=to_dt, as_batch=True
       )
-      df = process_data(raw_tweets, topic="politics")
+      df = process_data(raw_tweets, topic="politics", compact=True)
     else:
       raw_tweets = twitter.fetch_sports_trends(
-        from_date=from_dt, end_date=to_dt
+        from_date=from_dt, end_date=to_dt, as_batch=True
       )
-      df = process_data(raw_tweets, topic="sports")
+      df = process_data(raw_tweets, topic="sports", compact=True)
 
+  clients.note_frame(filters, df)
   if df is not None and not df.empty:
     df = df[
       (df["Hour"] >= filters.startHour) & (df["Hour"] <= filters.endHour)
@@ -156,16 +261,20 @@ def _load_dataframe(filters: DashboardFilters):
 
 
 @app.get("/health")
-def health():
+def health(request: Request):
+  clients = getattr(request.app.state, "clients", None)
+  stream = clients.ingestor.status() if clients is not None and clients.ingestor is not None else None
   return {
-    "status": "ok",
+    "status": "degraded" if stream is not None and not stream["connected"] else "ok",
     "service": "social-media-analyser-api",
     "version": "1.0.0",
+    "clients": clients.health() if clients is not None else None,
   }
 
 
 @app.get("/api/dashboard", response_model=DashboardResponse)
 def get_dashboard(
+  request: Request,
   topic: TopicKey = Query(...),
   fromDate: date = Query(...),
   toDate: date = Query(...),
@@ -185,8 +294,9 @@ def get_dashboard(
     mode=mode,
   )
 
-  df = _load_dataframe(filters)
-  agent = GeminiAgent()
+  clients = _clients(request)
+  df = _load_dataframe(filters, clients)
+  agent = clients.agent
 
   llm_insights = None
   metrics_health = None
@@ -221,7 +331,7 @@ def get_dashboard(
 
 
 @app.post("/api/ai/insights", response_model=AiInsightsResponse)
-def ai_insights(payload: AiInsightsRequest):
+def ai_insights(payload: AiInsightsRequest, request: Request):
   filters = DashboardFilters(
     topic=payload.topic,
     fromDate=payload.fromDate,
@@ -230,8 +340,9 @@ def ai_insights(payload: AiInsightsRequest):
     endHour=payload.endHour,
     mode=payload.mode,
   )
-  df = _load_dataframe(filters)
-  agent = GeminiAgent()
+  clients = _clients(request)
+  df = _load_dataframe(filters, clients)
+  agent = clients.agent
 
   if df is None or df.empty:
     return AiInsightsResponse(
@@ -263,7 +374,7 @@ def ai_insights(payload: AiInsightsRequest):
 
 
 @app.post("/api/ai/chat", response_model=AiChatResponse)
-def ai_chat(payload: AiChatRequest):
+def ai_chat(payload: AiChatRequest, request: Request):
   filters = DashboardFilters(
     topic=payload.topic,
     fromDate=payload.fromDate,
@@ -272,8 +383,10 @@ def ai_chat(payload: AiChatRequest):
     endHour=payload.endHour,
     mode=payload.mode,
   )
-  df = _load_dataframe(filters)
-  agent = GeminiAgent()
+  clients = _clients(request)
+  df = _load_dataframe(filters, clients)
+  # Each chat request gets its own history on the shared model
+  agent = clients.agent.conversation()
 
   if df is None or df.empty:
     return AiChatResponse(
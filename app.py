@@ -6,7 +6,9 @@ import os
 import random
 from pathlib import Path
 from fetchers import TwitterFetcher
+from stream_ingestor import shared_ingestor
 from data_processor import process_data
+from engagement_cube import EngagementCube
 from ai_agent import GeminiAgent  # Re-enable GeminiAgent
 from dotenv import load_dotenv
 from components.css import inject_main_css
@@ -21,51 +23,52 @@ sys.path.insert(0, str(Path(__file__).parent))
 def load_data(topic_name, from_date, end_date, time_range):
     twitter = TwitterFetcher()
     if topic_name == "Travel":
-        raw_tweets = twitter.fetch_trends(query="travel India", from_date=from_date, end_date=end_date)
-        df = process_data(raw_tweets, topic="travel")
+        raw_tweets = twitter.fetch_trends(query="travel India", from_date=from_date, end_date=end_date, as_batch=True)
+        df = process_data(raw_tweets, topic="travel", compact=True)
     elif topic_name == "Cinema":
         # Cinema-specific tweets with movie/industry info
-        raw_tweets = twitter.fetch_trends(query="cinema India", topic="cinema", from_date=from_date, end_date=end_date)
-        df = process_data(raw_tweets, topic="cinema")
+        raw_tweets = twitter.fetch_trends(query="cinema India", topic="cinema", from_date=from_date, end_date=end_date, as_batch=True)
+        df = process_data(raw_tweets, topic="cinema", compact=True)
     elif topic_name == "Politics":
-        raw_tweets = twitter.fetch_politics_trends(from_date=from_date, end_date=end_date)
-        df = process_data(raw_tweets, topic="politics")
+        raw_tweets = twitter.fetch_politics_trends(from_date=from_date, end_date=end_date, as_batch=True)
+        df = process_data(raw_tweets, topic="politics", compact=True)
     else:  # Sports
-        raw_tweets = twitter.fetch_sports_trends(from_date=from_date, end_date=end_date)
-        df = process_data(raw_tweets, topic="sports")
+        raw_tweets = twitter.fetch_sports_trends(from_date=from_date, end_date=end_date, as_batch=True)
+        df = process_data(raw_tweets, topic="sports", compact=True)
     if not df.empty:
         df = df[(df["Hour"] >= time_range[0]) & (df["Hour"] <= time_range[1])]
     return df
 
-def render_simple_insights(df, topic_label: str):
+def render_simple_insights(df, topic_label: str, cube=None):
     """Show 3 concise, data-driven insights for the current dashboard."""
     if df is None or df.empty:
         return
+    cube = cube if cube is not None else EngagementCube(df)
 
     insights = []
 
     # Top state
     if "State" in df.columns and not df["State"].dropna().empty:
-        top_state_series = df.groupby("State")["Engagement"].sum().sort_values(ascending=False)
+        top_state_series = cube.top_k("State", None)
         top_state = top_state_series.index[0]
         top_state_val = int(top_state_series.iloc[0])
         insights.append(f"Top state by engagement is **{top_state}** with **{top_state_val:,}** interactions.")
 
     # Top city/location
     if "Location" in df.columns and not df["Location"].dropna().empty:
-        top_city_series = df.groupby("Location")["Engagement"].sum().sort_values(ascending=False)
+        top_city_series = cube.top_k("Location", None)
         top_city = top_city_series.index[0]
         top_city_val = int(top_city_series.iloc[0])
         insights.append(f"Most active city is **{top_city}** with **{top_city_val:,}** engagement.")
 
     # Demographic split
     if "Sex" in df.columns and not df["Sex"].dropna().empty:
-        sex_series = df.groupby("Sex")["Engagement"].sum().sort_values(ascending=False)
+        sex_series = cube.top_k("Sex", None)
         top_sex = sex_series.index[0]
         top_sex_val = int(sex_series.iloc[0])
         insights.append(f"Highest-engaging segment by sex is **{top_sex}** with **{top_sex_val:,}** interactions.")
     elif "AgeGroup" in df.columns and not df["AgeGroup"].dropna().empty:
-        age_series = df.groupby("AgeGroup")["Engagement"].sum().sort_values(ascending=False)
+        age_series = cube.top_k("AgeGroup", None)
         top_age = age_series.index[0]
         insights.append(f"Most responsive age group is **{top_age}**.")
 
@@ -160,10 +163,15 @@ if fetch_latest:
         trending_queries = [{"topic": "politics", "query": "Karnataka politics"}]
     else:
         trending_queries = [{"topic": "sports", "query": "India sports"}]
-    raw_tweets = twitter.fetch_realtime_trends(trending_queries, time_window_hrs=1, max_results_per_query=40)
     # Map UI topic to processing topic
     proc_topic = "travel" if topic == "Travel" else "cinema" if topic == "Cinema" else "politics" if topic == "Politics" else "sports"
-    df = process_data(raw_tweets, topic=proc_topic)
+    # The stream ingestor (TWITTER_STREAM_INGEST=1) serves the last hour from memory
+    ingestor = shared_ingestor()
+    if ingestor is not None and ingestor.ready(proc_topic):
+        raw_tweets = ingestor.recent(proc_topic, window_hours=1, as_batch=True)
+    else:
+        raw_tweets = twitter.fetch_realtime_trends(trending_queries, time_window_hrs=1, max_results_per_query=40, as_batch=True)
+    df = process_data(raw_tweets, topic=proc_topic, compact=True)
     if not df.empty:
         df = df[(df["Hour"] >= time_range[0]) & (df["Hour"] <= time_range[1])]
     # Immediately analyze with LLM
@@ -189,17 +197,20 @@ if llm_summary and not df.empty:
 
 # In dashboard section for each topic (simple tab-based dashboards):
 if not df.empty:
+    # One engagement cube per frame, shared by the insight box and every tab
+    cube = EngagementCube(df)
+
     # Simple, non-LLM 3-point insight summary for the current dashboard
-    render_simple_insights(df, topic)
+    render_simple_insights(df, topic, cube=cube)
 
     if topic == "Travel":
-        travel_tabs(df)
+        travel_tabs(df, cube=cube)
     elif topic == "Cinema":
-        cinema_tabs(df)
+        cinema_tabs(df, cube=cube)
     elif topic == "Politics":
-        politics_tabs(df)
+        politics_tabs(df, cube=cube)
     else:
-        sports_tabs(df)
+        sports_tabs(df, cube=cube)
     render_metrics(df, insights_summary=metrics_summary)
 st.markdown("---")
 st.markdown('<p style="text-align: center; color: #636e72; font-size: 0.9rem;">Powered by <strong style="background: linear-gradient(90deg, #FF416C 0%, #FFD93D 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">Antigravity Agent</strong> • Data Source: Twitter (Mock/Real)</p>', unsafe_allow_html=True)
@@ -0,0 +1,191 @@
+"""
+Benchmark for the processing pipeline: TweetGenerator -> process_data -> generate_agent_insights.
+
+Runs every topic at every size and records wall time, peak traced memory and
+rows/sec per stage, then writes one JSON document that can be diffed between runs.
+
+    python benchmark_pipeline.py                          # 4 topics x 10k/100k/1M
+    python benchmark_pipeline.py --sizes 10000 --topics travel politics
+    python benchmark_pipeline.py --compare baseline.json  # print speed-ups vs an earlier run
+    python benchmark_pipeline.py --workload production    # skewed, bursty mock traffic
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_processor import generate_agent_insights, process_data
+from tweet_generator import TweetGenerator
+from workload_profiles import WORKLOADS
+
+TOPICS = ["travel", "politics", "sports", "cinema"]
+SIZES = [10_000, 100_000, 1_000_000]
+
+GENERATORS = {
+    "travel": TweetGenerator.generate_travel_tweets,
+    "politics": TweetGenerator.generate_politics_tweets,
+    "sports": TweetGenerator.generate_sports_tweets,
+    "cinema": TweetGenerator.generate_cinema_tweets,
+}
+
+
+def _measure(func, rows, trace_memory, repeat=1):
+    """
+    Run func `repeat` times and keep the best wall time, then (optionally) once more
+    under tracemalloc for its peak allocation, so tracing overhead never inflates
+    the timing. Returns (result of the last timed run, stats dict).
+    """
+    seconds = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+    peak_bytes = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    stats = {
+        "seconds": round(seconds, 6),
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_bytes": peak_bytes,
+    }
+    return result, stats
+
+
+def run_case(topic, size, as_batch=True, trace_memory=True, compact=True, repeat=1, workload=None):
+    """Benchmark the three stages for one topic/size; returns a result record."""
+    tweets, generate = _measure(
+        lambda: GENERATORS[topic](count=size, as_batch=as_batch, workload=workload), size, trace_memory, repeat
+    )
+    df, process = _measure(lambda: process_data(tweets, topic, compact=compact), size, trace_memory, repeat)
+    _, insights = _measure(lambda: generate_agent_insights(df, topic), size, trace_memory, repeat)
+
+    total_seconds = generate["seconds"] + process["seconds"] + insights["seconds"]
+    return {
+        "topic": topic,
+        "size": size,
+        "workload": workload or "uniform",
+        "rows_out": len(df),
+        "frame_bytes": int(df.memory_usage(deep=True).sum()),
+        "stages": {"generate": generate, "process": process, "insights": insights},
+        "total_seconds": round(total_seconds, 6),
+        "total_rows_per_sec": round(size / total_seconds, 1) if total_seconds > 0 else None,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(current, baseline):
+    """Per-case, per-stage speed-up of current over baseline (>1 means faster)."""
+    base = {(r["topic"], r["size"]): r for r in baseline["results"]}
+    lines = []
+    for record in current["results"]:
+        old = base.get((record["topic"], record["size"]))
+        if old is None:
+            continue
+        parts = []
+        for stage, stats in record["stages"].items():
+            old_seconds = old["stages"].get(stage, {}).get("seconds")
+            if old_seconds and stats["seconds"]:
+                parts.append(f"{stage} x{old_seconds / stats['seconds']:.2f}")
+        lines.append(f"{record['topic']:>8} {record['size']:>9,}: " + ", ".join(parts))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", nargs="+", choices=TOPICS, default=TOPICS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--records", action="store_true", help="generate list-of-dict tweets instead of TweetBatch")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--no-compact", action="store_true", help="time process_data without the compact_frame() schema")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per stage; the best one is kept")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="uniform", help="mock traffic profile")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write ('-' for stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    report = {
+        "environment": environment(),
+        "config": {
+            "topics": args.topics,
+            "sizes": args.sizes,
+            "input": "records" if args.records else "batch",
+            "trace_memory": not args.no_memory,
+            "compact": not args.no_compact,
+            "repeat": args.repeat,
+            "workload": args.workload,
+        },
+        "results": [],
+    }
+    for size in args.sizes:
+        for topic in args.topics:
+            record = run_case(
+                topic, size, as_batch=not args.records, trace_memory=not args.no_memory, compact=not args.no_compact,
+                repeat=max(1, args.repeat), workload=args.workload,
+            )
+            report["results"].append(record)
+            stages = record["stages"]
+            print(
+                f"{topic:>8} {size:>9,} | generate {stages['generate']['seconds']:8.3f}s"
+                f" | process {stages['process']['seconds']:8.3f}s"
+                f" | insights {stages['insights']['seconds']:8.3f}s"
+                f" | {record['total_rows_per_sec']:>12,.0f} rows/s",
+                file=sys.stderr,
+            )
+
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(report, json.load(f)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
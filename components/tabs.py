@@ -3,6 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
+from engagement_cube import EngagementCube
+from data_processor import entity_mentions
 try:
     from wordcloud import WordCloud
 except ImportError:
@@ -81,7 +83,7 @@ def render_geo_time_heatmap(df, geo_field, title="Peak Audience Time Heatmap"):
     if df.empty or geo_field not in df.columns or 'Hour' not in df.columns or 'Engagement' not in df.columns:
         return
     st.markdown(f"### ⏰ {title}")
-    heat_df = df.groupby([geo_field,'Hour'])['Engagement'].sum().reset_index()
+    heat_df = df.groupby([geo_field,'Hour'], observed=True)['Engagement'].sum().reset_index()
     pivot = heat_df.pivot(index=geo_field, columns='Hour', values='Engagement').fillna(0)
     plt.figure(figsize=(12, min(0.5+0.6*len(pivot),8)))
     sns.set(font_scale=0.9)
@@ -246,7 +248,7 @@ def render_competitor_opinion_map(df, competitor_col='Competitor', topic_col='To
     st.dataframe(opinion_tbl, use_container_width=True)
     st.caption("Table shows each competitor's stance on key topics/events. Use to differentiate your unique take!")
 
-def travel_tabs(df):
+def travel_tabs(df, cube=None):
     """
     Simple Travel dashboard:
     - India level state-wise trend (excluding Karnataka)
@@ -255,11 +257,12 @@ def travel_tabs(df):
     - Interaction split by Sex and Age groups
     - Karnataka-only city-wise hourly trend
     """
+    cube = cube if cube is not None else EngagementCube(df)
     # Split India vs Karnataka: India tabs exclude Karnataka, Karnataka tab is dedicated
     if "State" in df.columns:
-        df_india = df[df["State"] != "Karnataka"].copy()
+        india = cube.exclude(State="Karnataka")
     else:
-        df_india = df.copy()
+        india = cube
 
     tab1, tab2, tab3, tab4, tab5 = st.tabs(
         ["🇮🇳 State Trends", "🏙️ Top 10 Cities", "🏷️ Categories", "👥 Demographics", "🕒 Karnataka Cities / Hour"]
@@ -268,15 +271,10 @@ def travel_tabs(df):
     # --- Tab 1: India level state-wise trend ---
     with tab1:
         st.markdown("### India State-wise Travel Trend")
-        if "State" not in df_india.columns:
+        if "State" not in df.columns:
             st.info("No State information available in travel data.")
         else:
-            state_df = (
-                df_india.groupby("State")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            state_df = india.top_k("State", None).reset_index()
             if state_df.empty:
                 st.info("No engagement data available.")
             else:
@@ -292,16 +290,10 @@ def travel_tabs(df):
     # --- Tab 2: Top 10 cities in India ---
     with tab2:
         st.markdown("### Top 10 Cities in India — Travel Trend")
-        if "Location" not in df_india.columns:
+        if "Location" not in df.columns:
             st.info("Location column not available in travel data.")
         else:
-            city_df = (
-                df_india.groupby("Location")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .head(10)
-                .reset_index()
-            )
+            city_df = india.top_k("Location", 10).reset_index()
             if city_df.empty:
                 st.info("No city-level engagement data available.")
             else:
@@ -318,20 +310,13 @@ def travel_tabs(df):
     # --- Tab 3: Category-wise trends ---
     with tab3:
         st.markdown("### Category-wise Travel Trends")
-        if "Category" not in df_india.columns:
+        if "Category" not in df.columns:
             st.info("No Category information available. Ensure TRAVEL_CATEGORY_MAP is set.")
         else:
             # Focus on requested categories; group others
             focus_cats = ["Hill", "Mountains", "Beach", "Trekking", "Religious"]
             # Keep only the configured categories; drop Others
-            tmp = df_india[df_india["Category"].isin(focus_cats)].copy()
-            tmp["CategoryView"] = tmp["Category"]
-            cat_df = (
-                tmp.groupby("CategoryView")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            cat_df = india.slice(Category=focus_cats).top_k("Category", None).rename_axis("CategoryView").reset_index()
             fig, ax = plt.subplots(figsize=(8, 4))
             ax.bar(cat_df["CategoryView"], cat_df["Engagement"], color="#27ae60")
             ax.set_xlabel("Category")
@@ -344,18 +329,13 @@ def travel_tabs(df):
     # --- Tab 4: Interactions split by Sex & Age group ---
     with tab4:
         st.markdown("### Interaction Split by Sex & Age Groups")
-        if "Sex" not in df_india.columns or "AgeGroup" not in df_india.columns:
+        if "Sex" not in df.columns or "AgeGroup" not in df.columns:
             st.info("Sex / AgeGroup columns not found in data.")
         else:
             col1, col2 = st.columns(2)
             # Sex split
             with col1:
-                sex_df = (
-                    df_india.groupby("Sex")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                sex_df = india.top_k("Sex", None).reset_index()
                 if sex_df.empty:
                     st.info("No engagement by Sex available.")
                 else:
@@ -370,12 +350,7 @@ def travel_tabs(df):
                     st.pyplot(fig)
             # Age group split
             with col2:
-                age_df = (
-                    df_india.groupby("AgeGroup")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                age_df = india.top_k("AgeGroup", None).reset_index()
                 if age_df.empty:
                     st.info("No engagement by AgeGroup available.")
                 else:
@@ -393,24 +368,16 @@ def travel_tabs(df):
         if "State" not in df.columns or "Location" not in df.columns:
             st.info("State/Location columns not available in travel data.")
         else:
-            df_ka = df[df["State"] == "Karnataka"].copy()
-            if df_ka.empty:
+            ka = cube.slice(State="Karnataka")
+            if ka.empty:
                 st.info("No Karnataka-specific travel data available.")
             else:
-                hourly_city = df_ka.pivot_table(
-                    index="Hour", columns="Location", values="Engagement", aggfunc="sum", fill_value=0
-                )
+                hourly_city = ka.pivot("Hour", "Location")
                 if hourly_city.empty:
                     st.info("No hourly city-wise data for Karnataka.")
                 else:
                     # Limit to top 10 cities by total engagement
-                    top_cities = (
-                        df_ka.groupby("Location")["Engagement"]
-                        .sum()
-                        .sort_values(ascending=False)
-                        .head(10)
-                        .index
-                    )
+                    top_cities = ka.top_k("Location", 10).index
                     fig, ax = plt.subplots(figsize=(12, 5))
                     for city in hourly_city.columns:
                         if city in top_cities:
@@ -424,20 +391,31 @@ def travel_tabs(df):
         st.pyplot(fig)
 
 
-def politics_tabs(df):
+def _mention_table(df, entity_type, label):
+    """Tweets and engagement per entity counting every mention (a tweet naming two entities counts for both)."""
+    if "State" in df.columns:
+        df = df[df["State"] != "Karnataka"]
+    mentions = entity_mentions(df)
+    mentions = mentions[mentions["EntityType"] == entity_type]
+    table = mentions.groupby("Entity")["Engagement"].agg(Tweets="size", Engagement="sum")
+    return table.sort_values("Engagement", ascending=False).reset_index().rename(columns={"Entity": label})
+
+
+def politics_tabs(df, cube=None):
     """
     Simple Politics dashboard:
     - India level state-wise trend
     - Top 10 cities in India
-    - Party-wise trend (INC/BJP/JDS/AAP/Others + top 3 others)
+    - Party-wise trend (INC/BJP/JDS/AAP/Others + top 3 others), plus every party mention
     - Interaction split by Sex and Age groups
     - Karnataka-only politician hourly trend
     """
+    cube = cube if cube is not None else EngagementCube(df)
     # Split India vs Karnataka: India tabs exclude Karnataka, Karnataka tab is dedicated
     if "State" in df.columns:
-        df_india = df[df["State"] != "Karnataka"].copy()
+        india = cube.exclude(State="Karnataka")
     else:
-        df_india = df.copy()
+        india = cube
 
     tab1, tab2, tab3, tab4, tab5 = st.tabs(
         ["🇮🇳 State Trends", "🏙️ Top 10 Cities", "🏛️ Parties", "👥 Demographics", "🕒 Karnataka Politicians / Hour"]
@@ -446,15 +424,10 @@ def politics_tabs(df):
     # --- Tab 1: India level state-wise trend ---
     with tab1:
         st.markdown("### India State-wise Political Trend")
-        if "State" not in df_india.columns:
+        if "State" not in df.columns:
             st.info("No State information available in politics data.")
         else:
-            state_df = (
-                df_india.groupby("State")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            state_df = india.top_k("State", None).reset_index()
             if state_df.empty:
                 st.info("No engagement data available.")
             else:
@@ -471,16 +444,10 @@ def politics_tabs(df):
     # --- Tab 2: Top 10 cities in India ---
     with tab2:
         st.markdown("### Top 10 Cities in India — Political Trend")
-        if "Location" not in df_india.columns:
+        if "Location" not in df.columns:
             st.info("Location column not available in politics data.")
         else:
-            city_df = (
-                df_india.groupby("Location")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .head(10)
-                .reset_index()
-            )
+            city_df = india.top_k("Location", 10).reset_index()
             if city_df.empty:
                 st.info("No city-level engagement data available.")
             else:
@@ -497,16 +464,11 @@ def politics_tabs(df):
     # --- Tab 3: Party-wise trends with Others + top 3 others ---
     with tab3:
         st.markdown("### Party-wise Political Trends")
-        if "Party" not in df_india.columns:
+        if "Party" not in df.columns:
             st.info("No Party information available.")
         else:
             # Aggregate by party
-            party_df = (
-                df_india.groupby("Party")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            party_df = india.top_k("Party", None).reset_index()
             if party_df.empty:
                 st.info("No party-level data available.")
             else:
@@ -534,20 +496,22 @@ def politics_tabs(df):
                         width='stretch',
                     )
 
+            # The chart credits each tweet to the first party it names; co-mentions count for every party here
+            mention_df = _mention_table(df, "party", "Party")
+            if not mention_df.empty:
+                st.markdown("#### Every Party Mention")
+                st.caption("Tweets naming several parties count towards each of them.")
+                st.dataframe(mention_df, width='stretch')
+
     # --- Tab 4: Interactions split by Sex & Age group ---
     with tab4:
         st.markdown("### Interaction Split by Sex & Age Groups")
-        if "Sex" not in df_india.columns or "AgeGroup" not in df_india.columns:
+        if "Sex" not in df.columns or "AgeGroup" not in df.columns:
             st.info("Sex / AgeGroup columns not found in data.")
         else:
             col1, col2 = st.columns(2)
             with col1:
-                sex_df = (
-                    df_india.groupby("Sex")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                sex_df = india.top_k("Sex", None).reset_index()
                 if sex_df.empty:
                     st.info("No engagement by Sex available.")
                 else:
@@ -561,12 +525,7 @@ def politics_tabs(df):
                     ax.set_title("Engagement by Sex")
                 st.pyplot(fig)
             with col2:
-                age_df = (
-                    df_india.groupby("AgeGroup")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                age_df = india.top_k("AgeGroup", None).reset_index()
                 if age_df.empty:
                     st.info("No engagement by AgeGroup available.")
                 else:
@@ -584,26 +543,18 @@ def politics_tabs(df):
         if "State" not in df.columns or "Politician" not in df.columns:
             st.info("State/Politician columns not available in politics data.")
         else:
-            df_ka = df[df["State"] == "Karnataka"].copy()
-            if df_ka.empty:
+            ka = cube.slice(State="Karnataka")
+            if ka.empty:
                 st.info("No Karnataka-specific political data available.")
             else:
                 # Focus on named politicians, exclude generic 'Other'
-                df_pol = df_ka[df_ka["Politician"] != "Other"]
-                if df_pol.empty:
+                pol = ka.exclude(Politician="Other")
+                if pol.empty:
                     st.info("No specific politician engagement data for Karnataka.")
                 else:
                     # Pick top 10 politicians by total engagement (if available)
-                    top_pols = (
-                        df_pol.groupby("Politician")["Engagement"]
-                        .sum()
-                        .sort_values(ascending=False)
-                        .head(10)
-                        .index
-                    )
-                    hourly_pol = df_pol[df_pol["Politician"].isin(top_pols)].pivot_table(
-                        index="Hour", columns="Politician", values="Engagement", aggfunc="sum", fill_value=0
-                    )
+                    top_pols = pol.top_k("Politician", 10).index
+                    hourly_pol = pol.slice(Politician=top_pols).pivot("Hour", "Politician")
                     fig, ax = plt.subplots(figsize=(12, 5))
                     for pol in hourly_pol.columns:
                         ax.plot(hourly_pol.index, hourly_pol[pol], marker="o", linewidth=2, label=pol)
@@ -615,20 +566,21 @@ def politics_tabs(df):
                     plt.tight_layout()
                     st.pyplot(fig)
 
-def sports_tabs(df):
+def sports_tabs(df, cube=None):
     """
     Simple Sports dashboard:
     - India level state-wise trend (excluding Karnataka)
     - Top 10 cities in India
-    - Sport-wise trend (Cricket/Football/Hockey/Kabaddi/Chess/Others + top 3 others)
+    - Sport-wise trend (Cricket/Football/Hockey/Kabaddi/Chess/Others + top 3 others), plus every sport mention
     - Interaction split by Sex and Age groups
     - Karnataka-only city-wise hourly trend per sport
     """
+    cube = cube if cube is not None else EngagementCube(df)
     # Split India vs Karnataka: India tabs exclude Karnataka, Karnataka tab is dedicated
     if "State" in df.columns:
-        df_india = df[df["State"] != "Karnataka"].copy()
+        india = cube.exclude(State="Karnataka")
     else:
-        df_india = df.copy()
+        india = cube
 
     tab1, tab2, tab3, tab4, tab5 = st.tabs(
         ["🇮🇳 State Trends", "🏙️ Top 10 Cities", "🏆 Sports", "👥 Demographics", "🕒 Karnataka Cities / Sport / Hour"]
@@ -637,15 +589,10 @@ def sports_tabs(df):
     # --- Tab 1: India level state-wise trend ---
     with tab1:
         st.markdown("### India State-wise Sports Trend")
-        if "State" not in df_india.columns:
+        if "State" not in df.columns:
             st.info("No State information available in sports data.")
         else:
-            state_df = (
-                df_india.groupby("State")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            state_df = india.top_k("State", None).reset_index()
             if state_df.empty:
                 st.info("No engagement data available.")
             else:
@@ -662,16 +609,10 @@ def sports_tabs(df):
     # --- Tab 2: Top 10 cities in India ---
     with tab2:
         st.markdown("### Top 10 Cities in India — Sports Trend")
-        if "Location" not in df_india.columns:
+        if "Location" not in df.columns:
             st.info("Location column not available in sports data.")
         else:
-            city_df = (
-                df_india.groupby("Location")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .head(10)
-                .reset_index()
-            )
+            city_df = india.top_k("Location", 10).reset_index()
             if city_df.empty:
                 st.info("No city-level engagement data available.")
             else:
@@ -688,15 +629,10 @@ def sports_tabs(df):
     # --- Tab 3: Sport-wise trends with Others + top 3 others ---
     with tab3:
         st.markdown("### Sport-wise Trends")
-        if "Sport" not in df_india.columns:
+        if "Sport" not in df.columns:
             st.info("No Sport information available.")
         else:
-            sport_df = (
-                df_india.groupby("Sport")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            sport_df = india.top_k("Sport", None).reset_index()
             if sport_df.empty:
                 st.info("No sport-level data available.")
             else:
@@ -727,20 +663,22 @@ def sports_tabs(df):
                         width='stretch',
                     )
 
+            # The chart credits each tweet to the first sport it names; co-mentions count for every sport here
+            mention_df = _mention_table(df, "sport", "Sport")
+            if not mention_df.empty:
+                st.markdown("#### Every Sport Mention")
+                st.caption("Tweets naming several sports count towards each of them.")
+                st.dataframe(mention_df, width='stretch')
+
     # --- Tab 4: Interactions split by Sex & Age group ---
     with tab4:
         st.markdown("### Interaction Split by Sex & Age Groups")
-        if "Sex" not in df_india.columns or "AgeGroup" not in df_india.columns:
+        if "Sex" not in df.columns or "AgeGroup" not in df.columns:
             st.info("Sex / AgeGroup columns not found in data.")
         else:
             col1, col2 = st.columns(2)
             with col1:
-                sex_df = (
-                    df_india.groupby("Sex")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                sex_df = india.top_k("Sex", None).reset_index()
                 if sex_df.empty:
                     st.info("No engagement by Sex available.")
                 else:
@@ -754,12 +692,7 @@ def sports_tabs(df):
                     ax.set_title("Engagement by Sex")
                     st.pyplot(fig)
             with col2:
-                age_df = (
-                    df_india.groupby("AgeGroup")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                age_df = india.top_k("AgeGroup", None).reset_index()
                 if age_df.empty:
                     st.info("No engagement by AgeGroup available.")
                 else:
@@ -777,33 +710,25 @@ def sports_tabs(df):
         if "State" not in df.columns or "Location" not in df.columns or "Sport" not in df.columns:
             st.info("State/Location/Sport columns not available in sports data.")
         else:
-            df_ka = df[df["State"] == "Karnataka"].copy()
-            if df_ka.empty:
+            ka = cube.slice(State="Karnataka")
+            if ka.empty:
                 st.info("No Karnataka-specific sports data available.")
             else:
-                sports_available = sorted(df_ka["Sport"].dropna().unique())
+                sports_available = sorted(ka.values("Sport"))
                 if not sports_available:
                     st.info("No sport categories found for Karnataka.")
                 else:
                     selected_sport = st.selectbox("Select Sport", sports_available, key="sport_hourly_ka")
-                    df_sport = df_ka[df_ka["Sport"] == selected_sport]
-                    if df_sport.empty:
+                    sport_cube = ka.slice(Sport=selected_sport)
+                    if sport_cube.empty:
                         st.info(f"No data for {selected_sport} in Karnataka.")
                     else:
-                        hourly_city = df_sport.pivot_table(
-                            index="Hour", columns="Location", values="Engagement", aggfunc="sum", fill_value=0
-                        )
+                        hourly_city = sport_cube.pivot("Hour", "Location")
                         if hourly_city.empty:
                             st.info(f"No hourly city-wise data for {selected_sport} in Karnataka.")
                         else:
                             # Top 10 cities by engagement for this sport
-                            top_cities = (
-                                df_sport.groupby("Location")["Engagement"]
-                                .sum()
-                                .sort_values(ascending=False)
-                                .head(10)
-                                .index
-                            )
+                            top_cities = sport_cube.top_k("Location", 10).index
                             fig, ax = plt.subplots(figsize=(12, 5))
                             for city in hourly_city.columns:
                                 if city in top_cities:
@@ -816,7 +741,7 @@ def sports_tabs(df):
                             plt.tight_layout()
                             st.pyplot(fig)
 
-def cinema_tabs(df):
+def cinema_tabs(df, cube=None):
     """
     Cinema dashboard:
     - India level state-wise movie discussion trend (excluding Karnataka)
@@ -825,11 +750,12 @@ def cinema_tabs(df):
     - Interaction split by Sex and Age groups
     - Karnataka-only movie vs hour-of-day trends
     """
+    cube = cube if cube is not None else EngagementCube(df)
     # Split India vs Karnataka: India tabs exclude Karnataka, Karnataka tab is dedicated
     if "State" in df.columns:
-        df_india = df[df["State"] != "Karnataka"].copy()
+        india = cube.exclude(State="Karnataka")
     else:
-        df_india = df.copy()
+        india = cube
 
     tab1, tab2, tab3, tab4, tab5 = st.tabs(
         ["🇮🇳 State Trends", "🎬 Top 10 Movies", "🏷️ Industries", "👥 Demographics", "🕒 Karnataka Movies / Hour"]
@@ -838,15 +764,10 @@ def cinema_tabs(df):
     # --- Tab 1: India level state-wise movie trend ---
     with tab1:
         st.markdown("### India State-wise Cinema Discussion Trend")
-        if "State" not in df_india.columns:
+        if "State" not in df.columns:
             st.info("No State information available in cinema data.")
         else:
-            state_df = (
-                df_india.groupby("State")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            state_df = india.top_k("State", None).reset_index()
             if state_df.empty:
                 st.info("No engagement data available.")
             else:
@@ -866,13 +787,7 @@ def cinema_tabs(df):
         if "Movie" not in df.columns:
             st.info("No Movie information available in cinema data.")
         else:
-            movies_df = (
-                df.groupby("Movie")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .head(10)
-                .reset_index()
-            )
+            movies_df = cube.top_k("Movie", 10).reset_index()
             if movies_df.empty:
                 st.info("No movie-level engagement data available.")
             else:
@@ -889,15 +804,10 @@ def cinema_tabs(df):
     # --- Tab 3: Industry-wise trends ---
     with tab3:
         st.markdown("### Industry-wise Cinema Trends")
-        if "Industry" not in df_india.columns:
+        if "Industry" not in df.columns:
             st.info("No Industry information available in cinema data.")
         else:
-            ind_df = (
-                df_india.groupby("Industry")["Engagement"]
-                .sum()
-                .sort_values(ascending=False)
-                .reset_index()
-            )
+            ind_df = india.top_k("Industry", None).reset_index()
             # Keep only configured industries; drop Others if present
             focus_inds = ["Hollywood", "Bollywood", "Sandalwood", "Tollywood", "Mollywood"]
             ind_df = ind_df[ind_df["Industry"].isin(focus_inds)]
@@ -916,17 +826,12 @@ def cinema_tabs(df):
     # --- Tab 4: Interactions split by Sex & Age group ---
     with tab4:
         st.markdown("### Interaction Split by Sex & Age Groups")
-        if "Sex" not in df_india.columns or "AgeGroup" not in df_india.columns:
+        if "Sex" not in df.columns or "AgeGroup" not in df.columns:
             st.info("Sex / AgeGroup columns not found in data.")
         else:
             col1, col2 = st.columns(2)
             with col1:
-                sex_df = (
-                    df_india.groupby("Sex")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                sex_df = india.top_k("Sex", None).reset_index()
                 if sex_df.empty:
                     st.info("No engagement by Sex available.")
                 else:
@@ -940,12 +845,7 @@ def cinema_tabs(df):
                     ax.set_title("Engagement by Sex")
                     st.pyplot(fig)
             with col2:
-                age_df = (
-                    df_india.groupby("AgeGroup")["Engagement"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .reset_index()
-                )
+                age_df = india.top_k("AgeGroup", None).reset_index()
                 if age_df.empty:
                     st.info("No engagement by AgeGroup available.")
                 else:
@@ -963,24 +863,16 @@ def cinema_tabs(df):
         if "State" not in df.columns or "Movie" not in df.columns:
             st.info("State/Movie columns not available in cinema data.")
         else:
-            df_ka = df[df["State"] == "Karnataka"].copy()
-            if df_ka.empty:
+            ka = cube.slice(State="Karnataka")
+            if ka.empty:
                 st.info("No Karnataka-specific cinema data available.")
             else:
-                if df_ka["Movie"].nunique() == 0:
+                if len(ka.values("Movie")) == 0:
                     st.info("No movie information for Karnataka.")
                 else:
                     # Top movies by engagement in Karnataka
-                    top_movies = (
-                        df_ka.groupby("Movie")["Engagement"]
-                        .sum()
-                        .sort_values(ascending=False)
-                        .head(10)
-                        .index
-                    )
-                    hourly_movie = df_ka[df_ka["Movie"].isin(top_movies)].pivot_table(
-                        index="Hour", columns="Movie", values="Engagement", aggfunc="sum", fill_value=0
-                    )
+                    top_movies = ka.top_k("Movie", 10).index
+                    hourly_movie = ka.slice(Movie=top_movies).pivot("Hour", "Movie")
                     if hourly_movie.empty:
                         st.info("No hourly movie-wise data for Karnataka.")
                     else:
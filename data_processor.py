@@ -1,5 +1,13 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from operator import itemgetter
+
+from aggregates import TOPIC_DIMENSIONS, PartialAggregates
+from engagement_cube import EngagementCube
+from entity_extractor import EntityExtractor
+from location_resolver import LocationResolver
+from time_model import TimeColumn
+from tweet_batch import TweetBatch
 
 # Mapping of major Indian cities/tourist spots to States
 CITY_STATE_MAP = {
@@ -113,242 +121,345 @@ TRAVEL_CATEGORY_MAP = {
     "Amritsar": "Religious",
 }
 
-def process_data(tweets, topic="travel"):
+# Low-cardinality dimensions emitted as categoricals by compact frames
+CATEGORICAL_COLUMNS = [
+    "Location", "State", "Category", "Party", "Politician", "Sport", "SportsPerson",
+    "Movie", "Industry", "Sex", "AgeGroup", "UserLocationRaw",
+]
+
+# Narrow numeric dtypes for compact frames (Hour is 0-23; counts stay well below 2**31)
+COMPACT_NUMERIC_DTYPES = {
+    "Hour": "int8",
+    "Likes": "int32",
+    "Retweets": "int32",
+    "Engagement": "int32",
+    "Sentiment": "float32",
+}
+
+# Compiled CITY_STATE_MAP / TRAVEL_CATEGORY_MAP lookup shared by every topic
+LOCATION_RESOLVER = LocationResolver(CITY_STATE_MAP, TRAVEL_CATEGORY_MAP)
+
+# Rows processed at a time by the streaming entry points
+DEFAULT_CHUNK_SIZE = 50_000
+
+# One automaton over every text-mentioned entity dictionary
+ENTITY_EXTRACTOR = EntityExtractor({
+    "party": KARNATAKA_PARTIES,
+    "politician": ALL_POLITICIANS,
+    "sport": SPORTS_CATEGORIES,
+    "sports_person": SPORTS_PERSONS,
+})
+
+def _column(tweets, key, default=None):
+    """Pull a single field out of every tweet as one column."""
+    if isinstance(tweets, TweetBatch):
+        return tweets.column(key) if key in tweets.columns else [default] * len(tweets)
+    try:
+        return list(map(itemgetter(key), tweets))
+    except KeyError:
+        return [tweet.get(key, default) for tweet in tweets]
+
+def compact_frame(df):
+    """
+    Memory-compact copy of a processed frame: categoricals for the dimension columns,
+    a dictionary-encoded (categorical) Text column and narrow ints for Hour and counts.
+    Values are unchanged, only their storage.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORICAL_COLUMNS or col == "Text":
+            series = series.astype("category")
+        elif col in COMPACT_NUMERIC_DTYPES and pd.api.types.is_numeric_dtype(series) and not series.isna().any():
+            series = series.astype(COMPACT_NUMERIC_DTYPES[col])
+        columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+def frame_memory_report(df):
+    """
+    Memory footprint of a frame: total and per-column bytes (deep, i.e. including
+    string payloads) plus the row count.
+    """
+    usage = df.memory_usage(index=True, deep=True)
+    return {
+        "rows": len(df),
+        "total_bytes": int(usage.sum()),
+        "columns": {str(col): int(nbytes) for col, nbytes in usage.items()},
+    }
+
+def process_data(tweets, topic="travel", compact=False, timestamps=False):
     """
     Process raw tweet data into a structured DataFrame.
+    Columns are built once from the raw tweets and enriched with array operations,
+    so lookups run once per distinct location/text instead of once per tweet.
+    With compact=True the frame is returned in the compact_frame() schema.
+    With timestamps=True a UTC "Timestamp" column is added for multi-day views.
+    The number of unparseable created_at values is kept in df.attrs["invalid_timestamps"].
     """
-    data = []
-    for tweet in tweets:
-        # Parse created_at
-        created_at = tweet['created_at']
-        if isinstance(created_at, str):
-            try:
-                dt = datetime.fromisoformat(created_at)
-            except ValueError:
-                dt = datetime.now()
-        else:
-            dt = created_at
+    if not isinstance(tweets, (list, tuple, TweetBatch)):
+        tweets = list(tweets)
+    if not tweets or topic not in ("travel", "politics", "sports", "cinema"):
+        return pd.DataFrame()
 
-        # Common user-level metadata (may be None for some sources)
-        sex = tweet.get("user_sex", "Unknown")
-        age_group = tweet.get("user_age_group", "Unknown")
-        user_location_raw = tweet.get("user_location_raw", tweet.get("location", "Unknown"))
+    texts = _column(tweets, "text")
+    likes = np.asarray(_column(tweets, "likes"))
+    retweets = np.asarray(_column(tweets, "retweets"))
 
+    # Common user-level metadata (may be None for some sources)
+    sex = _column(tweets, "user_sex", "Unknown")
+    age_group = _column(tweets, "user_age_group", "Unknown")
+
+    if isinstance(tweets, TweetBatch):
+        # Columnar input: hours come straight from epoch seconds, and location/text
+        # lookups run over the existing dictionary encoding
+        times = tweets.times()
+        if topic == "travel" or "location" in tweets.columns:
+            locations = tweets.categorical("location")
+        else:
+            locations = ["Unknown"] * len(tweets)
+        if "user_location_raw" in tweets.columns:
+            user_location_raw = tweets.column("user_location_raw")
+        else:
+            user_location_raw = tweets.column("location") if "location" in tweets.columns else ["Unknown"] * len(tweets)
+        mention_texts = tweets.categorical("text")
+    else:
+        times = TimeColumn.parse(_column(tweets, "created_at"))
         if topic == "travel":
-            loc = tweet['location']
-            state = "Unknown"
-            normalized_loc = loc
-            
-            for city, mapped_state in CITY_STATE_MAP.items():
-                if city.lower() in loc.lower():
-                    normalized_loc = city
-                    state = mapped_state
-                    break
-            
-            category = TRAVEL_CATEGORY_MAP.get(normalized_loc, "Other")
-
-            data.append({
-                "Location": normalized_loc,
-                "State": state,
-                "Category": category,
-                "Text": tweet['text'],
-                "Likes": tweet['likes'],
-                "Retweets": tweet['retweets'],
-                "Engagement": tweet['likes'] + tweet['retweets'],
-                "Hour": dt.hour,
-                "Sentiment": 0.0,
-                "Sex": sex,
-                "AgeGroup": age_group,
-                "UserLocationRaw": user_location_raw,
-            })
-        
-        elif topic == "politics":
-            # For politics, extract party and politician mentions
-            party = "Other"
-            politician = "Other"
-
-            text_lower = tweet['text'].lower()
-            for p in KARNATAKA_PARTIES:
-                if p.lower() in text_lower:
-                    party = p
-                    break
-
-            for pol in ALL_POLITICIANS:
-                if pol.lower() in text_lower:
-                    politician = pol
-                    break
-
-            # Best-effort State/Location from raw location text
-            loc_raw = tweet.get("location", "Unknown")
-            state = "Unknown"
-            city_name = loc_raw
-            for city, mapped_state in CITY_STATE_MAP.items():
-                if city.lower() in loc_raw.lower():
-                    city_name = city
-                    state = mapped_state
-                    break
-            
-            data.append({
-                "Party": party,
-                "Politician": politician,
-                "Location": city_name,
-                "State": state,
-                "Text": tweet['text'],
-                "Likes": tweet['likes'],
-                "Retweets": tweet['retweets'],
-                "Engagement": tweet['likes'] + tweet['retweets'],
-                "Hour": dt.hour,
-                "Sentiment": 0.0,
-                "Sex": sex,
-                "AgeGroup": age_group,
-                "UserLocationRaw": user_location_raw,
-            })
-        
-        elif topic == "sports":
-            # For sports, extract sport category & (mock) sports person
-            sport = "Other"
-            sports_person = "Other"
-            
-            text_lower = tweet['text'].lower()
-            for s in SPORTS_CATEGORIES:
-                if s.lower() in text_lower:
-                    sport = s
-                    break
-
-            for sp in SPORTS_PERSONS:
-                if sp.lower() in text_lower:
-                    sports_person = sp
-                    break
-
-            # Best-effort State/Location from raw location text
-            loc_raw = tweet.get("location", "Unknown")
-            state = "Unknown"
-            city_name = loc_raw
-            for city, mapped_state in CITY_STATE_MAP.items():
-                if city.lower() in loc_raw.lower():
-                    city_name = city
-                    state = mapped_state
-                    break
-            
-            data.append({
-                "Sport": sport,
-                "SportsPerson": sports_person,
-                "Location": city_name,
-                "State": state,
-                "Text": tweet['text'],
-                "Likes": tweet['likes'],
-                "Retweets": tweet['retweets'],
-                "Engagement": tweet['likes'] + tweet['retweets'],
-                "Hour": dt.hour,
-                "Sentiment": 0.0,
-                "Sex": sex,
-                "AgeGroup": age_group,
-                "UserLocationRaw": user_location_raw,
-            })
-
-        elif topic == "cinema":
-            # Movie + industry analytics
-            movie = tweet.get("movie", "Unknown")
-            industry = tweet.get("industry", "Other")
-            if industry not in CINEMA_INDUSTRIES:
-                industry = "Other"
-
-            loc_raw = tweet.get("location", "Unknown")
-            state = "Unknown"
-            city_name = loc_raw
-            for city, mapped_state in CITY_STATE_MAP.items():
-                if city.lower() in loc_raw.lower():
-                    city_name = city
-                    state = mapped_state
-                    break
-
-            data.append({
-                "Movie": movie,
-                "Industry": industry,
-                "Location": city_name,
-                "State": state,
-                "Text": tweet['text'],
-                "Likes": tweet['likes'],
-                "Retweets": tweet['retweets'],
-                "Engagement": tweet['likes'] + tweet['retweets'],
-                "Hour": dt.hour,
-                "Sentiment": 0.0,
-                "Sex": sex,
-                "AgeGroup": age_group,
-                "UserLocationRaw": user_location_raw,
-            })
-    
-    df = pd.DataFrame(data)
+            locations = list(map(itemgetter("location"), tweets))
+        else:
+            locations = _column(tweets, "location", "Unknown")
+        if all("user_location_raw" in tweet for tweet in tweets):
+            user_location_raw = _column(tweets, "user_location_raw")
+        else:
+            user_location_raw = [
+                tweet.get("user_location_raw", tweet.get("location", "Unknown")) for tweet in tweets
+            ]
+        mention_texts = texts
+    city_name, state, category = LOCATION_RESOLVER.resolve_many(locations)
+
+    if topic == "travel":
+        entity_columns = {"Location": city_name, "State": state, "Category": category}
+    elif topic == "politics":
+        # For politics, extract party and politician mentions
+        party, politician = ENTITY_EXTRACTOR.first_many(mention_texts, "party", "politician")
+        entity_columns = {
+            "Party": party,
+            "Politician": politician,
+            "Location": city_name,
+            "State": state,
+        }
+    elif topic == "sports":
+        # For sports, extract sport category & (mock) sports person
+        sport, sports_person = ENTITY_EXTRACTOR.first_many(mention_texts, "sport", "sports_person")
+        entity_columns = {
+            "Sport": sport,
+            "SportsPerson": sports_person,
+            "Location": city_name,
+            "State": state,
+        }
+    else:
+        # Movie + industry analytics
+        industry = np.asarray(_column(tweets, "industry", "Other"), dtype=object)
+        industry[~pd.Series(industry).isin(CINEMA_INDUSTRIES).to_numpy()] = "Other"
+        entity_columns = {
+            "Movie": _column(tweets, "movie", "Unknown"),
+            "Industry": industry,
+            "Location": city_name,
+            "State": state,
+        }
+
+    df = pd.DataFrame({
+        **entity_columns,
+        "Text": texts,
+        "Likes": likes,
+        "Retweets": retweets,
+        "Engagement": likes + retweets,
+        "Hour": times.hour_of_day(),
+        "Sentiment": 0.0,
+        "Sex": sex,
+        "AgeGroup": age_group,
+        "UserLocationRaw": user_location_raw,
+    })
+    if timestamps:
+        df.insert(df.columns.get_loc("Hour"), "Timestamp", times.timestamps())
+    if compact:
+        df = compact_frame(df)
+    df.attrs["invalid_timestamps"] = times.invalid_count
+    if times.invalid_count:
+        print(f"Warning: {times.invalid_count} tweets have an unparseable created_at; using the current hour for them.")
     return df
 
+def iter_chunks(tweets, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split tweets into chunks of at most chunk_size rows without materializing the input.
+    Accepts a TweetBatch, or any iterable of tweet dicts and/or TweetBatches
+    (e.g. a generator of fetched pages); dicts are yielded as lists.
+    """
+    if isinstance(tweets, TweetBatch):
+        for start in range(0, len(tweets), chunk_size):
+            yield tweets[start:start + chunk_size]
+        return
+    pending = []
+    for item in tweets:
+        if isinstance(item, TweetBatch):
+            if pending:
+                yield pending
+                pending = []
+            yield from iter_chunks(item, chunk_size)
+            continue
+        pending.append(item)
+        if len(pending) >= chunk_size:
+            yield pending
+            pending = []
+    if pending:
+        yield pending
+
+def iter_processed_chunks(tweets, topic="travel", chunk_size=DEFAULT_CHUNK_SIZE, compact=False):
+    """Lazily run process_data over each chunk of tweets, yielding one DataFrame per chunk."""
+    for chunk in iter_chunks(tweets, chunk_size):
+        df = process_data(chunk, topic, compact=compact)
+        if not df.empty:
+            yield df
+
+def process_data_stream(tweets, topic="travel", chunk_size=DEFAULT_CHUNK_SIZE, aggregate=False, compact=False):
+    """
+    Chunked process_data for inputs too large to hold as one frame.
+    Only one chunk's processed rows are alive at a time when aggregate=True: the result
+    is a PartialAggregates (mergeable per-dimension sums/counts) that
+    generate_agent_insights accepts in place of a DataFrame. Otherwise the processed
+    chunks are concatenated into a single DataFrame.
+    """
+    if aggregate:
+        aggregates = PartialAggregates(topic)
+        for df in iter_processed_chunks(tweets, topic, chunk_size):
+            aggregates.update(df)
+        return aggregates
+
+    frames = list(iter_processed_chunks(tweets, topic, chunk_size, compact=compact))
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    # Chunks carry their own category sets, so re-encode once over the whole frame
+    return compact_frame(df) if compact else df
+
+def entity_mentions(df):
+    """
+    Every party/politician/sport/sports-person mention in df["Text"], one row per mention.
+    Unlike the Party/Politician/Sport columns (first hit only), a tweet naming two
+    entities contributes its Engagement to both.
+    """
+    if df.empty or "Text" not in df.columns:
+        return pd.DataFrame(columns=["EntityType", "Entity", "Engagement"])
+    mentions = ENTITY_EXTRACTOR.mentions_frame(df["Text"])
+    mentions["Engagement"] = df["Engagement"].to_numpy()[mentions["row"].to_numpy()]
+    return mentions.drop(columns="row")
+
+def aggregation_context(df, topic="travel"):
+    """
+    Memoized per-dimension engagement totals for one processed frame.
+    An EngagementCube or PartialAggregates is already such a context and is returned
+    as-is; a DataFrame is wrapped in a cube over the topic's dimensions, so each
+    dimension is grouped at most once no matter how many insights read it.
+    """
+    if isinstance(df, (EngagementCube, PartialAggregates)):
+        return df
+    return EngagementCube(df, dimensions=TOPIC_DIMENSIONS.get(topic))
+
 def generate_agent_insights(df, topic="travel"):
     """
     Generate a textual summary based on the data.
+    df may be a processed DataFrame, its EngagementCube, or the PartialAggregates
+    from process_data_stream().
     """
     if df.empty:
         return "No data available for analysis."
-    
+
+    context = aggregation_context(df, topic)
+    by_hour = context.engagement_by("Hour")
+    total_tweets = len(context)
     insights = []
     
     if topic == "travel":
         # Top Location
-        top_loc = df.groupby("Location")["Engagement"].sum().idxmax()
-        top_eng = df.groupby("Location")["Engagement"].sum().max()
+        by_location = context.engagement_by("Location")
+        top_loc = by_location.idxmax()
+        top_eng = by_location.max()
         insights.append(f"🔥 Top Trending Destination: {top_loc} is leading with {top_eng:,} total engagement.")
         
         # Top State
-        top_state = df.groupby("State")["Engagement"].sum().idxmax()
+        top_state = context.engagement_by("State").idxmax()
         if top_state != "Unknown":
             insights.append(f"🗺️ Most Active State: {top_state} is seeing the most travel chatter.")
         
         # Peak Hour
-        peak_hour = df.groupby("Hour")["Engagement"].sum().idxmax()
+        peak_hour = by_hour.idxmax()
         insights.append(f"⏰ Peak Activity Time: The most buzz happened around {peak_hour}:00 hours.")
         
         # General Observation
-        unique_locs = df["Location"].nunique()
-        total_tweets = len(df)
+        unique_locs = len(by_location)
         insights.append(f"📊 Diversity: We are tracking trends across {unique_locs} different locations with {total_tweets:,} tweets analyzed today.")
     
     elif topic == "politics":
         # Top Party
-        top_party = df.groupby("Party")["Engagement"].sum().idxmax()
-        top_party_eng = df.groupby("Party")["Engagement"].sum().max()
+        by_party = context.engagement_by("Party")
+        top_party = by_party.idxmax()
+        top_party_eng = by_party.max()
         insights.append(f"🏛️ Most Discussed Party: {top_party} with {top_party_eng:,} total engagement.")
         
         # Top Politician
-        top_pol = df.groupby("Politician")["Engagement"].sum().idxmax()
+        by_politician = context.engagement_by("Politician")
+        top_pol = by_politician.idxmax()
         if top_pol != "Other":
-            top_pol_eng = df[df["Politician"] == top_pol]["Engagement"].sum()
+            top_pol_eng = by_politician[top_pol]
             insights.append(f"👤 Most Mentioned Politician: {top_pol} is dominating the conversation with {top_pol_eng:,} engagement.")
         
         # Peak Hour
-        peak_hour = df.groupby("Hour")["Engagement"].sum().idxmax()
+        peak_hour = by_hour.idxmax()
         insights.append(f"⏰ Peak Political Activity: Most discussions happened around {peak_hour}:00 hours.")
         
         # Party diversity
-        unique_parties = df[df["Party"] != "Other"]["Party"].nunique()
-        total_tweets = len(df)
+        unique_parties = int((by_party.index != "Other").sum())
         insights.append(f"📊 Political Landscape: Tracking {unique_parties} major parties in Karnataka with {total_tweets:,} tweets analyzed today.")
     
     elif topic == "sports":
         # Top Sport
-        top_sport = df.groupby("Sport")["Engagement"].sum().idxmax()
-        top_sport_eng = df.groupby("Sport")["Engagement"].sum().max()
+        by_sport = context.engagement_by("Sport")
+        top_sport = by_sport.idxmax()
+        top_sport_eng = by_sport.max()
         insights.append(f"🏆 Most Discussed Sport: {top_sport} with {top_sport_eng:,} total engagement.")
         
         # Peak Hour
-        peak_hour = df.groupby("Hour")["Engagement"].sum().idxmax()
+        peak_hour = by_hour.idxmax()
         insights.append(f"⏰ Peak Sports Activity: Most discussions happened around {peak_hour}:00 hours.")
         
         # Sport diversity
-        unique_sports = df[df["Sport"] != "Other"]["Sport"].nunique()
-        total_tweets = len(df)
+        unique_sports = int((by_sport.index != "Other").sum())
         insights.append(f"📊 Sports Coverage: Tracking {unique_sports} major sports with {total_tweets:,} tweets analyzed today.")
         
         # Engagement comparison
-        top_3_sports = df.groupby("Sport")["Engagement"].sum().nlargest(3)
+        top_3_sports = by_sport.nlargest(3)
         if len(top_3_sports) >= 3:
             insights.append(f"🥇 Top 3 Sports: {', '.join(top_3_sports.index.tolist())}")
+
+    elif topic == "cinema":
+        # Top Movie
+        by_movie = context.engagement_by("Movie")
+        top_movie = by_movie.idxmax()
+        top_movie_eng = by_movie.max()
+        insights.append(f"🎬 Most Discussed Movie: {top_movie} with {top_movie_eng:,} total engagement.")
+
+        # Top Industry
+        by_industry = context.engagement_by("Industry")
+        industries = by_industry[by_industry.index != "Other"]
+        if not industries.empty:
+            insights.append(f"🏷️ Leading Industry: {industries.idxmax()} is driving the most cinema conversation.")
+
+        # Peak Hour
+        peak_hour = by_hour.idxmax()
+        insights.append(f"⏰ Peak Cinema Activity: Most discussions happened around {peak_hour}:00 hours.")
+
+        # Movie diversity
+        unique_movies = len(by_movie)
+        insights.append(f"📊 Box Office Buzz: Tracking {unique_movies} movies across {len(industries)} industries with {total_tweets:,} tweets analyzed today.")
     
     return "\n\n".join(insights)
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+from tweet_batch import TweetBatch
+
+
+def _day(value):
+    if value is None:
+        return None
+    return value.date().isoformat() if isinstance(value, datetime) else date.isoformat(value)
+
+
+def dataset_key(topic, from_date, end_date, count, seed):
+    """
+    Cache key for one generated dataset. Dates are reduced to their calendar day,
+    as the generator only uses the date part. An open-ended window (end_date=None)
+    runs up to "now", so its key carries the current hour and expires with it.
+    """
+    end = _day(end_date)
+    if end is None:
+        end = "open@" + datetime.now().strftime("%Y-%m-%dT%H")
+    start = _day(from_date) or date.today().isoformat()
+    return (topic, start, end, int(count), seed)
+
+
+class DatasetCache:
+    """
+    Two-tier cache of generated TweetBatch datasets.
+
+    The most recent max_items batches stay in memory (LRU). Batches evicted from
+    memory are written to cache_dir as compressed .npz files (TweetBatch.save), and
+    a disk hit is loaded back into memory, so a restarted or busy process still
+    skips regeneration. The disk tier keeps at most max_disk_items files.
+    """
+
+    def __init__(self, max_items=8, cache_dir=None, max_disk_items=64):
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self.cache_dir = cache_dir or os.getenv("MOCK_CACHE_DIR") or os.path.join(
+            tempfile.gettempdir(), "social_media_analyser_datasets"
+        )
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._creating = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # --- disk tier ----------------------------------------------------------------
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.npz")
+
+    def _spill(self, key, batch):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            batch.save(tmp)
+            os.replace(tmp, path)
+            self._trim_disk()
+        except OSError as e:
+            print(f"Could not write dataset cache file: {e}")
+
+    def _trim_disk(self):
+        files = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith(".npz")]
+        if len(files) <= self.max_disk_items:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[: len(files) - self.max_disk_items]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            batch = TweetBatch.load(path)
+            os.utime(path)
+            return batch
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable dataset cache file {path}: {e}")
+            return None
+
+    # --- lookups ------------------------------------------------------------------
+
+    def _remember(self, key, batch):
+        """Insert into the memory tier; the least recently used entries spill to disk."""
+        self._items[key] = batch
+        self._items.move_to_end(key)
+        evicted = []
+        while len(self._items) > self.max_items:
+            evicted.append(self._items.popitem(last=False))
+        return evicted
+
+    def get(self, key):
+        with self._lock:
+            batch = self._items.get(key)
+            if batch is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return batch
+        batch = self._load(key)
+        if batch is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            evicted = self._remember(key, batch)
+        for old_key, old_batch in evicted:
+            self._spill(old_key, old_batch)
+        return batch
+
+    def put(self, key, batch):
+        with self._lock:
+            evicted = self._remember(key, batch)
+        for old_key, old_batch in evicted:
+            self._spill(old_key, old_batch)
+
+    def get_or_create(self, key, factory):
+        """
+        Cached batch for key, calling factory() to generate and store it on a miss.
+        Concurrent callers missing on the same key wait for one factory() call; if it
+        raises, the next waiter runs its own.
+        """
+        batch = self.get(key)
+        if batch is not None:
+            return batch
+        with self._lock:
+            # [lock, callers using it]: the entry lives until its last caller is done
+            creating = self._creating.setdefault(key, [threading.Lock(), 0])
+            creating[1] += 1
+        try:
+            with creating[0]:
+                with self._lock:
+                    batch = self._items.get(key)
+                if batch is None:
+                    batch = factory()
+                    self.put(key, batch)
+        finally:
+            with self._lock:
+                creating[1] -= 1
+                if not creating[1]:
+                    del self._creating[key]
+        return batch
+
+    def flush(self):
+        """Write every in-memory batch to the disk tier (they stay in memory too)."""
+        with self._lock:
+            items = list(self._items.items())
+        for key, batch in items:
+            self._spill(key, batch)
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._items.clear()
+        if disk and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".npz"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def stats(self):
+        return {
+            "memory_items": len(self._items),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"DatasetCache(items={len(self)}, cache_dir={self.cache_dir!r})"
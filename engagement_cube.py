@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+# Processed-frame columns the cube can be sliced and rolled up by
+CUBE_DIMENSIONS = [
+    "Hour", "State", "Location", "Category",
+    "Party", "Politician", "Sport", "SportsPerson", "Movie", "Industry",
+    "Sex", "AgeGroup",
+]
+
+
+def _as_values(value):
+    if isinstance(value, (list, tuple, set, frozenset, pd.Index, np.ndarray)):
+        return list(value)
+    return [value]
+
+
+class EngagementCube:
+    """
+    Dictionary-coded engagement cube over one processed frame.
+
+    Every dimension column is factorized once when the cube is built; after that
+    slices, rollups (totals/top_k) and two-way pivots are integer bincounts over
+    the codes instead of fresh groupbys over the rows. Rollups are memoized, so a
+    dashboard asking for the same totals several times pays for them once.
+    Results follow df.groupby(dim, observed=True)["Engagement"].sum() semantics:
+    sorted keys, missing keys dropped, only observed values.
+    """
+
+    def __init__(self, df, dimensions=None):
+        dims = [dim for dim in (dimensions or CUBE_DIMENSIONS) if dim in df.columns]
+        engagement = df["Engagement"].to_numpy(dtype=np.int64) if "Engagement" in df.columns else np.zeros(len(df), dtype=np.int64)
+        codes, uniques = {}, {}
+        for dim in dims:
+            codes[dim], uniques[dim] = pd.factorize(df[dim], sort=True)
+        self._init(dims, codes, uniques, engagement)
+
+    @classmethod
+    def _from_arrays(cls, dims, codes, uniques, engagement):
+        cube = cls.__new__(cls)
+        cube._init(dims, codes, uniques, engagement)
+        return cube
+
+    def _init(self, dims, codes, uniques, engagement):
+        self.dimensions = dims
+        self._codes = codes
+        self._uniques = uniques
+        self._engagement = engagement
+        self._rollups = {}
+        self._pivots = {}
+
+    # --- size -------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._engagement)
+
+    @property
+    def empty(self):
+        return len(self._engagement) == 0
+
+    @property
+    def engagement(self):
+        """Total engagement over every row in the cube."""
+        return int(self._engagement.sum())
+
+    # --- slicing ----------------------------------------------------------------
+
+    def _value_codes(self, dim, value):
+        return np.flatnonzero(pd.Index(self._uniques[dim]).isin(_as_values(value)))
+
+    def _take(self, mask):
+        return EngagementCube._from_arrays(
+            self.dimensions,
+            {dim: codes[mask] for dim, codes in self._codes.items()},
+            self._uniques,
+            self._engagement[mask],
+        )
+
+    def slice(self, **filters):
+        """Sub-cube of rows whose dimension equals the value (or is in the list) per filter."""
+        mask = np.ones(len(self), dtype=bool)
+        for dim, value in filters.items():
+            mask &= np.isin(self._codes[dim], self._value_codes(dim, value))
+        return self._take(mask)
+
+    def exclude(self, **filters):
+        """Sub-cube of rows whose dimension is not the value (or not in the list) per filter."""
+        mask = np.ones(len(self), dtype=bool)
+        for dim, value in filters.items():
+            mask &= ~np.isin(self._codes[dim], self._value_codes(dim, value))
+        return self._take(mask)
+
+    # --- rollups ----------------------------------------------------------------
+
+    def _rollup(self, dim):
+        if dim not in self._rollups:
+            codes = self._codes[dim]
+            valid = codes >= 0
+            n = len(self._uniques[dim])
+            counts = np.bincount(codes[valid], minlength=n)
+            sums = np.bincount(codes[valid], weights=self._engagement[valid], minlength=n).astype(np.int64)
+            observed = counts > 0
+            index = pd.Index(self._uniques[dim][observed], name=dim)
+            self._rollups[dim] = pd.DataFrame({"Engagement": sums[observed], "Count": counts[observed]}, index=index)
+        return self._rollups[dim]
+
+    def totals(self, dim, values="Engagement"):
+        """Engagement (or Count) per value of dim, keyed and sorted like a groupby."""
+        return self._rollup(dim)[values]
+
+    def engagement_by(self, dim):
+        return self.totals(dim)
+
+    def top_k(self, dim, k=10, values="Engagement"):
+        """Largest k values of dim by engagement (all of them, sorted, if k is None)."""
+        ranked = self.totals(dim, values).sort_values(ascending=False)
+        return ranked if k is None else ranked.head(k)
+
+    def values(self, dim):
+        """Observed values of dim, in sorted order."""
+        return self._rollup(dim).index
+
+    def pivot(self, index, columns, values="Engagement"):
+        """
+        index x columns table of engagement (or Count), zero-filled, like
+        pivot_table(index=..., columns=..., aggfunc="sum", fill_value=0, observed=True).
+        """
+        key = (index, columns)
+        if key not in self._pivots:
+            row_codes, col_codes = self._codes[index], self._codes[columns]
+            valid = (row_codes >= 0) & (col_codes >= 0)
+            n_rows, n_cols = len(self._uniques[index]), len(self._uniques[columns])
+            flat = row_codes[valid].astype(np.int64) * n_cols + col_codes[valid]
+            counts = np.bincount(flat, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+            sums = np.bincount(flat, weights=self._engagement[valid], minlength=n_rows * n_cols)
+            sums = sums.astype(np.int64).reshape(n_rows, n_cols)
+            keep_rows, keep_cols = counts.sum(axis=1) > 0, counts.sum(axis=0) > 0
+            self._pivots[key] = {
+                name: pd.DataFrame(
+                    table[np.ix_(keep_rows, keep_cols)],
+                    index=pd.Index(self._uniques[index][keep_rows], name=index),
+                    columns=pd.Index(self._uniques[columns][keep_cols], name=columns),
+                )
+                for name, table in (("Engagement", sums), ("Count", counts))
+            }
+        return self._pivots[key][values]
+
+    def __repr__(self):
+        return f"EngagementCube(rows={len(self)}, dimensions={self.dimensions})"
@@ -1,23 +1,184 @@
 import os
-import requests
+import time
 import tweepy
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlsplit
 from tweet_generator import TweetGenerator
+from tweet_batch import TweetBatch
+from dataset_cache import DatasetCache, dataset_key
+from since_id_store import SinceIdStore
+from request_scheduler import PRIORITY_INTERACTIVE, RequestScheduler
+from http_client import HttpSession, session
+from hashtag_id_cache import HashtagIdCache
+from response_cache import ResponseCache
+from user_profile_cache import UserProfileCache
+
+MOCK_COUNT = 100000
+MOCK_SEED = int(os.getenv("MOCK_DATA_SEED", "42"))
+MOCK_DATASET_CACHE = DatasetCache()
+MOCK_GENERATORS = {
+    "politics": TweetGenerator.generate_politics_tweets,
+    "sports": TweetGenerator.generate_sports_tweets,
+    "cinema": TweetGenerator.generate_cinema_tweets,
+    "travel": TweetGenerator.generate_travel_tweets,
+}
+
+TWITTER_API_HOST = "https://api.twitter.com"
+# fetch_realtime_trends: queries in flight at once, and seconds allowed per query
+REALTIME_CONCURRENCY = int(os.getenv("TWITTER_REALTIME_CONCURRENCY", "8"))
+REALTIME_QUERY_TIMEOUT = float(os.getenv("TWITTER_QUERY_TIMEOUT", "10"))
+# search/recent limits: 10-100 tweets per page, start_time within the last 7 days and
+# end_time at least 10 seconds in the past
+SEARCH_PAGE_MIN, SEARCH_PAGE_MAX = 10, 100
+SEARCH_LOOKBACK = timedelta(days=7)
+SEARCH_END_LAG = timedelta(seconds=10)
+SINCE_IDS = SinceIdStore()
+# One scheduler per process: every TwitterFetcher shares its rate-limit buckets and
+# in-flight calls, however many fetchers the dashboards create
+API_SCHEDULER = RequestScheduler(max_wait=float(os.getenv("TWITTER_MAX_QUEUE_SECONDS", "30")))
+HASHTAG_IDS = HashtagIdCache()
+# Upstream GET responses shared by all fetchers (TTL per source, see response_cache)
+RESPONSE_CACHE = ResponseCache()
+# Author profiles from author_id expansions, shared across queries and polls
+USER_PROFILES = UserProfileCache(ttl=float(os.getenv("USER_PROFILE_TTL", str(24 * 3600))))
+USER_LOOKUP_BATCH = 100
+# Search queries whose last page's authors were all in USER_PROFILES: their next
+# request skips the author expansion, and any new author is looked up separately
+_EXPANSION_SKIPPED = set()
+
+
+def _utc(value):
+    """date/datetime -> naive UTC datetime (naive datetimes are taken as UTC already)."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _search_window(from_date, end_date, now=None):
+    """
+    (start_time, end_time) to push down to search/recent, clamped to what the endpoint
+    accepts. A bare end date covers that whole day, and the start is floored to the
+    minute so repeated "last N hours" queries share a response cache entry. Returns
+    None if the window lies entirely outside the last 7 days (callers then fall back
+    to the latest tweets).
+    """
+    now = now or datetime.utcnow()
+    start = _utc(from_date)
+    end = _utc(end_date)
+    if end is not None and isinstance(end_date, date) and not isinstance(end_date, datetime):
+        end += timedelta(days=1)
+    earliest, latest = now - SEARCH_LOOKBACK + timedelta(minutes=1), now - SEARCH_END_LAG
+    start = max(start, earliest).replace(second=0, microsecond=0) if start is not None else None
+    if end is not None and end >= latest:
+        end = None
+    if start is not None and end is not None and end <= start:
+        return None
+    if end is not None and end <= earliest:
+        return None
+    return start, end
+
+
+class _TwitterSession(HttpSession):
+    """
+    requests session for tweepy on the shared connection pool (http_client), with a
+    timeout (tweepy sets none); it optionally sends api.twitter.com calls to another
+    host (e.g. firehose_server).
+
+    GETs are served from RESPONSE_CACHE while fresh (incremental since_id polls
+    always go upstream). Calls that reach the network go through API_SCHEDULER: they
+    wait for a rate-limit token for their endpoint, identical concurrent calls share
+    one response, and the response's rate-limit headers update the endpoint's budget.
+    """
+
+    def __init__(self, base_url=None, timeout=None, priority=PRIORITY_INTERACTIVE):
+        super().__init__(timeout=timeout)
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.priority = priority
+
+    def request(self, method, url, *args, **kwargs):
+        if self.base_url and url.startswith(TWITTER_API_HOST):
+            url = self.base_url + url[len(TWITTER_API_HOST):]
+        params = kwargs.get("params") or {}
+        if method.upper() != "GET" or args or kwargs.get("stream") or "since_id" in params:
+            return self._send(method, url, *args, **kwargs)
+        headers = kwargs.get("headers") or {}
+
+        def send(conditional):
+            return self._send(method, url, **{**kwargs, "headers": {**headers, **conditional}})
+
+        return RESPONSE_CACHE.fetch("twitter", url, params, send, vary=headers.get("Authorization"))
+
+    def _send(self, method, url, *args, **kwargs):
+        send = super().request
+        endpoint = urlsplit(url).path
+
+        def call():
+            response = send(method, url, *args, **kwargs)
+            API_SCHEDULER.observe(endpoint, response.headers, response.status_code)
+            return response
+
+        key = None
+        if method.upper() == "GET" and not args and not kwargs.get("stream"):
+            params = kwargs.get("params") or {}
+            headers = kwargs.get("headers") or {}
+            key = (url, tuple(sorted((k, str(v)) for k, v in params.items())), tuple(sorted(headers.items())))
+        return API_SCHEDULER.call(endpoint, call, key=key, priority=self.priority)
+
 
 class TwitterFetcher:
-    def __init__(self):
+    def __init__(self, base_url=None, priority=PRIORITY_INTERACTIVE):
+        """
+        base_url (or TWITTER_API_BASE_URL) points the client at a Twitter v2 compatible
+        host instead of api.twitter.com, e.g. a local firehose_server; no bearer token
+        is needed then. priority orders this fetcher's calls against others' when the
+        rate-limit budget runs low (request_scheduler.PRIORITY_BACKGROUND for pollers).
+        """
         self.bearer_token = os.getenv("TWITTER_BEARER_TOKEN")
+        self.base_url = base_url or os.getenv("TWITTER_API_BASE_URL")
         self.client = None
+        if self.base_url and not (self.bearer_token and self.bearer_token.strip()):
+            self.bearer_token = "local"
         if self.bearer_token and self.bearer_token.strip():
             try:
                 self.client = tweepy.Client(bearer_token=self.bearer_token)
+                self.client.session = _TwitterSession(self.base_url, timeout=REALTIME_QUERY_TIMEOUT, priority=priority)
             except Exception as e:
                 print(f"Error initializing Twitter client: {e}")
     
-    def fetch_trends(self, query=None, topic=None, max_results=20, from_date=None, end_date=None):
+    def fetch_trends(self, query=None, topic=None, max_results=20, from_date=None, end_date=None, as_batch=False,
+                     incremental=False):
         """
         Fetches recent tweets for a general topic/query,
-        Returns a list of dicts with topic, text, metrics, and timestamp info.
+        Returns a list of dicts with topic, text, metrics, and timestamp info,
+        or a columnar TweetBatch when as_batch=True.
+
+        Up to max_results tweets (None: all the endpoint has) are collected over as
+        many result pages as needed, and from_date/end_date are sent to the API as
+        start_time/end_time (a window older than search/recent's 7 days gets the
+        latest page instead). With incremental=True only tweets newer than the last
+        poll of the same query are fetched (see SINCE_IDS).
+        """
+        if not self.client:
+            print("Twitter client not initialized. Returning mock data.")
+            return self._get_mock_data(topic or "general", from_date, end_date, as_batch=as_batch)
+        results = []
+        for page in self.iter_tweet_pages(query, topic, max_results, from_date, end_date, incremental=incremental):
+            results.extend(page if max_results is None else page[: max_results - len(results)])
+        return TweetBatch.from_records(results) if as_batch else results
+
+    def iter_tweet_pages(self, query=None, topic=None, max_results=None, from_date=None, end_date=None,
+                         incremental=False, page_size=SEARCH_PAGE_MAX):
+        """
+        Generator of search/recent result pages (lists of tweet dicts, newest first),
+        following next_token until max_results tweets (None: all the endpoint has).
+        With incremental=True the query's stored since_id is sent, and after the last
+        page the newest id seen becomes its new mark (if max_results cuts a poll short,
+        the older of its new tweets are skipped; use max_results=None to get them all).
         """
         if not query:
             query = "travel India"
@@ -25,88 +186,190 @@ class TwitterFetcher:
             topic = "general"
         if not self.client:
             print("Twitter client not initialized. Returning mock data.")
-            return self._get_mock_data(topic, from_date, end_date)
-        try:
-            response = self.client.search_recent_tweets(
-                query=f"{query} -is:retweet lang:en",
-                max_results=max_results,
-                tweet_fields=['created_at', 'geo', 'entities', 'public_metrics', 'text', 'author_id'],
-                user_fields=['name', 'location', 'description'],
-                expansions=['author_id'],
-            )
-            results = []
-            # Build user lookup for demographics
-            user_map = {}
-            includes = getattr(response, "includes", None)
-            if includes and "users" in includes:
-                for u in includes["users"]:
-                    user_map[getattr(u, "id", None)] = u
-
-            if response.data:
-                for tweet in response.data:
-                    location = "Unknown"
-                    if getattr(tweet, 'entities', None) and 'annotations' in tweet.entities:
-                        for annotation in tweet.entities['annotations']:
-                            if annotation['type'] == 'Place':
-                                location = annotation['normalized_text']
-                                break
-                    metrics = tweet.public_metrics if hasattr(tweet, 'public_metrics') else {}
-                    u = user_map.get(getattr(tweet, "author_id", None))
-                    user_name = getattr(u, "name", None) if u else None
-                    user_location_raw = getattr(u, "location", None) if u else None
-                    # Very light heuristic: we don't have true sex; keep Unknown for real API
-                    user_sex = None
-                    # Age group is unknown for real data; can be filled later via enrichment
-                    user_age_group = None
-                    results.append({
-                        "topic": topic,
-                        "text": tweet.text,
-                        "location": location,
-                        "likes": metrics.get('like_count'),
-                        "retweets": metrics.get('retweet_count'),
-                        "replies": metrics.get('reply_count') if 'reply_count' in metrics else None,
-                        "quotes": metrics.get('quote_count') if 'quote_count' in metrics else None,
-                        "created_at": tweet.created_at,
-                        "author_id": getattr(tweet, 'author_id', None),
-                        "source": "api",
-                        # user-level metadata (best-effort for real API)
-                        "user_id": getattr(tweet, 'author_id', None),
-                        "user_name": user_name,
-                        "user_sex": user_sex,
-                        "user_age_group": user_age_group,
-                        "user_location_raw": user_location_raw or location,
-                    })
-            return results
-        except Exception as e:
-            print(f"Error fetching Twitter trends: {e}")
-            return []
+            yield self._get_mock_data(topic, from_date, end_date)
+            return
+        window = _search_window(from_date, end_date)
+        if window is None:
+            # search/recent only reaches back 7 days: serve its latest page instead, as
+            # before dates were pushed down, rather than an empty dashboard
+            print(f"Warning: requested window is outside search/recent's last 7 days; returning the latest tweets for {query} instead")
+            window = (None, None)
+            max_results = min(max_results, page_size) if max_results else page_size
+        start_time, end_time = window
+        search_query = f"{query} -is:retweet lang:en"
+        since_id = SINCE_IDS.get(search_query) if incremental else None
+        newest_id = None
+        fetched = 0
+        next_token = None
+        while True:
+            wanted = page_size if max_results is None else min(page_size, max_results - fetched)
+            expand = search_query not in _EXPANSION_SKIPPED
+            try:
+                response = self.client.search_recent_tweets(
+                    query=search_query,
+                    max_results=max(SEARCH_PAGE_MIN, min(SEARCH_PAGE_MAX, wanted)),
+                    start_time=start_time,
+                    end_time=end_time,
+                    since_id=since_id,
+                    next_token=next_token,
+                    tweet_fields=['created_at', 'geo', 'entities', 'public_metrics', 'text', 'author_id'],
+                    user_fields=['name', 'location', 'description'] if expand else None,
+                    expansions=['author_id'] if expand else None,
+                )
+                self._cache_authors(response, search_query, expand)
+            except Exception as e:
+                print(f"Error fetching Twitter trends: {e}")
+                return
+            meta = getattr(response, "meta", None) or {}
+            newest_id = newest_id or meta.get("newest_id")
+            page = self._records(response, topic)
+            fetched += len(page)
+            if page:
+                yield page
+            next_token = meta.get("next_token")
+            if not next_token or (max_results is not None and fetched >= max_results):
+                break
+        if incremental and newest_id:
+            # Only after the new tweets were handed out, so an interrupted poll is retried
+            SINCE_IDS.update(search_query, newest_id)
+
+    def _cache_authors(self, response, search_query, expanded):
+        """
+        Merge a response's author expansion into USER_PROFILES and decide whether the
+        query's next request can skip it. Without the expansion, authors that are not
+        cached yet are looked up with get_users, and the next request expands again.
+        """
+        author_ids = [getattr(tweet, "author_id", None) for tweet in response.data or []]
+        missing = USER_PROFILES.missing(author_ids)
+        if expanded:
+            includes = getattr(response, "includes", None) or {}
+            USER_PROFILES.merge(includes.get("users"))
+            if missing:
+                _EXPANSION_SKIPPED.discard(search_query)
+            else:
+                _EXPANSION_SKIPPED.add(search_query)
+            return
+        if missing:
+            _EXPANSION_SKIPPED.discard(search_query)
+            try:
+                for start in range(0, len(missing), USER_LOOKUP_BATCH):
+                    users = self.client.get_users(
+                        ids=missing[start:start + USER_LOOKUP_BATCH], user_fields=['name', 'location', 'description']
+                    )
+                    USER_PROFILES.merge(users.data)
+            except Exception as e:
+                print(f"Error looking up tweet authors: {e}")
 
-    def fetch_realtime_trends(self, trending_querylist, time_window_hrs=1, max_results_per_query=10):
+    @staticmethod
+    def _records(response, topic):
+        """Tweet dicts for one search/recent response (author details from USER_PROFILES)."""
+        results = []
+        if response.data:
+            for tweet in response.data:
+                location = "Unknown"
+                if getattr(tweet, 'entities', None) and 'annotations' in tweet.entities:
+                    for annotation in tweet.entities['annotations']:
+                        if annotation['type'] == 'Place':
+                            location = annotation['normalized_text']
+                            break
+                metrics = tweet.public_metrics if hasattr(tweet, 'public_metrics') else {}
+                profile = USER_PROFILES.get(getattr(tweet, "author_id", None)) or {}
+                user_name = profile.get("name")
+                user_location_raw = profile.get("location")
+                # The API has no sex or age group; they stay Unknown unless an enrichment
+                # step has added them to the cached profile (USER_PROFILES.enrich)
+                user_sex = profile.get("sex")
+                user_age_group = profile.get("age_group")
+                results.append({
+                    "topic": topic,
+                    "text": tweet.text,
+                    "location": location,
+                    "likes": metrics.get('like_count'),
+                    "retweets": metrics.get('retweet_count'),
+                    "replies": metrics.get('reply_count') if 'reply_count' in metrics else None,
+                    "quotes": metrics.get('quote_count') if 'quote_count' in metrics else None,
+                    "created_at": tweet.created_at,
+                    "author_id": getattr(tweet, 'author_id', None),
+                    "source": "api",
+                    # user-level metadata (best-effort for real API)
+                    "user_id": getattr(tweet, 'author_id', None),
+                    "user_name": user_name,
+                    "user_sex": user_sex,
+                    "user_age_group": user_age_group,
+                    "user_location_raw": user_location_raw or location,
+                })
+        return results
+
+    def fetch_realtime_trends(self, trending_querylist, time_window_hrs=1, max_results_per_query=10, as_batch=False,
+                              concurrency=REALTIME_CONCURRENCY, timeout=REALTIME_QUERY_TIMEOUT, incremental=False):
         """
         For a list of trending queries (from LLM/topics), fetch most recent tweets for each, windowed to the specified past hours.
-        Returns combined results with topic annotation.
+        Returns combined results with topic annotation (one TweetBatch when as_batch=True).
+
+        Up to `concurrency` queries run at once on a thread pool, so a refresh takes
+        about as long as its slowest query rather than the sum of all of them. A query
+        that fails or is still running `timeout` seconds after it started is left out;
+        the others are returned in query order. incremental=True returns only tweets
+        posted since the previous poll of each query (see fetch_trends).
         """
         now = datetime.utcnow()
         from_time = now - timedelta(hours=time_window_hrs)
+        queries = [
+            (q.get('topic'), q.get('query')) if isinstance(q, dict) else ('general', q)
+            for q in trending_querylist
+        ]
+
+        def fetch(topic, query):
+            return self.fetch_trends(
+                query=query,
+                topic=topic,
+                max_results=max_results_per_query,
+                from_date=from_time,
+                end_date=now,
+                as_batch=as_batch,
+                incremental=incremental,
+            )
+
+        results = {}
+        if queries:
+            pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(queries))))
+            started = {}
+
+            def run(index):
+                started[index] = time.monotonic()
+                return fetch(*queries[index])
+
+            pending = {pool.submit(run, i): i for i in range(len(queries))}
+            while pending:
+                running = [started[i] for f, i in pending.items() if i in started]
+                wait_for = min(running) + timeout - time.monotonic() if running else timeout
+                done, _ = wait(pending, timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        print(f"Error fetching real-time trend for {queries[index][1]}: {e}")
+                expired = time.monotonic() - timeout
+                for future, index in list(pending.items()):
+                    if started.get(index, expired + 1) <= expired:
+                        print(f"Real-time trend query timed out after {timeout}s: {queries[index][1]}")
+                        future.cancel()
+                        del pending[future]
+            # Timed-out calls finish in the background (bounded by the HTTP timeout)
+            pool.shutdown(wait=False, cancel_futures=True)
+
         all_trends = []
-        for topic_query in trending_querylist:
-            topic = topic_query.get('topic') if isinstance(topic_query, dict) else 'general'
-            query = topic_query.get('query') if isinstance(topic_query, dict) else topic_query
-            try:
-                data = self.fetch_trends(
-                    query=query,
-                    topic=topic,
-                    max_results=max_results_per_query,
-                    from_date=from_time,
-                    end_date=now,
-                )
-                # Tag recency for velocity
-                for d in data:
-                    d['velocity_window_hours'] = time_window_hrs
-                all_trends.extend(data)
-            except Exception as e:
-                print(f"Error fetching real-time trend for {query}: {e}")
-        return all_trends
+        for index in sorted(results):
+            data = results[index]
+            # Tag recency for velocity
+            if as_batch:
+                all_trends.append(data.with_column('velocity_window_hours', time_window_hrs))
+                continue
+            for d in data:
+                d['velocity_window_hours'] = time_window_hrs
+            all_trends.extend(data)
+        return TweetBatch.concat(all_trends) if as_batch else all_trends
     
     # All topic-specific fetch_x_trends now call fetch_trends for DRY
     def fetch_politics_trends(self, **kwargs):
@@ -116,15 +379,20 @@ class TwitterFetcher:
         return self.fetch_trends(query="India sports", topic="sports", **kwargs)
     
     # --- MOCK data logic ---
-    def _get_mock_data(self, topic, from_date=None, end_date=None):
-        if topic == "politics":
-            return TweetGenerator.generate_politics_tweets(count=100000, from_date=from_date, end_date=end_date)
-        elif topic == "sports":
-            return TweetGenerator.generate_sports_tweets(count=100000, from_date=from_date, end_date=end_date)
-        elif topic == "cinema":
-            return TweetGenerator.generate_cinema_tweets(count=100000, from_date=from_date, end_date=end_date)
-        else:
-            return TweetGenerator.generate_travel_tweets(count=100000, from_date=from_date, end_date=end_date)
+    def _get_mock_data(self, topic, from_date=None, end_date=None, as_batch=False, seed=None):
+        """
+        Mock tweets for a window. Datasets are seeded (MOCK_DATA_SEED) and cached, so
+        repeated requests for the same filters reuse one dataset and get the same numbers.
+        """
+        seed = MOCK_SEED if seed is None else seed
+        topic = topic if topic in MOCK_GENERATORS else "travel"
+        generate = MOCK_GENERATORS[topic]
+        key = dataset_key(topic, from_date, end_date, MOCK_COUNT, seed)
+        batch = MOCK_DATASET_CACHE.get_or_create(
+            key,
+            lambda: generate(count=MOCK_COUNT, from_date=from_date, end_date=end_date, as_batch=True, seed=seed),
+        )
+        return batch if as_batch else batch.to_records()
 
 
 class InstagramFetcher:
@@ -144,19 +412,9 @@ class InstagramFetcher:
 
         try:
             # 1. Get Hashtag ID
-            search_url = f"{self.base_url}/ig_hashtag_search"
-            params = {
-                "user_id": self.account_id,
-                "q": hashtag,
-                "access_token": self.access_token
-            }
-            response = requests.get(search_url, params=params)
-            data = response.json()
-            
-            if 'data' not in data or not data['data']:
+            hashtag_id = self._hashtag_id(hashtag)
+            if hashtag_id is None:
                 return []
-            
-            hashtag_id = data['data'][0]['id']
 
             # 2. Get Top Media for Hashtag
             media_url = f"{self.base_url}/{hashtag_id}/top_media"
@@ -165,8 +423,7 @@ class InstagramFetcher:
                 "fields": "caption,children,media_type,media_url,permalink",
                 "access_token": self.access_token
             }
-            media_response = requests.get(media_url, params=media_params)
-            media_data = media_response.json()
+            media_data = self._get(media_url, media_params)
 
             locations = []
             if 'data' in media_data:
@@ -179,6 +436,34 @@ class InstagramFetcher:
             print(f"Error fetching Instagram data: {e}")
             return []
 
+    def _get(self, url, params):
+        """
+        GET through RESPONSE_CACHE and the shared pool; concurrent identical calls
+        share one response.
+        """
+        def send(headers):
+            key = (url, tuple(sorted(params.items())), tuple(sorted(headers.items())))
+            return API_SCHEDULER.call(urlsplit(url).path, lambda: session().get(url, params=params, headers=headers), key=key)
+
+        return RESPONSE_CACHE.fetch("instagram", url, params, send).json()
+
+    def _hashtag_id(self, hashtag):
+        """
+        Instagram id for a hashtag. ig_hashtag_search has a small weekly quota of
+        unique hashtags, so ids are looked up once and kept in HASHTAG_IDS.
+        """
+        hashtag_id = HASHTAG_IDS.get(hashtag)
+        if hashtag_id is None:
+            data = self._get(
+                f"{self.base_url}/ig_hashtag_search",
+                {"user_id": self.account_id, "q": hashtag, "access_token": self.access_token},
+            )
+            if 'data' not in data or not data['data']:
+                return None
+            hashtag_id = data['data'][0]['id']
+            HASHTAG_IDS.put(hashtag, hashtag_id)
+        return hashtag_id
+
     def _get_mock_data(self):
         return ["Sunset in Oia", "Hiking in Patagonia", "Beach day in Maldives", "City lights of Tokyo"]
 
@@ -201,8 +486,10 @@ class NewsFetcher:
                 "apiKey": self.api_key,
                 "from": (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
             }
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
+            data = RESPONSE_CACHE.fetch(
+                "news", self.base_url, params,
+                lambda headers: session().get(self.base_url, params=params, headers=headers),
+            ).json()
             
             headlines = []
             if 'articles' in data:
@@ -0,0 +1,491 @@
+"""
+Local stand-in for the Twitter v2 API, for exercising the realtime path offline.
+
+Serves generated (or recorded) tweets in the v2 JSON shape:
+
+    GET /2/tweets/search/recent   pages of tweets for a query (max_results, start_time,
+                                  end_time, since_id, next_token), like search_recent_tweets
+    GET /2/tweets/search/stream   an endless stream at a configurable rate with bursts and
+                                  pauses, as newline-delimited JSON or Server-Sent Events
+    GET/POST /2/tweets/search/stream/rules
+                                  filtered-stream rules; the stream then interleaves
+                                  tweets for each rule, tagged with it in matching_rules
+
+    uvicorn firehose_server:app --port 8090
+    python firehose_server.py --port 8090 --rate 500 --replay recorded.jsonl
+    TWITTER_API_BASE_URL=http://localhost:8090 streamlit run app.py
+
+Each streamed tweet's created_at is its send time (millisecond precision), so a
+consumer can measure end-to-end latency as receive time - created_at.
+"""
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from tweet_generator import TOPIC_PROFILES, TweetGenerator
+
+TOPIC_KEYWORDS = {
+    "politics": ("politic", "election", "bjp", "congress", "jds", "karnataka"),
+    "sports": ("sport", "cricket", "football", "hockey", "kabaddi", "ipl"),
+    "cinema": ("cinema", "movie", "film", "bollywood", "tollywood"),
+    "travel": ("travel", "trip", "tour"),
+}
+
+# Tweets per hour of window that search/recent has for a query, and the stream tick
+SEARCH_TWEETS_PER_HOUR = int(os.getenv("FIREHOSE_SEARCH_TWEETS_PER_HOUR", "500"))
+STREAM_TICK_SECONDS = 0.02
+TWITTER_EPOCH_MS = 1288834974657
+
+
+def topic_for_query(query):
+    """Best-effort topic of a search query (travel when nothing matches)."""
+    lowered = (query or "").lower()
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        if any(word in lowered for word in keywords):
+            return topic
+    return "travel"
+
+
+def snowflake(created_ms, sequence):
+    """Twitter-style id: ids increase with time, so since_id works like the real API."""
+    return ((created_ms - TWITTER_EPOCH_MS) << 22) | (sequence & 0x3FFFFF)
+
+
+def snowflake_ms(tweet_id):
+    return (int(tweet_id) >> 22) + TWITTER_EPOCH_MS
+
+
+def _iso(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+
+
+def _parse_time(value):
+    if value is None:
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid timestamp: {value}") from None
+
+
+def _stamp(tweet, created_ms, sequence):
+    tweet["id"] = str(snowflake(created_ms, sequence))
+    tweet["created_at"] = _iso(created_ms)
+    tweet["edit_history_tweet_ids"] = [tweet["id"]]
+
+
+def to_v2(record, created_ms, sequence):
+    """(tweet, user) in the Twitter v2 shape for one generated tweet record."""
+    author_id = str(record.get("user_id") or "0").lstrip("u") or "0"
+    tweet = {
+        "id": None,
+        "text": record.get("text") or "",
+        "created_at": None,
+        "author_id": author_id,
+        "edit_history_tweet_ids": [],
+        "lang": "en",
+        "public_metrics": {
+            "retweet_count": int(record.get("retweets") or 0),
+            "reply_count": int(record.get("replies") or 0),
+            "like_count": int(record.get("likes") or 0),
+            "quote_count": int(record.get("quotes") or 0),
+        },
+    }
+    _stamp(tweet, created_ms, sequence)
+    location = record.get("location")
+    if location:
+        start = tweet["text"].find(location)
+        tweet["entities"] = {"annotations": [{
+            "start": max(start, 0), "end": max(start, 0) + len(location) - 1,
+            "probability": 0.9, "type": "Place", "normalized_text": location,
+        }]}
+    user = {
+        "id": author_id,
+        "name": record.get("user_name") or f"user {author_id}",
+        "username": f"user{author_id}",
+        "location": record.get("user_location_raw"),
+    }
+    return tweet, user
+
+
+class TweetSource:
+    """
+    Endless supply of tweet records: generated chunks for a topic (seeded, with an
+    optional workload profile), or the lines of a recorded JSONL file, cycled.
+    Recorded lines may be v2 payloads ({"data": ..., "includes": ...}), bare v2
+    tweets, or legacy tweet dicts.
+    """
+
+    def __init__(self, topic="travel", seed=None, workload=None, replay_path=None, chunk_size=10_000):
+        self.topic = topic
+        self.seed = seed
+        self.workload = workload
+        self.replay_path = replay_path
+        self.chunk_size = chunk_size
+
+    def _generated(self):
+        for round_index in itertools.count():
+            seed = None if self.seed is None else self.seed + round_index
+            for chunk in TweetGenerator.iter_tweets(
+                self.topic, self.chunk_size * 100, chunk_size=self.chunk_size, seed=seed, workload=self.workload
+            ):
+                yield from chunk.to_records()
+
+    def _recorded(self):
+        with open(self.replay_path) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines:
+            raise ValueError(f"No tweets in {self.replay_path}")
+        for line in itertools.cycle(lines):
+            yield line
+
+    def records(self):
+        return self._recorded() if self.replay_path else self._generated()
+
+    def tagged(self):
+        """(record, matching_rules) pairs, every record tagged with the topic."""
+        matching = [{"id": "1", "tag": self.topic}]
+        for record in self.records():
+            yield record, matching
+
+
+class RuleSource:
+    """Tweets for a set of filtered-stream rules, round-robin, each tagged with its rule."""
+
+    def __init__(self, rules, seed=None, workload=None, replay_path=None):
+        self.rules = list(rules)
+        self.topic = ",".join(rule.get("tag") or rule["value"] for rule in self.rules)
+        self.sources = [
+            TweetSource(topic_for_query(rule["value"]), seed=seed, workload=workload, replay_path=replay_path)
+            for rule in self.rules
+        ]
+
+    def tagged(self):
+        streams = [
+            (source.records(), [{"id": rule["id"], "tag": rule.get("tag") or rule["value"]}])
+            for rule, source in zip(self.rules, self.sources)
+        ]
+        for records, matching in itertools.cycle(streams):
+            yield next(records), matching
+
+
+def _v2_record(item, created_ms, sequence):
+    """Normalize a source item (legacy dict or recorded v2 payload) to (tweet, user)."""
+    if "data" in item:
+        tweet, users = dict(item["data"]), item.get("includes", {}).get("users", [])
+        user = users[0] if users else None
+    elif "public_metrics" in item:
+        tweet, user = dict(item), None
+    else:
+        return to_v2(item, created_ms, sequence)
+    _stamp(tweet, created_ms, sequence)
+    return tweet, user
+
+
+class RateSchedule:
+    """
+    Tweets per second over time: a base rate, raised to burst_rate for burst_seconds
+    every burst_every seconds, and silenced for pause_seconds every pause_every
+    seconds (pauses win over bursts). Periods of 0 disable bursts/pauses.
+    """
+
+    def __init__(self, rate=100.0, burst_rate=None, burst_every=0.0, burst_seconds=0.0,
+                 pause_every=0.0, pause_seconds=0.0):
+        self.rate = rate
+        self.burst_rate = burst_rate if burst_rate is not None else rate * 10
+        self.burst_every = burst_every
+        self.burst_seconds = burst_seconds
+        self.pause_every = pause_every
+        self.pause_seconds = pause_seconds
+
+    def rate_at(self, elapsed):
+        if self.pause_every and elapsed % self.pause_every >= self.pause_every - self.pause_seconds:
+            return 0.0
+        if self.burst_every and elapsed % self.burst_every >= self.burst_every - self.burst_seconds:
+            return self.burst_rate
+        return self.rate
+
+
+def stream_tweets(source, schedule, limit=None, duration=None, sse=False):
+    """
+    Async generator of encoded stream lines following schedule: each tick it sends
+    the tweets the schedule has accrued since the last one, stamped with send time.
+    """
+    async def lines():
+        records = source.tagged()
+        started = last = time.monotonic()
+        credit = 0.0
+        sent = 0
+        while True:
+            await asyncio.sleep(STREAM_TICK_SECONDS)
+            now = time.monotonic()
+            if duration is not None and now - started >= duration:
+                return
+            credit += schedule.rate_at(now - started) * (now - last)
+            last = now
+            due = int(credit)
+            if limit is not None:
+                due = min(due, limit - sent)
+            if due <= 0:
+                if limit is not None and sent >= limit:
+                    return
+                continue
+            credit -= due
+            created_ms = int(time.time() * 1000)
+            out = []
+            for record, matching in itertools.islice(records, due):
+                tweet, user = _v2_record(record, created_ms, sent)
+                payload = {"data": tweet, "matching_rules": matching}
+                if user:
+                    payload["includes"] = {"users": [user]}
+                body = json.dumps(payload, separators=(",", ":"))
+                out.append(f"data: {body}\n\n" if sse else body + "\n")
+                sent += 1
+            yield "".join(out).encode("utf-8")
+
+    return lines()
+
+
+def _encode_token(page):
+    return base64.urlsafe_b64encode(str(page).encode()).decode().rstrip("=")
+
+
+def _decode_token(token):
+    try:
+        return int(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid next_token") from None
+
+
+def search_page(query, max_results=10, start_ms=None, end_ms=None, since_id=None, page=0, seed=0, include_users=True):
+    """
+    One page of search/recent results, newest first. A query has SEARCH_TWEETS_PER_HOUR
+    tweets per hour spread evenly over [start_time, end_time] (default: the last hour,
+    narrowed by since_id); a page's content depends only on its arguments, so paging
+    and re-polling are stable. Authors are included only with users=True (the
+    author_id expansion).
+    """
+    end_ms = end_ms or int(time.time() * 1000)
+    start_ms = start_ms or end_ms - 3600_000
+    if since_id is not None:
+        start_ms = max(start_ms, snowflake_ms(since_id) + 1)
+    if start_ms >= end_ms:
+        return {"meta": {"result_count": 0}}
+
+    topic = topic_for_query(query)
+    depth = max(1, int(SEARCH_TWEETS_PER_HOUR * (end_ms - start_ms) / 3600_000))
+    first = page * max_results
+    count = max(0, min(max_results, depth - first))
+    step = (end_ms - start_ms) / depth
+    page_seed = zlib.crc32(f"{query}|{start_ms // 60000}|{seed}|{page}".encode())
+    generate = getattr(TweetGenerator, f"generate_{topic}_tweets")
+    records = generate(count=count, seed=page_seed)[:count] if count else []
+
+    tweets, authors = [], {}
+    for offset, record in enumerate(records):
+        created_ms = int(end_ms - 1 - (first + offset) * step)
+        tweet, user = to_v2(record, created_ms, first + offset)
+        tweets.append(tweet)
+        authors[user["id"]] = user
+    if not tweets:
+        return {"meta": {"result_count": 0}}
+    meta = {"result_count": len(tweets), "newest_id": tweets[0]["id"], "oldest_id": tweets[-1]["id"]}
+    if first + count < depth:
+        meta["next_token"] = _encode_token(page + 1)
+    if not include_users:
+        return {"data": tweets, "meta": meta}
+    return {"data": tweets, "includes": {"users": list(authors.values())}, "meta": meta}
+
+
+class SearchQuota:
+    """Fixed-window request quota for search/recent, reported in x-rate-limit-* headers like the real API."""
+
+    def __init__(self, limit, window=900):
+        self.limit = limit
+        self.window = window
+        self.reset = 0
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self):
+        """Headers for one request, and whether it is within the quota."""
+        with self._lock:
+            now = time.time()
+            if now >= self.reset:
+                self.reset = int(now) + self.window
+                self.used = 0
+            allowed = self.used < self.limit
+            self.used += allowed
+        headers = {
+            "x-rate-limit-limit": str(self.limit),
+            "x-rate-limit-remaining": str(self.limit - self.used),
+            "x-rate-limit-reset": str(self.reset),
+        }
+        return headers, allowed
+
+
+def create_app(seed=None, workload=None, replay_path=None, search_limit=None, search_window=900, **schedule):
+    """
+    FastAPI app serving search/recent and search/stream; schedule sets stream rate
+    defaults, and search_limit (requests per search_window seconds) makes search/recent
+    enforce a quota with 429s.
+    """
+    defaults = RateSchedule(**schedule)
+    quota = SearchQuota(search_limit, search_window) if search_limit else None
+    rules = {}
+    rule_ids = itertools.count(1)
+    firehose = FastAPI(title="Local Twitter firehose", version="1.0.0")
+
+    @firehose.get("/2/tweets/search/recent")
+    def search_recent(
+        response: Response,
+        query: str = Query(...),
+        max_results: int = Query(10, ge=10, le=100),
+        start_time: str | None = None,
+        end_time: str | None = None,
+        since_id: str | None = None,
+        next_token: str | None = None,
+        expansions: str | None = None,
+    ):
+        if quota is not None:
+            headers, allowed = quota.spend()
+            if not allowed:
+                raise HTTPException(status_code=429, detail="Too Many Requests", headers=headers)
+            response.headers.update(headers)
+        page = _decode_token(next_token) if next_token else 0
+        return search_page(
+            query, max_results, _parse_time(start_time), _parse_time(end_time), since_id, page, seed or 0,
+            include_users="author_id" in (expansions or "").split(","),
+        )
+
+    @firehose.get("/2/users")
+    def users_lookup(ids: str = Query(...)):
+        """Profiles for author ids (generated authors have no stored profile, so these are synthetic)."""
+        users = [
+            {"id": user_id, "name": f"user {user_id}", "username": f"user{user_id}", "location": None}
+            for user_id in ids.split(",") if user_id
+        ]
+        return {"data": users}
+
+    @firehose.get("/2/tweets/search/stream/rules")
+    def stream_rules():
+        meta = {"sent": _iso(int(time.time() * 1000)), "result_count": len(rules)}
+        return {"data": list(rules.values()), "meta": meta} if rules else {"meta": meta}
+
+    @firehose.post("/2/tweets/search/stream/rules")
+    def update_stream_rules(body: dict):
+        summary = {}
+        added = []
+        for rule in body.get("add") or []:
+            if not rule.get("value"):
+                raise HTTPException(status_code=400, detail="Rule value is required")
+            if any(existing["value"] == rule["value"] for existing in rules.values()):
+                summary["not_created"] = summary.get("not_created", 0) + 1
+                continue
+            rule_id = str(next(rule_ids))
+            rules[rule_id] = {"id": rule_id, "value": rule["value"], "tag": rule.get("tag") or rule["value"]}
+            added.append(rules[rule_id])
+            summary["created"] = summary.get("created", 0) + 1
+        for rule_id in (body.get("delete") or {}).get("ids", []):
+            outcome = "deleted" if rules.pop(str(rule_id), None) else "not_deleted"
+            summary[outcome] = summary.get(outcome, 0) + 1
+        meta = {"sent": _iso(int(time.time() * 1000)), "summary": summary}
+        return {"data": added, "meta": meta} if added else {"meta": meta}
+
+    @firehose.get("/2/tweets/search/stream")
+    def search_stream(
+        request: Request,
+        topic: str | None = Query(None, description="stream one topic instead of the stream rules"),
+        rate: float = Query(None, gt=0),
+        burst_rate: float = Query(None, ge=0),
+        burst_every: float = Query(None, ge=0),
+        burst_seconds: float = Query(None, ge=0),
+        pause_every: float = Query(None, ge=0),
+        pause_seconds: float = Query(None, ge=0),
+        limit: int = Query(None, ge=1),
+        duration: float = Query(None, gt=0),
+        format: str = Query(None, pattern="^(ndjson|sse)$"),
+    ):
+        if topic is not None and topic not in TOPIC_PROFILES:
+            raise HTTPException(status_code=400, detail=f"Unknown topic: {topic}")
+        overrides = {
+            "rate": rate, "burst_rate": burst_rate, "burst_every": burst_every, "burst_seconds": burst_seconds,
+            "pause_every": pause_every, "pause_seconds": pause_seconds,
+        }
+        rate_schedule = RateSchedule(**{
+            name: value if value is not None else getattr(defaults, name) for name, value in overrides.items()
+        })
+        sse = format == "sse" or (format is None and "text/event-stream" in request.headers.get("accept", ""))
+        if topic is None and rules:
+            source = RuleSource(rules.values(), seed=seed, workload=workload, replay_path=replay_path)
+        else:
+            source = TweetSource(topic or "travel", seed=seed, workload=workload, replay_path=replay_path)
+        return StreamingResponse(
+            stream_tweets(source, rate_schedule, limit=limit, duration=duration, sse=sse),
+            media_type="text/event-stream" if sse else "application/x-ndjson",
+        )
+
+    @firehose.get("/health")
+    def health():
+        return {"status": "ok", "service": "firehose", "stream_rate": defaults.rate}
+
+    return firehose
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+app = create_app(
+    seed=int(os.getenv("FIREHOSE_SEED", "0")) or None,
+    workload=os.getenv("FIREHOSE_WORKLOAD") or None,
+    replay_path=os.getenv("FIREHOSE_REPLAY") or None,
+    rate=_env_float("FIREHOSE_RATE", 100.0),
+    burst_rate=_env_float("FIREHOSE_BURST_RATE", None),
+    burst_every=_env_float("FIREHOSE_BURST_EVERY", 0.0),
+    burst_seconds=_env_float("FIREHOSE_BURST_SECONDS", 0.0),
+    pause_every=_env_float("FIREHOSE_PAUSE_EVERY", 0.0),
+    pause_seconds=_env_float("FIREHOSE_PAUSE_SECONDS", 0.0),
+    search_limit=int(os.getenv("FIREHOSE_SEARCH_LIMIT", "0")) or None,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--rate", type=float, default=100.0, help="stream tweets per second")
+    parser.add_argument("--burst-rate", type=float, help="tweets per second during bursts (default 10x rate)")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="seconds between burst starts (0: no bursts)")
+    parser.add_argument("--burst-seconds", type=float, default=0.0)
+    parser.add_argument("--pause-every", type=float, default=0.0, help="seconds between pauses (0: no pauses)")
+    parser.add_argument("--pause-seconds", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, help="seed for generated tweets")
+    parser.add_argument("--workload", help="workload profile for generated tweets (see workload_profiles.py)")
+    parser.add_argument("--replay", metavar="JSONL", help="stream recorded tweets from this file instead")
+    parser.add_argument("--search-limit", type=int, help="search/recent requests allowed per 15 minutes (default: no limit)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    firehose = create_app(
+        seed=args.seed, workload=args.workload, replay_path=args.replay, search_limit=args.search_limit,
+        rate=args.rate, burst_rate=args.burst_rate, burst_every=args.burst_every,
+        burst_seconds=args.burst_seconds, pause_every=args.pause_every, pause_seconds=args.pause_seconds,
+    )
+    uvicorn.run(firehose, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
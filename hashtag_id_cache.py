@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import threading
+
+
+class HashtagIdCache:
+    """
+    Persisted hashtag -> Instagram hashtag id map.
+
+    Hashtag ids never change, and ig_hashtag_search allows only a few dozen unique
+    hashtags per account per week, so each hashtag is resolved once and kept in a
+    JSON file (path, INSTAGRAM_HASHTAG_CACHE or a temp file) across restarts.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("INSTAGRAM_HASHTAG_CACHE") or os.path.join(
+            tempfile.gettempdir(), "social_media_analyser_hashtag_ids.json"
+        )
+        self._lock = threading.Lock()
+        self._ids = None
+
+    @staticmethod
+    def _key(hashtag):
+        return hashtag.strip().lstrip("#").lower()
+
+    def _load(self):
+        if self._ids is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._ids = {str(k): str(v) for k, v in json.load(f).items()}
+            except FileNotFoundError:
+                self._ids = {}
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"Ignoring unreadable hashtag id cache {self.path}: {e}")
+                self._ids = {}
+        return self._ids
+
+    def get(self, hashtag):
+        with self._lock:
+            return self._load().get(self._key(hashtag))
+
+    def put(self, hashtag, hashtag_id):
+        with self._lock:
+            ids = self._load()
+            ids[self._key(hashtag)] = str(hashtag_id)
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(ids, f, indent=1, sort_keys=True)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"Could not write hashtag id cache: {e}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+    def __repr__(self):
+        return f"HashtagIdCache(path={self.path!r})"
@@ -0,0 +1,61 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds for every outgoing API call unless the caller passes its own
+DEFAULT_TIMEOUT = (3.05, float(os.getenv("HTTP_READ_TIMEOUT", "10")))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+# Idempotent requests that hit a connection error or a transient server error are retried
+# with exponential backoff (0.5s, 1s, 2s). 429s are left to the callers' rate limiting.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+    raise_on_status=False,
+)
+
+_adapter = None
+_session = None
+_adapter_lock = threading.Lock()
+_session_lock = threading.Lock()
+
+
+def shared_adapter():
+    """
+    The process-wide connection pool. Sessions that mount it reuse its keep-alive
+    connections, so short-lived sessions (one per fetcher) skip TCP/TLS setup too.
+    """
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=RETRY)
+        return _adapter
+
+
+class HttpSession(requests.Session):
+    """requests session on the shared pool, with DEFAULT_TIMEOUT unless a timeout is given."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+        adapter = shared_adapter()
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+
+def session():
+    """Shared HttpSession for plain API calls (Instagram, News)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession()
+        return _session
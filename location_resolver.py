@@ -0,0 +1,81 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from tweet_batch import factorize_column
+
+
+class LocationResolver:
+    """
+    Compiled gazetteer lookup for raw location strings (e.g. "Goa, India").
+
+    The gazetteer maps place names to states. All names are compiled into one
+    regex alternation, and every raw string is scanned once. The winning name is
+    the first gazetteer entry (in insertion order) that appears anywhere in the
+    raw string, so results match the old `city.lower() in loc.lower()` loop.
+    Results are memoized per distinct raw string.
+    """
+
+    def __init__(self, gazetteer, category_map=None, default_state="Unknown", default_category="Other", cache_size=65536):
+        self.gazetteer = dict(gazetteer)
+        self.category_map = dict(category_map or {})
+        self.default_state = default_state
+        self.default_category = default_category
+        self.names = list(self.gazetteer)
+
+        # Lower-cased name -> gazetteer position; the first spelling wins on duplicates
+        self._priority = {}
+        for i, name in enumerate(self.names):
+            self._priority.setdefault(name.lower(), i)
+
+        # A zero-width lookahead reports a match at every start offset, so names that
+        # overlap in the raw string are all seen and the lowest priority can win.
+        self._pattern = None
+        if self._priority:
+            alternation = "|".join(re.escape(name) for name in self._priority)
+            self._pattern = re.compile(f"(?=({alternation}))")
+
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _match(self, raw):
+        """Gazetteer name contained in raw (first in gazetteer order), or None."""
+        if self._pattern is None or not isinstance(raw, str):
+            return None
+        best = None
+        for m in self._pattern.finditer(raw.lower()):
+            idx = self._priority[m.group(1)]
+            if best is None or idx < best:
+                best = idx
+                if best == 0:
+                    break
+        return None if best is None else self.names[best]
+
+    def _resolve(self, raw):
+        """(normalized city, state, travel category) for one raw location string."""
+        city = self.match(raw)
+        if city is None:
+            return raw, self.default_state, self.category_map.get(raw, self.default_category)
+        return city, self.gazetteer[city], self.category_map.get(city, self.default_category)
+
+    def resolve_many(self, locations):
+        """
+        Resolve a whole column of raw locations.
+        Returns (cities, states, categories) as pandas arrays aligned with the input.
+        """
+        codes, uniques = factorize_column(locations)
+        resolved = [self.resolve(loc) for loc in uniques]
+        return tuple(
+            pd.Series(np.asarray([r[i] for r in resolved], dtype=object)).array.take(codes)
+            for i in range(3)
+        )
+
+    def cache_info(self):
+        """lru_cache statistics for the resolve() memo."""
+        return self.resolve.cache_info()
+
+    def clear_cache(self):
+        self.match.cache_clear()
+        self.resolve.cache_clear()
@@ -0,0 +1,225 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+# Lower runs first. Interactive (dashboard) calls may use the whole budget; background
+# calls leave the last RESERVE_FRACTION of each bucket to them.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+RESERVE_FRACTION = 0.1
+
+# Known quotas as endpoint path -> (requests, window seconds); the rate-limit headers of
+# each response replace these with the account's real numbers.
+DEFAULT_LIMITS = {
+    "/2/tweets/search/recent": (450, 900),
+    "/2/users": (300, 900),
+}
+
+
+class RateLimitExceeded(Exception):
+    """A call could not get a rate-limit token within its max_wait."""
+
+    def __init__(self, endpoint, wait):
+        super().__init__(f"Rate limit budget for {endpoint} exhausted; next slot in {wait:.0f}s")
+        self.endpoint = endpoint
+        self.wait = wait
+
+
+class TokenBucket:
+    """
+    Token bucket for one endpoint's quota of `limit` calls per `window` seconds.
+
+    Until the server has been heard from, tokens refill evenly over the window. Once
+    observe() has seen x-rate-limit-* headers the server is authoritative: the bucket
+    holds no more than its reported remaining calls and refills to `limit` at its
+    reset time. limit=None means no known quota.
+    """
+
+    def __init__(self, limit=None, window=900):
+        self.limit = limit
+        self.window = window
+        self.tokens = float(limit) if limit else 0.0
+        self.updated = time.monotonic()
+        self.reset_at = None
+        self.reset_epoch = None
+
+    def _refill(self, now):
+        if self.reset_at is not None:
+            if now >= self.reset_at:
+                self.tokens = float(self.limit)
+                self.reset_at = None
+        elif self.limit:
+            self.tokens = min(float(self.limit), self.tokens + (now - self.updated) * self.limit / self.window)
+        self.updated = now
+
+    def wait_time(self, now, keep=0.0):
+        """Seconds until a token can be taken while leaving `keep` tokens (0: now)."""
+        if not self.limit:
+            return 0.0
+        self._refill(now)
+        missing = keep + 1 - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.reset_at is not None:
+            return self.reset_at - now
+        return missing * self.window / self.limit
+
+    def take(self, now, keep=0.0):
+        if self.wait_time(now, keep) > 0:
+            return False
+        if self.limit:
+            self.tokens -= 1
+        return True
+
+    def observe(self, limit, remaining, reset_epoch, now):
+        """Apply one response's rate-limit headers (reset_epoch is wall-clock seconds)."""
+        self._refill(now)
+        if limit and limit != self.limit:
+            self.tokens = float(limit) if self.limit is None else self.tokens * limit / self.limit
+            self.limit = limit
+        if remaining is None:
+            return
+        if reset_epoch and (self.reset_epoch is None or reset_epoch > self.reset_epoch + 1):
+            # A new server window: its count replaces ours
+            self.tokens = float(remaining)
+        else:
+            self.tokens = min(self.tokens, float(remaining))
+        if reset_epoch and self.limit:
+            self.reset_epoch = reset_epoch
+            self.reset_at = now + max(0.0, reset_epoch - time.time())
+
+
+class RequestScheduler:
+    """
+    Shared gate in front of the social API clients.
+
+    call(endpoint, fn, key=...) runs fn() once a token for the endpoint is available.
+    Calls with the same key that overlap in time are coalesced: one runs and every
+    caller gets its result (or exception). When the budget runs low, waiting calls
+    are released in priority order, and a call that would wait longer than max_wait
+    raises RateLimitExceeded instead of adding to a 429 storm.
+    """
+
+    def __init__(self, limits=None, max_wait=30.0):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.max_wait = max_wait
+        self._buckets = {}
+        self._inflight = {}
+        self._queues = {}
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self.calls = 0
+        self.coalesced = 0
+        self.queued = 0
+        self.rejected = 0
+
+    def bucket(self, endpoint):
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            limit, window = self.limits.get(endpoint, (None, 900))
+            bucket = self._buckets[endpoint] = TokenBucket(limit, window)
+        return bucket
+
+    def call(self, endpoint, fn, key=None, priority=PRIORITY_INTERACTIVE, max_wait=None):
+        if key is not None:
+            with self._cond:
+                shared = self._inflight.get(key)
+                if shared is None:
+                    future = self._inflight[key] = Future()
+                else:
+                    self.coalesced += 1
+            if shared is not None:
+                return shared.result()
+        try:
+            self._acquire(endpoint, priority, self.max_wait if max_wait is None else max_wait)
+            with self._cond:
+                self.calls += 1
+            result = fn()
+        except BaseException as e:
+            if key is not None:
+                self._finish(key)
+                future.set_exception(e)
+            raise
+        if key is not None:
+            self._finish(key)
+            future.set_result(result)
+        return result
+
+    def _finish(self, key):
+        with self._cond:
+            self._inflight.pop(key, None)
+
+    def _acquire(self, endpoint, priority, max_wait):
+        reserve = 0.0 if priority <= PRIORITY_INTERACTIVE else RESERVE_FRACTION
+        with self._cond:
+            bucket = self.bucket(endpoint)
+            queue = self._queues.setdefault(endpoint, [])
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(queue, ticket)
+            deadline = time.monotonic() + max_wait
+            counted = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    keep = reserve * (bucket.limit or 0)
+                    first = queue[0] == ticket
+                    if first and bucket.take(now, keep):
+                        return
+                    # Only the most urgent waiter can be next, so only it can predict its wait
+                    wait = bucket.wait_time(now, keep) if first else deadline - now
+                    if now >= deadline or (first and now + wait > deadline):
+                        self.rejected += 1
+                        raise RateLimitExceeded(endpoint, bucket.wait_time(now, keep))
+                    if not counted:
+                        self.queued += 1
+                        counted = True
+                    self._cond.wait(max(wait, 0.001))
+            finally:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                self._cond.notify_all()
+
+    def observe(self, endpoint, headers, status=None):
+        """Feed a response's x-rate-limit-limit/-remaining/-reset headers into the endpoint's bucket."""
+        def number(name):
+            value = headers.get(name)
+            try:
+                return int(value) if value is not None else None
+            except ValueError:
+                return None
+
+        limit, remaining, reset = (
+            number("x-rate-limit-limit"), number("x-rate-limit-remaining"), number("x-rate-limit-reset")
+        )
+        if status == 429 and remaining is None:
+            remaining = 0
+        if limit is None and remaining is None:
+            return
+        with self._cond:
+            self.bucket(endpoint).observe(limit, remaining, reset, time.monotonic())
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            buckets = {
+                endpoint: {
+                    "limit": b.limit,
+                    "tokens": round(b.tokens, 1),
+                    "resets_in": None if b.reset_at is None else round(max(0.0, b.reset_at - time.monotonic()), 1),
+                }
+                for endpoint, b in self._buckets.items()
+            }
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "queued": self.queued,
+                "rejected": self.rejected,
+                "waiting": sum(len(queue) for queue in self._queues.values()),
+                "in_flight": len(self._inflight),
+                "buckets": buckets,
+            }
+
+    def __repr__(self):
+        return f"RequestScheduler(endpoints={sorted(self._buckets)})"
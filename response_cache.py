@@ -0,0 +1,219 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Seconds a cached response is served without asking upstream, per source
+# (RESPONSE_CACHE_TTL_<SOURCE> overrides; 0 turns caching off for that source)
+DEFAULT_TTLS = {
+    "twitter": 60,
+    "instagram": 900,
+    "news": 1800,
+}
+# Response headers kept with a cached body
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+
+def _ttl(source):
+    value = os.getenv(f"RESPONSE_CACHE_TTL_{source.upper()}")
+    return float(value) if value else DEFAULT_TTLS.get(source, 60)
+
+
+def response_key(source, url, params=None, vary=None):
+    """
+    (source, endpoint, normalized params) for a GET: parameters are sorted and
+    stringified and None values dropped, so equivalent calls share an entry. vary
+    (e.g. the Authorization header) keeps different credentials apart.
+    """
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+    vary = hashlib.sha1(vary.encode("utf-8")).hexdigest() if vary else None
+    return (source, url.split("?", 1)[0], tuple(items), vary)
+
+
+class _Entry:
+    __slots__ = ("status", "headers", "content", "stored_at")
+
+    def __init__(self, status, headers, content, stored_at):
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at
+
+    def response(self, url, cache_status):
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.headers["x-cache"] = cache_status
+        response._content = self.content
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+
+class ResponseCache:
+    """
+    TTL cache of upstream GET responses for the fetchers.
+
+    Entries are keyed by response_key() and served as-is for their source's TTL. An
+    expired entry that carried an ETag or Last-Modified is revalidated with
+    If-None-Match / If-Modified-Since, so an unchanged resource costs a 304 instead
+    of a full download. The newest max_items entries live in memory (LRU); with
+    cache_dir (or RESPONSE_CACHE_DIR) set, entries are also written there and
+    survive restarts. Only 200 responses are stored.
+    """
+
+    def __init__(self, max_items=256, cache_dir=None, max_disk_items=1024, ttls=None):
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self.cache_dir = cache_dir or os.getenv("RESPONSE_CACHE_DIR") or None
+        self.ttls = dict(ttls or {})
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def ttl(self, source):
+        return self.ttls[source] if source in self.ttls else _ttl(source)
+
+    # --- disk tier ----------------------------------------------------------------
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _save(self, key, entry):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "status": entry.status,
+                    "headers": entry.headers,
+                    "content": base64.b64encode(entry.content).decode("ascii"),
+                    "stored_at": entry.stored_at,
+                }, f)
+            os.replace(tmp, path)
+            self._trim_disk()
+        except OSError as e:
+            print(f"Could not write response cache file: {e}")
+
+    def _trim_disk(self):
+        files = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith(".json")]
+        if len(files) <= self.max_disk_items:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[: len(files) - self.max_disk_items]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return _Entry(data["status"], data["headers"], base64.b64decode(data["content"]), data["stored_at"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable response cache file {path}: {e}")
+            return None
+
+    # --- lookups ------------------------------------------------------------------
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+                return entry
+        if self.cache_dir is None:
+            return None
+        entry = self._load(key)
+        if entry is not None:
+            with self._lock:
+                self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        self._items[key] = entry
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._remember(key, entry)
+        if self.cache_dir is not None:
+            self._save(key, entry)
+
+    def fetch(self, source, url, params, send, vary=None):
+        """
+        Response for a GET of url with params: from the cache while fresh, otherwise
+        send(headers) is called with any conditional headers and must return a
+        requests.Response. Cached responses carry an x-cache header (hit/revalidated).
+        """
+        ttl = self.ttl(source)
+        if ttl <= 0:
+            return send({})
+        key = response_key(source, url, params, vary)
+        entry = self._lookup(key)
+        now = time.time()
+        if entry is not None and now - entry.stored_at < ttl:
+            with self._lock:
+                self.hits += 1
+            return entry.response(url, "hit")
+
+        headers = {}
+        if entry is not None:
+            if entry.headers.get("etag"):
+                headers["If-None-Match"] = entry.headers["etag"]
+            if entry.headers.get("last-modified"):
+                headers["If-Modified-Since"] = entry.headers["last-modified"]
+        response = send(headers)
+        if response.status_code == 304 and entry is not None:
+            entry = _Entry(entry.status, entry.headers, entry.content, now)
+            self._store(key, entry)
+            with self._lock:
+                self.revalidated += 1
+            return entry.response(url, "revalidated")
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            kept = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+            self._store(key, _Entry(200, kept, response.content, now))
+        return response
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._items.clear()
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def stats(self):
+        return {
+            "memory_items": len(self._items),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"ResponseCache(items={len(self)}, cache_dir={self.cache_dir!r})"
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import threading
+
+
+class SinceIdStore:
+    """
+    Persisted per-query high-water marks for incremental Twitter polling.
+
+    For each search query it keeps the newest tweet id seen so far; passing it as
+    since_id on the next poll makes the API return only newer tweets. Ids only move
+    forward, and the file (path, TWITTER_SINCE_ID_PATH or a temp file) is rewritten
+    atomically so several processes can share it.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("TWITTER_SINCE_ID_PATH") or os.path.join(
+            tempfile.gettempdir(), "social_media_analyser_since_ids.json"
+        )
+        self._lock = threading.Lock()
+        self._ids = None
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return {str(k): str(v) for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Ignoring unreadable since_id store {self.path}: {e}")
+            return {}
+
+    def _write(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._ids, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Could not write since_id store: {e}")
+
+    def get(self, query):
+        """Newest tweet id seen for query, or None."""
+        with self._lock:
+            if self._ids is None:
+                self._ids = self._read()
+            return self._ids.get(query)
+
+    def update(self, query, newest_id):
+        """Raise the high-water mark for query to newest_id (older ids are ignored)."""
+        if newest_id is None:
+            return
+        newest_id = str(newest_id)
+        with self._lock:
+            # Merge with the file so other processes' marks are kept
+            ids = dict(self._ids or {})
+            for key, value in self._read().items():
+                if key not in ids or int(value) > int(ids[key]):
+                    ids[key] = value
+            self._ids = ids
+            current = self._ids.get(query)
+            if current is not None and int(current) >= int(newest_id):
+                return
+            self._ids[query] = newest_id
+            self._write()
+
+    def reset(self, query=None):
+        """Forget one query's mark, or all of them."""
+        with self._lock:
+            self._ids = self._read()
+            if query is None:
+                self._ids = {}
+            else:
+                self._ids.pop(query, None)
+            self._write()
+
+    def __len__(self):
+        with self._lock:
+            if self._ids is None:
+                self._ids = self._read()
+            return len(self._ids)
+
+    def __repr__(self):
+        return f"SinceIdStore(path={self.path!r})"
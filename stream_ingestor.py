@@ -0,0 +1,408 @@
+"""
+Long-running realtime ingestion from the Twitter v2 filtered stream.
+
+StreamIngestor keeps one persistent search/stream connection whose rules are built
+from the topic queries, and files each arriving tweet into a per-topic ring buffer of
+time buckets. Realtime dashboards read the last hour from memory instead of polling
+search/recent on every refresh.
+
+    ingestor = StreamIngestor(DEFAULT_QUERIES)   # or shared_ingestor() with TWITTER_STREAM_INGEST=1
+    ingestor.start()
+    batch = ingestor.recent("travel", as_batch=True)
+
+Set TWITTER_API_BASE_URL to run it against a local firehose_server.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from fetchers import TWITTER_API_HOST
+from http_client import HttpSession
+from tweet_batch import TweetBatch
+
+# Queries streamed by default: the same per-topic queries the dashboards search for
+DEFAULT_QUERIES = [
+    {"topic": "travel", "query": "travel India"},
+    {"topic": "cinema", "query": "cinema India"},
+    {"topic": "politics", "query": "Karnataka politics"},
+    {"topic": "sports", "query": "India sports"},
+]
+# Held by the one process per host that owns the stream connection
+STREAM_LOCK_PATH = os.getenv("TWITTER_STREAM_LOCK_PATH") or os.path.join(
+    tempfile.gettempdir(), "social_media_analyser_stream.lock"
+)
+# The stream sends a keep-alive newline every 20 seconds; silence for longer than this
+# means the connection is stalled
+STALL_SECONDS = 90
+STREAM_PARAMS = {
+    "tweet.fields": "created_at,geo,entities,public_metrics,text,author_id",
+    "user.fields": "name,location,description",
+    "expansions": "author_id",
+}
+
+
+def _parse_created_at(value):
+    if not value:
+        return datetime.now(timezone.utc)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def stream_record(tweet, users, topic):
+    """Tweet dict (the fetch_trends shape) for one streamed v2 tweet."""
+    location = "Unknown"
+    for annotation in (tweet.get("entities") or {}).get("annotations", []):
+        if annotation.get("type") == "Place":
+            location = annotation["normalized_text"]
+            break
+    metrics = tweet.get("public_metrics") or {}
+    author_id = tweet.get("author_id")
+    user = users.get(author_id) or {}
+    return {
+        "topic": topic,
+        "text": tweet.get("text"),
+        "location": location,
+        "likes": metrics.get("like_count"),
+        "retweets": metrics.get("retweet_count"),
+        "replies": metrics.get("reply_count"),
+        "quotes": metrics.get("quote_count"),
+        "created_at": _parse_created_at(tweet.get("created_at")),
+        "author_id": author_id,
+        "source": "stream",
+        "user_id": author_id,
+        "user_name": user.get("name"),
+        "user_sex": None,
+        "user_age_group": None,
+        "user_location_raw": user.get("location") or location,
+    }
+
+
+class TweetRingBuffer:
+    """
+    Per-topic ring of time buckets holding the last window_seconds of tweets.
+
+    Each topic has window_seconds / bucket_seconds + 1 slots; a tweet goes to the slot
+    of its created_at bucket, and a slot is reset when the ring comes round to it
+    again, so old tweets expire without any sweeping. A bucket keeps at most
+    max_per_bucket tweets (the rest are counted as dropped).
+    """
+
+    def __init__(self, window_seconds=3600, bucket_seconds=60, max_per_bucket=20_000):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_per_bucket = max_per_bucket
+        self.slots = window_seconds // bucket_seconds + 1
+        self._rings = {}
+        self._lock = threading.Lock()
+        self.added = 0
+        self.dropped = 0
+
+    def add(self, topic, record, epoch_seconds, now=None):
+        bucket = int(epoch_seconds) // self.bucket_seconds
+        current = int(time.time() if now is None else now) // self.bucket_seconds
+        with self._lock:
+            if bucket <= current - self.slots:
+                self.dropped += 1
+                return False
+            ring = self._rings.get(topic)
+            if ring is None:
+                ring = self._rings[topic] = [[None, []] for _ in range(self.slots)]
+            slot = ring[bucket % self.slots]
+            if slot[0] != bucket:
+                if slot[0] is not None and slot[0] > bucket:
+                    self.dropped += 1
+                    return False
+                slot[0], slot[1] = bucket, []
+            if len(slot[1]) >= self.max_per_bucket:
+                self.dropped += 1
+                return False
+            slot[1].append(record)
+            self.added += 1
+            return True
+
+    def _live_slots(self, topic, window_seconds, now):
+        current = int(time.time() if now is None else now) // self.bucket_seconds
+        oldest = current - min(self.slots - 1, -(-int(window_seconds or self.window_seconds) // self.bucket_seconds))
+        ring = self._rings.get(topic, [])
+        return sorted((slot for slot in ring if slot[0] is not None and oldest <= slot[0] <= current), key=lambda s: s[0])
+
+    def records(self, topic, window_seconds=None, now=None):
+        """Tweets for topic from the last window_seconds (default: the whole window), oldest first."""
+        with self._lock:
+            return [record for slot in self._live_slots(topic, window_seconds, now) for record in slot[1]]
+
+    def counts(self, topic, window_seconds=None, now=None):
+        """[(bucket start epoch seconds, tweets)] for topic, oldest first."""
+        with self._lock:
+            return [(slot[0] * self.bucket_seconds, len(slot[1])) for slot in self._live_slots(topic, window_seconds, now)]
+
+    def topics(self):
+        with self._lock:
+            return sorted(self._rings)
+
+    def stats(self, now=None):
+        """Buffered tweets per topic (counted from the bucket sizes), and added/dropped totals."""
+        with self._lock:
+            topics = {
+                topic: sum(len(slot[1]) for slot in self._live_slots(topic, None, now)) for topic in sorted(self._rings)
+            }
+            return {"topics": topics, "added": self.added, "dropped": self.dropped}
+
+
+class StreamIngestor:
+    """
+    Background thread holding one filtered-stream connection.
+
+    On (re)connect the stream rules are synced with the queries (value
+    "<query> -is:retweet lang:en", tagged with the topic), and each tweet is filed
+    under the tag of the rule it matched. Dropped connections are retried with
+    Twitter's recommended backoff: linear from 250ms up to 16s for network errors,
+    exponential from 5s up to 320s for HTTP errors, and from 60s for 429s.
+    """
+
+    def __init__(self, queries=None, base_url=None, bearer_token=None, buffer=None, window_hours=1):
+        self.queries = list(queries or DEFAULT_QUERIES)
+        self.base_url = (base_url or os.getenv("TWITTER_API_BASE_URL") or TWITTER_API_HOST).rstrip("/")
+        self.bearer_token = bearer_token or os.getenv("TWITTER_BEARER_TOKEN")
+        if not (self.bearer_token and self.bearer_token.strip()) and self.base_url != TWITTER_API_HOST:
+            self.bearer_token = "local"
+        self.window_hours = window_hours
+        self.buffer = buffer or TweetRingBuffer(window_seconds=int(window_hours * 3600))
+        self._session = HttpSession(timeout=(3.05, STALL_SECONDS))
+        self._session.headers["Authorization"] = f"Bearer {self.bearer_token}"
+        self._stop = threading.Event()
+        self._thread = None
+        self._response = None
+        self.connected = False
+        self.connected_since = None
+        self.last_tweet_at = None
+        self.tweets = 0
+        self.reconnects = 0
+        self.last_error = None
+
+    # --- lifecycle ----------------------------------------------------------------
+
+    def start(self):
+        """Start the ingestion thread (no-op if running); False without credentials."""
+        if not (self.bearer_token and self.bearer_token.strip()):
+            print("Twitter bearer token missing. Stream ingestion not started.")
+            return False
+        if self.running:
+            return True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stream-ingestor", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=5):
+        """Stop the thread and close the stream; a stopped shared_ingestor() is replaced on its next call."""
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.connected = False
+        _forget_shared(self)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # --- stream -------------------------------------------------------------------
+
+    def rules(self):
+        return [{"value": f"{q['query']} -is:retweet lang:en", "tag": q["topic"]} for q in self.queries]
+
+    def owned_tags(self):
+        """Rule tags this service manages: the topics of DEFAULT_QUERIES and of self.queries."""
+        return {q["topic"] for q in DEFAULT_QUERIES} | {q["topic"] for q in self.queries}
+
+    def sync_rules(self):
+        """
+        Add the missing self.rules() and delete stale rules tagged with one of
+        owned_tags(). The account's rules are shared by every consumer of the bearer
+        token, so rules with any other tag are left alone.
+        """
+        url = f"{self.base_url}/2/tweets/search/stream/rules"
+        response = self._session.get(url)
+        response.raise_for_status()
+        wanted = {(rule["value"], rule["tag"]) for rule in self.rules()}
+        owned = self.owned_tags()
+        existing = response.json().get("data") or []
+        stale = [
+            rule["id"] for rule in existing
+            if rule.get("tag") in owned and (rule["value"], rule.get("tag")) not in wanted
+        ]
+        present = {(rule["value"], rule.get("tag")) for rule in existing}
+        if stale:
+            self._session.post(url, json={"delete": {"ids": stale}}).raise_for_status()
+        missing = [{"value": value, "tag": tag} for value, tag in sorted(wanted - present)]
+        if missing:
+            self._session.post(url, json={"add": missing}).raise_for_status()
+
+    def _consume(self):
+        with self._session.get(
+            f"{self.base_url}/2/tweets/search/stream", params=STREAM_PARAMS, stream=True,
+        ) as response:
+            self._response = response
+            response.raise_for_status()
+            self.connected = True
+            self.connected_since = time.time()
+            for line in response.iter_lines():
+                if self._stop.is_set():
+                    return
+                if not line:
+                    continue  # keep-alive
+                self._handle(json.loads(line))
+
+    def _handle(self, payload):
+        tweet = payload.get("data")
+        if tweet is None:
+            if payload.get("errors"):
+                self.last_error = str(payload["errors"][0])
+            return
+        users = {user.get("id"): user for user in (payload.get("includes") or {}).get("users", [])}
+        tags = [rule.get("tag") for rule in payload.get("matching_rules") or []] or ["general"]
+        for topic in dict.fromkeys(tags):
+            record = stream_record(tweet, users, topic)
+            self.buffer.add(topic, record, record["created_at"].timestamp())
+        self.tweets += 1
+        self.last_tweet_at = time.time()
+
+    def _run(self):
+        failures = {"network": 0, "http": 0, "rate_limit": 0}
+        while not self._stop.is_set():
+            kind = "network"
+            try:
+                self.sync_rules()
+                self._consume()
+                self.last_error = "stream closed by server"
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                kind = "rate_limit" if status == 429 else "http"
+                self.last_error = f"HTTP {status}"
+            except Exception as e:
+                # Connection resets, stalls and malformed lines: reconnect
+                self.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                self._response = None
+                if self.connected and self.last_tweet_at and self.last_tweet_at >= self.connected_since:
+                    failures = dict.fromkeys(failures, 0)  # the connection worked, start backoff over
+                self.connected = False
+            if self._stop.is_set():
+                return
+            failures[kind] += 1
+            n = failures[kind]
+            if kind == "network":
+                delay = min(0.25 * n, 16)
+            elif kind == "http":
+                delay = min(5 * 2 ** (n - 1), 320)
+            else:
+                delay = min(60 * 2 ** (n - 1), 960)
+            self.reconnects += 1
+            print(f"Tweet stream disconnected ({self.last_error}); reconnecting in {delay:g}s")
+            self._stop.wait(delay)
+
+    # --- reads --------------------------------------------------------------------
+
+    def ready(self, topic):
+        """True once the stream has delivered tweets for topic."""
+        return bool(self.buffer.counts(topic))
+
+    def recent(self, topic, window_hours=None, as_batch=False):
+        """
+        Buffered tweets for topic from the last window_hours (default: the whole
+        buffer), tagged with velocity_window_hours like fetch_realtime_trends.
+        """
+        window_hours = window_hours or self.window_hours
+        records = [dict(r, velocity_window_hours=window_hours) for r in self.buffer.records(topic, window_hours * 3600)]
+        return TweetBatch.from_records(records) if as_batch else records
+
+    def status(self):
+        return {
+            "running": self.running,
+            "connected": self.connected,
+            "connected_since": self.connected_since,
+            "last_tweet_at": self.last_tweet_at,
+            "tweets": self.tweets,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+            "buffer": self.buffer.stats(),
+        }
+
+    def __repr__(self):
+        return f"StreamIngestor(base_url={self.base_url!r}, queries={len(self.queries)}, connected={self.connected})"
+
+
+_shared = None
+_shared_lock = threading.Lock()
+_owner_lock = None
+
+
+def _lock_file(path):
+    """Open path and take an exclusive non-blocking lock on it; None if another process holds it."""
+    f = open(path, "a+")
+    try:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    f.seek(0)
+    f.truncate()
+    f.write(str(os.getpid()))
+    f.flush()
+    return f
+
+
+def _release_owner_lock():
+    global _owner_lock
+    if _owner_lock is not None:
+        _owner_lock.close()
+        _owner_lock = None
+
+
+def _forget_shared(ingestor):
+    global _shared
+    with _shared_lock:
+        if _shared is ingestor:
+            _shared = None
+            _release_owner_lock()
+
+
+def shared_ingestor():
+    """
+    The process-wide StreamIngestor over DEFAULT_QUERIES, started on first use, when
+    TWITTER_STREAM_INGEST=1; None otherwise (callers poll search/recent instead).
+
+    The API allows one stream connection per app, so only the process holding the
+    STREAM_LOCK_PATH file lock (TWITTER_STREAM_LOCK_PATH) streams; other workers get
+    None until the owner stops or exits.
+    """
+    global _shared, _owner_lock
+    if os.getenv("TWITTER_STREAM_INGEST", "").lower() not in ("1", "true", "yes"):
+        return None
+    with _shared_lock:
+        if _shared is None:
+            try:
+                _owner_lock = _lock_file(STREAM_LOCK_PATH)
+            except OSError as e:
+                print(f"Could not open stream lock {STREAM_LOCK_PATH}: {e}")
+            if _owner_lock is None:
+                return None
+            _shared = StreamIngestor(DEFAULT_QUERIES)
+        if not _shared.start():
+            _shared = None
+            _release_owner_lock()
+        return _shared
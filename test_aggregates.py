@@ -0,0 +1,56 @@
+import unittest
+
+import pandas as pd
+
+from aggregates import PartialAggregates
+from data_processor import generate_agent_insights, process_data, process_data_stream
+from tweet_generator import TweetGenerator
+
+
+class TestPartialAggregates(unittest.TestCase):
+    def setUp(self):
+        self.df = process_data(TweetGenerator.generate_politics_tweets(count=3000, seed=5, as_batch=True), "politics")
+
+    def _assert_matches_frame(self, aggregates, df):
+        self.assertEqual(len(aggregates), len(df))
+        self.assertEqual(aggregates.engagement, int(df["Engagement"].sum()))
+        self.assertEqual(aggregates.likes, int(df["Likes"].sum()))
+        for dim in aggregates.dimensions:
+            expected = df.groupby(dim, observed=True)["Engagement"].agg(["sum", "count"])
+            pd.testing.assert_series_equal(aggregates.engagement_by(dim), expected["sum"], check_names=False)
+            pd.testing.assert_series_equal(aggregates.count_by(dim), expected["count"], check_names=False)
+
+    def test_merge_of_chunks_equals_whole_frame(self):
+        parts = [PartialAggregates.from_frame(self.df.iloc[i:i + 700], "politics") for i in range(0, len(self.df), 700)]
+        merged = PartialAggregates("politics")
+        for part in parts:
+            merged.merge(part)
+        self._assert_matches_frame(merged, self.df)
+
+    def test_add_is_order_independent_and_leaves_operands(self):
+        first = PartialAggregates.from_frame(self.df.iloc[:1000], "politics")
+        second = PartialAggregates.from_frame(self.df.iloc[1000:], "politics")
+        rows_before = len(first)
+        forward, backward = first + second, second + first
+        self.assertEqual(len(first), rows_before)
+        for dim in forward.dimensions:
+            pd.testing.assert_series_equal(forward.engagement_by(dim), backward.engagement_by(dim).sort_index())
+        self._assert_matches_frame(forward, self.df)
+
+    def test_empty_chunks_and_topic_mismatch(self):
+        aggregates = PartialAggregates("politics").update(pd.DataFrame()).update(None)
+        self.assertTrue(aggregates.empty)
+        self.assertEqual((aggregates + PartialAggregates.from_frame(self.df, "politics")).rows, len(self.df))
+        with self.assertRaises(ValueError):
+            aggregates.merge(PartialAggregates("travel"))
+
+    def test_stream_aggregates_feed_insights(self):
+        batch = TweetGenerator.generate_travel_tweets(count=2500, seed=9, as_batch=True)
+        aggregates = process_data_stream(batch, "travel", chunk_size=600, aggregate=True)
+        df = process_data(batch, "travel")
+        self._assert_matches_frame(aggregates, df)
+        self.assertEqual(generate_agent_insights(aggregates, "travel"), generate_agent_insights(df, "travel"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import api_server
+
+
+class TestClients(unittest.TestCase):
+    def test_concurrent_requests_share_one_client_set(self):
+        request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+        built = []
+        real = api_server.AppClients
+
+        def build():
+            built.append(real())
+            return built[-1]
+
+        def serve():
+            for _ in range(200):
+                api_server._clients(request)
+
+        no_stream = mock.patch.dict("os.environ", {"TWITTER_STREAM_INGEST": ""})
+        with mock.patch.object(api_server, "AppClients", side_effect=build), no_stream:
+            threads = [threading.Thread(target=serve) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(len(built), 1)
+        self.assertIs(request.app.state.clients, built[0])
+        self.assertEqual(built[0].requests, 1600)
+
+
+if __name__ == '__main__':
+    unittest.main()
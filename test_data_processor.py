@@ -0,0 +1,148 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from data_processor import (
+    ALL_POLITICIANS,
+    CINEMA_INDUSTRIES,
+    CITY_STATE_MAP,
+    KARNATAKA_PARTIES,
+    SPORTS_CATEGORIES,
+    SPORTS_PERSONS,
+    TRAVEL_CATEGORY_MAP,
+    process_data,
+)
+from time_model import TimeColumn
+from tweet_generator import TweetGenerator
+from tweet_batch import TweetBatch
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def baseline_process_data(tweets, topic="travel"):
+    """The original per-tweet process_data loop, kept as the reference output."""
+    def first(options, text):
+        return next((o for o in options if o.lower() in text.lower()), "Other")
+
+    def place(loc):
+        for city, mapped_state in CITY_STATE_MAP.items():
+            if city.lower() in loc.lower():
+                return city, mapped_state
+        return loc, "Unknown"
+
+    data = []
+    for tweet in tweets:
+        created_at = tweet['created_at']
+        dt = datetime.fromisoformat(created_at) if isinstance(created_at, str) else created_at
+        common = {
+            "Text": tweet['text'],
+            "Likes": tweet['likes'],
+            "Retweets": tweet['retweets'],
+            "Engagement": tweet['likes'] + tweet['retweets'],
+            "Hour": dt.hour,
+            "Sentiment": 0.0,
+            "Sex": tweet.get("user_sex", "Unknown"),
+            "AgeGroup": tweet.get("user_age_group", "Unknown"),
+            "UserLocationRaw": tweet.get("user_location_raw", tweet.get("location", "Unknown")),
+        }
+        if topic == "travel":
+            city, state = place(tweet['location'])
+            row = {"Location": city, "State": state, "Category": TRAVEL_CATEGORY_MAP.get(city, "Other")}
+        else:
+            city, state = place(tweet.get("location", "Unknown"))
+            if topic == "politics":
+                row = {"Party": first(KARNATAKA_PARTIES, tweet['text']), "Politician": first(ALL_POLITICIANS, tweet['text'])}
+            elif topic == "sports":
+                row = {"Sport": first(SPORTS_CATEGORIES, tweet['text']), "SportsPerson": first(SPORTS_PERSONS, tweet['text'])}
+            else:
+                industry = tweet.get("industry", "Other")
+                row = {"Movie": tweet.get("movie", "Unknown"), "Industry": industry if industry in CINEMA_INDUSTRIES else "Other"}
+            row.update({"Location": city, "State": state})
+        row.update(common)
+        data.append(row)
+    return pd.DataFrame(data)
+
+
+def _tweet(text, location, created_at, likes=3, retweets=1, **extra):
+    return {"text": text, "location": location, "created_at": created_at, "likes": likes, "retweets": retweets, **extra}
+
+
+TOPICS = ["travel", "politics", "sports", "cinema"]
+
+# Hand-written rows for the matching rules: case-insensitive substrings, first match in
+# dictionary order wins, unknown places/industries fall back
+EDGE_TWEETS = [
+    _tweet("bjp and CONGRESS rally in mysore with siddaramaiah", "near Mysore palace", "2024-01-01T10:30:00",
+           industry="Kollywood", movie="Kantara"),
+    _tweet("Kabaddi and Cricket tonight, virat kohli and ms dhoni", "Somewhere", "2024-01-01T23:59:59",
+           user_sex="F", user_age_group="25-34", industry="Sandalwood"),
+    _tweet("Quiet day", "Unknown", "2024-01-02T00:00:00", likes=0, retweets=0, user_location_raw="Earth"),
+]
+
+
+class TestProcessDataParity(unittest.TestCase):
+    """process_data gives the same frame as the original loop, for every topic and input format."""
+
+    def _check(self, topic, records, batch=None):
+        expected = baseline_process_data(records, topic)
+        pd.testing.assert_frame_equal(process_data(records, topic), expected)
+        if batch is not False:
+            pd.testing.assert_frame_equal(process_data(batch or TweetBatch.from_records(records), topic), expected)
+
+    def test_generated_tweets(self):
+        for topic in TOPICS:
+            with self.subTest(topic=topic):
+                generate = getattr(TweetGenerator, f"generate_{topic}_tweets")
+                self._check(topic, generate(count=2000, seed=7), generate(count=2000, seed=7, as_batch=True))
+
+    def test_skewed_tweets(self):
+        for topic in TOPICS:
+            with self.subTest(topic=topic):
+                generate = getattr(TweetGenerator, f"generate_{topic}_tweets")
+                self._check(topic, generate(count=2000, seed=11, workload="production"))
+
+    def test_edge_cases(self):
+        for topic in TOPICS:
+            with self.subTest(topic=topic):
+                # Records omit different keys; a TweetBatch turns missing keys into None, so
+                # only the list-of-dict path sees the per-key defaults
+                self._check(topic, EDGE_TWEETS, batch=False)
+
+    def test_empty_and_unknown_topic(self):
+        self.assertTrue(process_data([], "travel").empty)
+        self.assertTrue(process_data(EDGE_TWEETS, "weather").empty)
+
+
+class TestTimezoneHours(unittest.TestCase):
+    """Hour is the local clock hour of each created_at, as the per-tweet loop computed it."""
+
+    def setUp(self):
+        self.tweets = [
+            _tweet("Beach day in Goa", "Goa, India", "2024-01-01T10:30:00+05:30"),
+            _tweet("Trek near Manali", "Manali", "2024-01-01T23:10:00-04:00"),
+            _tweet("Sunrise in Kerala", "Kerala", "2024-01-01T10:30:00Z"),
+            _tweet("Old town Jaipur", "Jaipur", "2024-01-01T07:05:00"),
+            _tweet("Ghats of Varanasi", "Varanasi", datetime(2024, 1, 1, 10, 30, tzinfo=IST)),
+            _tweet("Night in Mumbai", "Mumbai", datetime(2024, 1, 1, 0, 15, tzinfo=IST)),
+        ]
+
+    def test_hours_match_baseline(self):
+        expected = baseline_process_data(self.tweets)["Hour"].tolist()
+        self.assertEqual(expected, [10, 23, 10, 7, 10, 0])
+        self.assertEqual(process_data(self.tweets)["Hour"].tolist(), expected)
+
+    def test_batch_hours_match_baseline(self):
+        expected = baseline_process_data(self.tweets)["Hour"].tolist()
+        self.assertEqual(process_data(TweetBatch.from_records(self.tweets))["Hour"].tolist(), expected)
+
+    def test_time_column_keeps_offsets(self):
+        times = TimeColumn.parse([t["created_at"] for t in self.tweets])
+        self.assertEqual(times.offsets.tolist(), [19800, -14400, 0, 0, 19800, 19800])
+        self.assertEqual(times.hour_of_day().tolist(), [10, 23, 10, 7, 10, 0])
+        # Buckets stay UTC: 10:30 IST is 05:00 UTC
+        self.assertEqual(str(times.hour_buckets()[0]), "2024-01-01T05:00:00")
+
+
+if __name__ == '__main__':
+    unittest.main()
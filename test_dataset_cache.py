@@ -0,0 +1,70 @@
+import tempfile
+import threading
+import time
+import unittest
+
+from dataset_cache import DatasetCache
+from tweet_batch import TweetBatch
+
+
+class TestGetOrCreate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DatasetCache(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_concurrent_callers_share_one_factory_call(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return TweetBatch.from_records([{"text": "a"}])
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get_or_create("k", factory))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(self.cache._creating, {})
+
+    def test_failed_factory_releases_waiters(self):
+        def failing():
+            time.sleep(0.05)
+            raise RuntimeError("boom")
+
+        errors = []
+
+        def first():
+            try:
+                self.cache.get_or_create("k", failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        results = []
+        t1 = threading.Thread(target=first)
+        t1.start()
+        time.sleep(0.01)
+        t2 = threading.Thread(target=lambda: results.append(
+            self.cache.get_or_create("k", lambda: TweetBatch.from_records([{"text": "b"}]))
+        ))
+        t2.start()
+        t1.join(5)
+        t2.join(5)
+        self.assertFalse(t2.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(results[0].to_records(), [{"text": "b"}])
+        self.assertEqual(self.cache._creating, {})
+
+        # Nothing left behind for the key: a later miss runs its factory normally
+        self.cache.clear()
+        self.assertEqual(len(self.cache.get_or_create("k", lambda: TweetBatch.from_records([{"text": "c"}]))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
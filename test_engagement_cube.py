@@ -0,0 +1,58 @@
+import unittest
+
+import pandas as pd
+
+from data_processor import compact_frame, process_data
+from engagement_cube import EngagementCube
+from tweet_generator import TweetGenerator
+
+
+class TestEngagementCube(unittest.TestCase):
+    def setUp(self):
+        self.df = process_data(TweetGenerator.generate_sports_tweets(count=3000, seed=3, as_batch=True), "sports")
+        self.cube = EngagementCube(self.df)
+
+    def test_totals_match_groupby(self):
+        for dim in ("State", "Sport", "Hour", "Sex"):
+            expected = self.df.groupby(dim, observed=True)["Engagement"].sum()
+            pd.testing.assert_series_equal(self.cube.totals(dim), expected, check_dtype=False)
+            counts = self.df.groupby(dim, observed=True).size()
+            pd.testing.assert_series_equal(self.cube.totals(dim, "Count"), counts, check_names=False, check_dtype=False)
+        self.assertEqual(self.cube.engagement, int(self.df["Engagement"].sum()))
+
+    def test_slice_and_exclude(self):
+        ka = self.cube.slice(State="Karnataka")
+        rest = self.cube.exclude(State="Karnataka")
+        self.assertEqual(len(ka) + len(rest), len(self.cube))
+        expected = self.df[self.df["State"] == "Karnataka"].groupby("Sport")["Engagement"].sum()
+        pd.testing.assert_series_equal(ka.totals("Sport"), expected, check_dtype=False)
+        self.assertNotIn("Karnataka", rest.values("State"))
+
+        both = self.cube.slice(Sport=["Cricket", "Chess"], Sex="F")
+        rows = self.df[self.df["Sport"].isin(["Cricket", "Chess"]) & (self.df["Sex"] == "F")]
+        self.assertEqual(len(both), len(rows))
+        self.assertEqual(both.engagement, int(rows["Engagement"].sum()))
+        self.assertTrue(self.cube.slice(State="Atlantis").empty)
+
+    def test_top_k(self):
+        expected = self.df.groupby("Location")["Engagement"].sum().sort_values(ascending=False)
+        top = self.cube.top_k("Location", 5)
+        self.assertEqual(len(top), 5)
+        self.assertEqual(top.tolist(), expected.head(5).tolist())
+        self.assertEqual(len(self.cube.top_k("Location", None)), self.df["Location"].nunique())
+        self.assertTrue(top.is_monotonic_decreasing)
+
+    def test_pivot_matches_pivot_table(self):
+        expected = self.df.pivot_table(index="Hour", columns="Sport", values="Engagement", aggfunc="sum", fill_value=0)
+        pd.testing.assert_frame_equal(self.cube.pivot("Hour", "Sport"), expected, check_dtype=False, check_names=False)
+
+    def test_compact_frame_gives_same_totals(self):
+        cube = EngagementCube(compact_frame(self.df))
+        for dim in ("State", "SportsPerson"):
+            pd.testing.assert_series_equal(
+                cube.totals(dim), self.cube.totals(dim), check_index_type=False, check_dtype=False, check_categorical=False,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fetchers import TwitterFetcher, _search_window
+
+
+class _FakeClient:
+    """Stands in for tweepy.Client: one page of tweets per search, recording the arguments."""
+
+    def __init__(self, tweets=2):
+        self.calls = []
+        self.tweets = tweets
+
+    def search_recent_tweets(self, **kwargs):
+        self.calls.append(kwargs)
+        data = [
+            SimpleNamespace(
+                id=str(i), text=f"tweet {i}", author_id=None, entities={},
+                public_metrics={"like_count": i, "retweet_count": 0},
+                created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            )
+            for i in range(self.tweets)
+        ]
+        return SimpleNamespace(data=data, includes={}, meta={"result_count": len(data)})
+
+
+class TestSearchWindow(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2024, 6, 15, 12, 0, 30)
+
+    def test_recent_window_is_pushed_down(self):
+        start, end = _search_window(date(2024, 6, 13), date(2024, 6, 13), now=self.now)
+        self.assertEqual(start, datetime(2024, 6, 13))
+        self.assertEqual(end, datetime(2024, 6, 14))
+
+    def test_start_is_clamped_to_seven_days(self):
+        start, end = _search_window(date(2024, 6, 1), None, now=self.now)
+        self.assertEqual(start, (self.now - timedelta(days=7) + timedelta(minutes=1)).replace(second=0))
+        self.assertIsNone(end)
+
+    def test_old_window_is_none(self):
+        self.assertIsNone(_search_window(date(2020, 1, 1), date(2020, 1, 2), now=self.now))
+
+
+class TestOldWindowFallback(unittest.TestCase):
+    def test_old_window_returns_latest_page(self):
+        fetcher = TwitterFetcher()
+        fetcher.client = _FakeClient(tweets=3)
+        tweets = fetcher.fetch_trends("cinema India", "cinema", max_results=20,
+                                      from_date=date(2020, 1, 1), end_date=date(2020, 1, 2))
+        self.assertEqual(len(tweets), 3)
+        self.assertEqual(len(fetcher.client.calls), 1)
+        call = fetcher.client.calls[0]
+        self.assertIsNone(call["start_time"])
+        self.assertIsNone(call["end_time"])
+        self.assertEqual(call["max_results"], 20)
+
+
+class TestFetchTrends(unittest.TestCase):
+    def test_max_results_none_collects_every_page(self):
+        fetcher = TwitterFetcher()
+        fetcher.client = _FakeClient(tweets=4)
+        tweets = fetcher.fetch_trends("travel India", "travel", max_results=None)
+        self.assertEqual([t["text"] for t in tweets], [f"tweet {i}" for i in range(4)])
+        self.assertEqual(len(fetcher.fetch_trends("travel India", "travel", max_results=None, as_batch=True)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import threading
+import time
+import unittest
+
+from request_scheduler import (
+    PRIORITY_BACKGROUND,
+    RateLimitExceeded,
+    RequestScheduler,
+    TokenBucket,
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_starts_full_and_refills_evenly(self):
+        bucket = TokenBucket(limit=10, window=100)
+        now = bucket.updated
+        for _ in range(10):
+            self.assertTrue(bucket.take(now))
+        self.assertFalse(bucket.take(now))
+        # One token every 10 seconds
+        self.assertAlmostEqual(bucket.wait_time(now), 10.0)
+        self.assertTrue(bucket.take(now + 10.0))
+        self.assertFalse(bucket.take(now + 10.0))
+
+    def test_keep_reserves_tokens(self):
+        bucket = TokenBucket(limit=10, window=100)
+        now = bucket.updated
+        for _ in range(9):
+            self.assertTrue(bucket.take(now, keep=1))
+        self.assertFalse(bucket.take(now, keep=1))
+        self.assertTrue(bucket.take(now))
+
+    def test_server_headers_are_authoritative(self):
+        bucket = TokenBucket(limit=450, window=900)
+        now = time.monotonic()
+        bucket.observe(limit=450, remaining=2, reset_epoch=int(time.time()) + 60, now=now)
+        self.assertTrue(bucket.take(now))
+        self.assertTrue(bucket.take(now))
+        self.assertFalse(bucket.take(now))
+        # Empty until the reported reset, then the whole limit is back
+        self.assertAlmostEqual(bucket.wait_time(now), 60, delta=1.5)
+        self.assertTrue(bucket.take(now + 61))
+        self.assertAlmostEqual(bucket.tokens, 449)
+
+    def test_new_limit_from_headers(self):
+        bucket = TokenBucket()
+        self.assertEqual(bucket.wait_time(time.monotonic()), 0.0)
+        bucket.observe(limit=300, remaining=None, reset_epoch=None, now=time.monotonic())
+        self.assertEqual(bucket.limit, 300)
+        self.assertEqual(bucket.tokens, 300.0)
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def test_identical_calls_are_coalesced(self):
+        scheduler = RequestScheduler(limits={"/x": (100, 900)})
+        started = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return "payload"
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(scheduler.call("/x", slow, key="q")))
+        first.start()
+        started.wait(2)
+        others = [threading.Thread(target=lambda: results.append(scheduler.call("/x", slow, key="q"))) for _ in range(4)]
+        for t in others:
+            t.start()
+        for t in [first] + others:
+            t.join(2)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["payload"] * 5)
+        self.assertEqual(scheduler.stats()["coalesced"], 4)
+
+    def test_failed_call_releases_its_key(self):
+        scheduler = RequestScheduler(limits={})
+
+        def failing():
+            raise ValueError("upstream down")
+
+        with self.assertRaises(ValueError):
+            scheduler.call("/x", failing, key="q")
+        # The key is released, so the next call runs again
+        self.assertEqual(scheduler.call("/x", lambda: 1, key="q"), 1)
+
+    def test_rejects_when_wait_exceeds_max_wait(self):
+        scheduler = RequestScheduler(limits={"/x": (2, 900)}, max_wait=0.05)
+        scheduler.call("/x", lambda: None)
+        scheduler.call("/x", lambda: None)
+        with self.assertRaises(RateLimitExceeded) as caught:
+            scheduler.call("/x", lambda: None)
+        self.assertEqual(caught.exception.endpoint, "/x")
+        self.assertGreater(caught.exception.wait, 400)
+        self.assertEqual(scheduler.stats()["rejected"], 1)
+
+    def test_background_calls_leave_the_reserve(self):
+        scheduler = RequestScheduler(limits={"/x": (10, 900)}, max_wait=0)
+        for _ in range(9):
+            scheduler.call("/x", lambda: None, priority=PRIORITY_BACKGROUND)
+        with self.assertRaises(RateLimitExceeded):
+            scheduler.call("/x", lambda: None, priority=PRIORITY_BACKGROUND)
+        # The last token is kept for interactive calls
+        self.assertIsNone(scheduler.call("/x", lambda: None))
+
+    def test_429_empties_the_bucket(self):
+        scheduler = RequestScheduler(limits={"/x": (100, 900)}, max_wait=0)
+        scheduler.observe("/x", {"x-rate-limit-reset": str(int(time.time()) + 120)}, status=429)
+        with self.assertRaises(RateLimitExceeded):
+            scheduler.call("/x", lambda: None)
+        self.assertEqual(scheduler.stats()["buckets"]["/x"]["tokens"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
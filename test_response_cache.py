@@ -0,0 +1,108 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from response_cache import ResponseCache, response_key
+
+
+def _response(status=200, body=b'{"data": []}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class _Upstream:
+    """Serves one resource with an ETag, answering 304 to a matching If-None-Match."""
+
+    def __init__(self, etag='"v1"', body=b'{"data": [1]}'):
+        self.etag = etag
+        self.body = body
+        self.requests = []
+
+    def __call__(self, headers):
+        self.requests.append(dict(headers))
+        if headers.get("If-None-Match") == self.etag:
+            return _response(304)
+        return _response(200, self.body, {"ETag": self.etag, "Content-Type": "application/json"})
+
+
+class TestResponseCache(unittest.TestCase):
+    URL = "https://api.example.com/2/tweets/search/recent"
+
+    def test_fresh_entries_are_hits(self):
+        cache = ResponseCache(ttls={"twitter": 60})
+        upstream = _Upstream()
+        first = cache.fetch("twitter", self.URL, {"query": "a", "max_results": 10}, upstream)
+        second = cache.fetch("twitter", self.URL, {"max_results": "10", "query": "a", "next_token": None}, upstream)
+        self.assertEqual(len(upstream.requests), 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers["x-cache"], "hit")
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_expired_entries_are_revalidated_with_etag(self):
+        cache = ResponseCache(ttls={"twitter": 60})
+        upstream = _Upstream()
+        with mock.patch("response_cache.time.time", return_value=1000.0):
+            cache.fetch("twitter", self.URL, {"query": "a"}, upstream)
+        with mock.patch("response_cache.time.time", return_value=1061.0):
+            response = cache.fetch("twitter", self.URL, {"query": "a"}, upstream)
+        self.assertEqual(upstream.requests[1], {"If-None-Match": '"v1"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"data": [1]}')
+        self.assertEqual(response.headers["x-cache"], "revalidated")
+        # The 304 refreshed the entry, so it is fresh again for another TTL
+        with mock.patch("response_cache.time.time", return_value=1100.0):
+            cache.fetch("twitter", self.URL, {"query": "a"}, upstream)
+        self.assertEqual(len(upstream.requests), 2)
+
+    def test_changed_resource_replaces_entry(self):
+        cache = ResponseCache(ttls={"news": 10})
+        upstream = _Upstream()
+        with mock.patch("response_cache.time.time", return_value=0.0):
+            cache.fetch("news", self.URL, None, upstream)
+        upstream.etag, upstream.body = '"v2"', b'{"data": [2]}'
+        with mock.patch("response_cache.time.time", return_value=20.0):
+            response = cache.fetch("news", self.URL, None, upstream)
+            self.assertEqual(response.content, b'{"data": [2]}')
+            self.assertEqual(cache.fetch("news", self.URL, None, upstream).headers["x-cache"], "hit")
+
+    def test_errors_and_disabled_sources_are_not_cached(self):
+        cache = ResponseCache(ttls={"twitter": 60, "instagram": 0})
+        calls = []
+
+        def failing(headers):
+            calls.append(headers)
+            return _response(503)
+
+        cache.fetch("twitter", self.URL, None, failing)
+        cache.fetch("twitter", self.URL, None, failing)
+        cache.fetch("instagram", self.URL, None, _Upstream())
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_bound_and_disk_tier(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(max_items=2, cache_dir=tmp, ttls={"twitter": 60})
+            for query in ("a", "b", "c"):
+                cache.fetch("twitter", self.URL, {"query": query}, _Upstream(body=query.encode()))
+            self.assertEqual(len(cache), 2)
+            # "a" left memory but is still on disk; a new instance (a restart) reads it too
+            restarted = ResponseCache(cache_dir=tmp, ttls={"twitter": 60})
+            upstream = _Upstream()
+            self.assertEqual(restarted.fetch("twitter", self.URL, {"query": "a"}, upstream).content, b"a")
+            self.assertEqual(upstream.requests, [])
+
+    def test_vary_keeps_credentials_apart(self):
+        self.assertNotEqual(
+            response_key("twitter", self.URL, {"q": 1}, vary="Bearer one"),
+            response_key("twitter", self.URL, {"q": 1}, vary="Bearer two"),
+        )
+        self.assertEqual(response_key("twitter", self.URL + "?x=1", {"q": 1}), response_key("twitter", self.URL, {"q": "1"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import stream_ingestor
+from stream_ingestor import StreamIngestor, TweetRingBuffer
+
+NOW = 1_700_000_000 // 60 * 60  # a bucket boundary
+
+
+class TestTweetRingBuffer(unittest.TestCase):
+    def setUp(self):
+        # 10 one-minute buckets, so 11 slots
+        self.buffer = TweetRingBuffer(window_seconds=600, bucket_seconds=60, max_per_bucket=3)
+
+    def test_records_expire_as_the_window_moves(self):
+        for minute in range(10):
+            self.assertTrue(self.buffer.add("cinema", minute, NOW + minute * 60, now=NOW + minute * 60))
+        later = NOW + 9 * 60
+        self.assertEqual(self.buffer.records("cinema", now=later), list(range(10)))
+        # Five minutes on, the window (the current bucket and the ten before it) starts at minute 4
+        self.assertEqual(self.buffer.records("cinema", now=later + 300), [4, 5, 6, 7, 8, 9])
+        self.assertEqual(self.buffer.records("cinema", now=later + 3600), [])
+
+    def test_slots_are_reused_when_the_ring_comes_round(self):
+        self.buffer.add("travel", "old", NOW, now=NOW)
+        # Eleven buckets later the same slot holds a new bucket, and the old tweet is gone
+        later = NOW + 11 * 60
+        self.assertTrue(self.buffer.add("travel", "new", later, now=later))
+        self.assertEqual(self.buffer.records("travel", now=later), ["new"])
+        self.assertEqual(self.buffer.counts("travel", now=later), [(later, 1)])
+
+    def test_late_and_overflowing_tweets_are_dropped(self):
+        self.assertFalse(self.buffer.add("sports", "stale", NOW - 11 * 60, now=NOW))
+        self.buffer.add("sports", "new", NOW, now=NOW)
+        # A late tweet whose slot already holds a newer bucket is not written over it
+        self.assertFalse(self.buffer.add("sports", "late", NOW - 11 * 60, now=NOW - 60))
+        for i in range(3):
+            self.buffer.add("sports", i, NOW + 1, now=NOW)
+        self.assertFalse(self.buffer.add("sports", "full", NOW + 2, now=NOW))
+        self.assertEqual(self.buffer.records("sports", now=NOW), ["new", 0, 1])
+        self.assertEqual((self.buffer.added, self.buffer.dropped), (3, 4))
+
+    def test_window_argument_and_topics(self):
+        for minute in range(5):
+            self.buffer.add("politics", minute, NOW + minute * 60, now=NOW + minute * 60)
+        self.buffer.add("cinema", "x", NOW, now=NOW)
+        now = NOW + 4 * 60
+        self.assertEqual(self.buffer.records("politics", window_seconds=120, now=now), [2, 3, 4])
+        self.assertEqual([n for _, n in self.buffer.counts("politics", now=now)], [1] * 5)
+        self.assertEqual(self.buffer.topics(), ["cinema", "politics"])
+        self.assertEqual(self.buffer.stats(now=now), {"topics": {"cinema": 1, "politics": 5}, "added": 6, "dropped": 0})
+        self.assertEqual(self.buffer.records("unknown", now=now), [])
+
+
+class _RulesSession:
+    """Stand-in for the stream rules endpoint: one account's rules, shared by every app."""
+
+    def __init__(self, rules):
+        self.rules = {rule["id"]: rule for rule in rules}
+        self.deleted = []
+
+    def _response(self, body):
+        return SimpleNamespace(json=lambda: body, raise_for_status=lambda: None)
+
+    def get(self, url):
+        return self._response({"data": list(self.rules.values())})
+
+    def post(self, url, json):
+        for rule_id in json.get("delete", {}).get("ids", []):
+            self.deleted.append(rule_id)
+            self.rules.pop(rule_id)
+        for i, rule in enumerate(json.get("add", [])):
+            rule_id = f"new{i}"
+            self.rules[rule_id] = dict(rule, id=rule_id)
+        return self._response({})
+
+
+class TestSyncRules(unittest.TestCase):
+    def test_only_owned_rules_are_replaced(self):
+        ingestor = StreamIngestor(queries=[{"topic": "travel", "query": "travel Kerala"}], bearer_token="token")
+        session = ingestor._session = _RulesSession([
+            {"id": "1", "value": "travel India -is:retweet lang:en", "tag": "travel"},
+            {"id": "2", "value": "cinema India -is:retweet lang:en", "tag": "cinema"},
+            {"id": "3", "value": "from:someone", "tag": "other-app"},
+            {"id": "4", "value": "untagged rule"},
+        ])
+        ingestor.sync_rules()
+        # Stale rules under this service's topics go; other consumers' rules stay
+        self.assertEqual(sorted(session.deleted), ["1", "2"])
+        self.assertEqual(
+            sorted((rule["value"], rule.get("tag")) for rule in session.rules.values()),
+            [("from:someone", "other-app"), ("travel Kerala -is:retweet lang:en", "travel"), ("untagged rule", None)],
+        )
+        ingestor.sync_rules()
+        self.assertEqual(len(session.rules), 3)
+
+
+class TestSharedIngestor(unittest.TestCase):
+    def test_stopping_the_shared_ingestor_forgets_it(self):
+        ingestor = StreamIngestor(bearer_token="token")
+        stream_ingestor._shared = ingestor
+        try:
+            other = StreamIngestor(bearer_token="token")
+            other.stop()
+            self.assertIs(stream_ingestor._shared, ingestor)
+            ingestor.stop()
+            self.assertIsNone(stream_ingestor._shared)
+        finally:
+            stream_ingestor._shared = None
+
+    def test_only_one_process_owns_the_stream(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stream.lock")
+            owner = stream_ingestor._lock_file(path)
+            self.assertIsNotNone(owner)
+            # The lock is per open file, so a second holder in this process stands in for another worker
+            self.assertIsNone(stream_ingestor._lock_file(path))
+            env = {"TWITTER_STREAM_INGEST": "1", "TWITTER_BEARER_TOKEN": "token"}
+            with mock.patch.object(stream_ingestor, "STREAM_LOCK_PATH", path), mock.patch.dict(os.environ, env):
+                self.assertIsNone(stream_ingestor.shared_ingestor())
+                owner.close()
+                # The owner went away; without credentials the new owner does not start and lets the lock go
+                with mock.patch.dict(os.environ, {"TWITTER_BEARER_TOKEN": "", "TWITTER_API_BASE_URL": ""}):
+                    self.assertIsNone(stream_ingestor.shared_ingestor())
+                again = stream_ingestor._lock_file(path)
+                self.assertIsNotNone(again)
+                again.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
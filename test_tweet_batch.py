@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from tweet_batch import TweetBatch
+from tweet_generator import TweetGenerator
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def _records():
+    return [
+        {"text": "Beach day in Goa", "location": "Goa", "likes": 10, "retweets": 2, "created_at": "2024-01-01T10:30:00", "movie": None},
+        {"text": "Trek near Manali", "location": "Manali", "likes": 0, "retweets": None, "created_at": "2024-01-02T23:59:59", "movie": "Kantara"},
+        {"text": "Beach day in Goa", "location": None, "likes": 7, "retweets": 1, "created_at": "2024-01-03T00:00:00"},
+    ]
+
+
+class TestTweetBatchRoundTrip(unittest.TestCase):
+    def test_records_round_trip(self):
+        records = _records()
+        batch = TweetBatch.from_records(records)
+        self.assertEqual(len(batch), 3)
+        out = batch.to_records()
+        # Keys missing from a record come back as None
+        expected = [dict(r, movie=r.get("movie")) for r in records]
+        self.assertEqual(out, expected)
+        self.assertEqual(batch[1].to_dict(), expected[1])
+        self.assertEqual(batch[1]["retweets"], None)
+
+    def test_save_load_round_trip(self):
+        batch = TweetBatch.from_records(_records())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "batch.npz")
+            batch.save(path)
+            loaded = TweetBatch.load(path)
+        self.assertEqual(loaded.to_records(), batch.to_records())
+        self.assertEqual(loaded.fields, batch.fields)
+
+    def test_aware_timestamps_keep_their_offset(self):
+        records = [
+            {"text": "a", "likes": 1, "created_at": datetime(2024, 1, 1, 10, 30, tzinfo=IST)},
+            {"text": "b", "likes": 2, "created_at": datetime(2024, 1, 1, 3, 0, tzinfo=timezone.utc)},
+            {"text": "c", "likes": 3, "created_at": datetime(2024, 1, 1, 23, 0, tzinfo=timezone(timedelta(hours=-4)))},
+        ]
+        batch = TweetBatch.from_records(records)
+        stamps = [r["created_at"] for r in batch.to_records()]
+        self.assertEqual(stamps, ["2024-01-01T10:30:00+05:30", "2024-01-01T03:00:00+00:00", "2024-01-01T23:00:00-04:00"])
+        self.assertEqual([datetime.fromisoformat(s) for s in stamps], [r["created_at"] for r in records])
+        self.assertEqual(batch[0]["created_at"], stamps[0])
+        self.assertEqual(batch.times().hour_of_day().tolist(), [10, 3, 23])
+        self.assertEqual(batch.take([2, 0]).to_records()[0]["created_at"], stamps[2])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "batch.npz")
+            batch.save(path)
+            self.assertEqual([r["created_at"] for r in TweetBatch.load(path).to_records()], stamps)
+
+    def test_concat_fills_missing_fields(self):
+        first = TweetBatch.from_records([{"text": "x", "likes": 1, "created_at": "2024-01-01T01:00:00"}])
+        second = TweetBatch.from_records([{"text": "y", "likes": 2, "created_at": "2024-01-01T02:00:00", "movie": "Kantara"}])
+        merged = TweetBatch.concat([first, second])
+        self.assertEqual([r["movie"] for r in merged.to_records()], [None, "Kantara"])
+        self.assertEqual([r["text"] for r in merged.to_records()], ["x", "y"])
+
+
+class TestShardedBatchRoundTrip(unittest.TestCase):
+    """Batches built from shards with their own user vocabularies survive concat, records and save/load."""
+
+    def setUp(self):
+        self.batch = TweetGenerator.generate_sharded(
+            "cinema", 3000, date(2024, 3, 1), date(2024, 3, 4), shard="day", workers=1, seed=21, as_batch=True,
+        )
+
+    def test_concat_matches_record_concatenation(self):
+        shards = [
+            TweetGenerator.generate_sharded("cinema", 500, date(2024, 3, d), date(2024, 3, d), workers=1, seed=d, as_batch=True)
+            for d in (1, 2, 3)
+        ]
+        # User ids keep a per-batch vocabulary, so concat has to remap their codes
+        self.assertNotEqual(list(shards[0].columns["user_id"].categories), list(shards[1].columns["user_id"].categories))
+        merged = TweetBatch.concat(shards)
+        self.assertEqual(merged.to_records(), [r for shard in shards for r in shard.to_records()])
+
+    def test_records_round_trip(self):
+        records = self.batch.to_records()
+        self.assertEqual(len(records), 3000)
+        self.assertEqual(TweetBatch.from_records(records).to_records(), records)
+
+    def test_save_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sharded.npz")
+            self.batch.save(path)
+            loaded = TweetBatch.load(path)
+        self.assertEqual(loaded.to_records(), self.batch.to_records())
+        self.assertEqual(loaded.columns["text"].dtype, self.batch.columns["text"].dtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
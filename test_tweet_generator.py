@@ -0,0 +1,94 @@
+import unittest
+from datetime import date
+
+import numpy as np
+
+from tweet_batch import TweetBatch
+from tweet_generator import TweetGenerator
+
+SHARED_FIELDS = ("text", "location", "user_location_raw")
+
+
+class TestShardedGeneration(unittest.TestCase):
+    def _sharded(self, workers, seed=42, shard="day", topic="politics"):
+        return TweetGenerator.generate_sharded(
+            topic, 4000, date(2024, 5, 1), date(2024, 5, 5), shard=shard, workers=workers, seed=seed, as_batch=True,
+        )
+
+    def test_same_output_for_any_worker_count(self):
+        serial = self._sharded(workers=1)
+        parallel = self._sharded(workers=3)
+        self.assertEqual(len(serial), 4000)
+        self.assertEqual(parallel.to_records(), serial.to_records())
+
+    def test_hour_shards_are_deterministic(self):
+        first = self._sharded(workers=2, shard="hour", topic="cinema")
+        self.assertEqual(self._sharded(workers=1, shard="hour", topic="cinema").to_records(), first.to_records())
+
+    def test_seed_changes_output(self):
+        self.assertEqual(self._sharded(workers=1).to_records(), self._sharded(workers=1).to_records())
+        self.assertNotEqual(self._sharded(workers=1, seed=7).to_records(), self._sharded(workers=1).to_records())
+
+    def test_tweets_stay_inside_the_window(self):
+        times = self._sharded(workers=2).times()
+        days = times.dates()
+        self.assertTrue(times.valid.all())
+        self.assertEqual(str(days.min()), "2024-05-01")
+        self.assertEqual(str(days.max()), "2024-05-05")
+
+
+class TestInternedVocabularies(unittest.TestCase):
+    def test_vocabulary_is_rendered_once_per_process(self):
+        for topic in ("travel", "cinema", "politics", "sports"):
+            self.assertIs(TweetGenerator._vocabulary(topic), TweetGenerator._vocabulary(topic))
+        first = TweetGenerator.generate_travel_tweets(count=200, seed=1, as_batch=True)
+        second = TweetGenerator.generate_travel_tweets(count=300, seed=2, as_batch=True)
+        # Batches from separate calls reuse the cached dtype objects instead of building their own
+        for field in SHARED_FIELDS:
+            self.assertIs(first.columns[field].dtype, second.columns[field].dtype)
+
+    def test_text_vocabulary_is_deduplicated(self):
+        text = TweetGenerator.generate_politics_tweets(count=2000, seed=5, as_batch=True).columns["text"]
+        categories = list(text.categories)
+        self.assertEqual(len(categories), len(set(categories)))
+        self.assertLess(len(categories), len(text))
+
+    def test_codes_are_stable_across_batches(self):
+        first = TweetGenerator.generate_cinema_tweets(count=500, seed=3, as_batch=True)
+        second = TweetGenerator.generate_cinema_tweets(count=500, seed=4, as_batch=True)
+        for field in SHARED_FIELDS + ("movie", "industry"):
+            a, b = first.columns[field], second.columns[field]
+            self.assertEqual(list(a.categories), list(b.categories))
+            # The same string always has the same code
+            codes = {value: code for value, code in zip(a.astype(object), a.codes)}
+            for value, code in zip(b.astype(object), b.codes):
+                if value in codes:
+                    self.assertEqual(codes[value], code)
+
+    def test_concat_keeps_the_shared_codes(self):
+        chunks = list(TweetGenerator.iter_tweets("sports", 900, chunk_size=300, seed=8))
+        merged = TweetBatch.concat(chunks)
+        for field in SHARED_FIELDS:
+            self.assertIs(merged.columns[field].dtype, chunks[0].columns[field].dtype)
+            np.testing.assert_array_equal(merged.columns[field].codes, np.concatenate([c.columns[field].codes for c in chunks]))
+
+    def test_records_share_one_string_per_value(self):
+        records = TweetGenerator.generate_travel_tweets(count=1000, seed=6, as_batch=True).to_records()
+        by_value = {}
+        for record in records:
+            for field in ("text", "user_location_raw"):
+                self.assertIs(by_value.setdefault(record[field], record[field]), record[field])
+
+    def test_shards_share_rendered_vocabularies(self):
+        batch = TweetGenerator.generate_sharded(
+            "travel", 4000, date(2024, 5, 1), date(2024, 5, 5), shard="day", workers=2, seed=42, as_batch=True,
+        )
+        # Texts and locations come from the per-process vocabulary, so every shard
+        # (and a separately generated batch) carries the same categorical dtype
+        other = TweetGenerator.generate_travel_tweets(count=100, seed=1, as_batch=True)
+        for field in ("text", "location"):
+            self.assertEqual(batch.columns[field].dtype, other.columns[field].dtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
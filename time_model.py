@@ -0,0 +1,167 @@
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+
+def _fromisoformat_seconds(value):
+    """Last-resort parse of a single value: (epoch seconds, UTC offset seconds), or None if it is not a timestamp."""
+    try:
+        dt = datetime.fromisoformat(value) if isinstance(value, str) else value
+    except ValueError:
+        return None
+    if not isinstance(dt, datetime):
+        return None
+    offset = dt.utcoffset()
+    if dt.tzinfo is None or offset is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+        offset = None
+    return int(dt.timestamp() // 1), 0 if offset is None else int(offset.total_seconds())
+
+
+def _utc_offsets(arr):
+    """UTC offset in seconds of each value as written (0 for naive and unparseable values)."""
+    offsets = np.zeros(len(arr), dtype=np.int64)
+    series = pd.Series(arr, dtype=object)
+    is_str = series.map(type).eq(str).to_numpy()
+    if is_str.any():
+        parts = series[is_str].str.extract(r"\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?([+-])(\d{2}):?(\d{2})$")
+        signed = parts[0].map({"+": 1, "-": -1}).fillna(0).to_numpy()
+        hours = pd.to_numeric(parts[1], errors="coerce").fillna(0).to_numpy()
+        minutes = pd.to_numeric(parts[2], errors="coerce").fillna(0).to_numpy()
+        offsets[is_str] = (signed * (hours * SECONDS_PER_HOUR + minutes * SECONDS_PER_MINUTE)).astype(np.int64)
+    for i in np.flatnonzero(~is_str):
+        value = arr[i]
+        offset = value.utcoffset() if isinstance(value, datetime) and value.tzinfo is not None else None
+        if offset is not None:
+            offsets[i] = int(offset.total_seconds())
+    return offsets
+
+
+def parse_timestamps(values):
+    """
+    created_at values (ISO strings, datetimes, or a datetime64 array) ->
+    (int64 epoch seconds, valid mask, int64 UTC offset seconds).
+    Naive values are read as UTC wall-clock time (offset 0); aware values are
+    converted to UTC and their own offset is kept, so local clock time is
+    seconds + offset. The whole column is parsed in one call; invalid entries are 0
+    in seconds and offsets and False in valid.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        stamps = values.astype("datetime64[s]")
+        valid = ~np.isnat(stamps)
+        seconds = stamps.astype(np.int64)
+        seconds[~valid] = 0
+        return seconds, valid, np.zeros(len(seconds), dtype=np.int64)
+
+    arr = np.asarray(values, dtype=object)
+    try:
+        # numpy parses naive ISO strings/datetimes in C; offsets and junk fall through to pandas
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            stamps = arr.astype("datetime64[us]")
+        valid = ~np.isnat(stamps)
+        seconds = stamps.astype(np.int64) // 1_000_000
+        offsets = np.zeros(len(arr), dtype=np.int64)
+    except (ValueError, TypeError, UserWarning, DeprecationWarning):
+        try:
+            parsed = pd.to_datetime(pd.Series(arr, dtype=object), format="ISO8601", utc=True, errors="coerce")
+            valid = parsed.notna().to_numpy()
+            seconds = parsed.dt.tz_localize(None).to_numpy(dtype="datetime64[us]").astype(np.int64) // 1_000_000
+        except (ValueError, TypeError):
+            valid = np.zeros(len(arr), dtype=bool)
+            seconds = np.zeros(len(arr), dtype=np.int64)
+        offsets = _utc_offsets(arr)
+        # Formats pandas rejects in bulk (e.g. mixed strings and datetimes) get one more try each
+        for i in np.flatnonzero(~valid):
+            parsed_one = _fromisoformat_seconds(arr[i])
+            if parsed_one is not None:
+                seconds[i], offsets[i] = parsed_one
+                valid[i] = True
+    seconds[~valid] = 0
+    offsets[~valid] = 0
+    return seconds, valid, offsets
+
+
+def parse_epoch_seconds(values):
+    """(int64 epoch seconds, valid mask) from parse_timestamps(), for callers that only need UTC."""
+    seconds, valid, _ = parse_timestamps(values)
+    return seconds, valid
+
+
+class TimeColumn:
+    """
+    A column of tweet timestamps held as UTC epoch seconds plus a validity mask and
+    the UTC offset each value was written with.
+
+    Parsing happens once (parse()); hour-of-day, calendar dates and minute/hour
+    buckets are derived from the integer seconds on demand and memoized. Buckets and
+    dates are UTC; hour_of_day is the local clock hour of each value, as
+    datetime.hour gives it.
+    Unparseable timestamps are kept as invalid entries and counted rather than
+    silently replaced, so callers decide how to fill them.
+    """
+
+    def __init__(self, seconds, valid=None, offsets=None):
+        self.seconds = np.asarray(seconds, dtype=np.int64)
+        self.valid = np.ones(len(self.seconds), dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+        self.offsets = np.zeros(len(self.seconds), dtype=np.int64) if offsets is None else np.asarray(offsets, dtype=np.int64)
+        self._derived = {}
+
+    @classmethod
+    def parse(cls, values):
+        return cls(*parse_timestamps(values))
+
+    def __len__(self):
+        return len(self.seconds)
+
+    @property
+    def invalid_count(self):
+        """Number of timestamps that could not be parsed."""
+        return int(len(self.valid) - self.valid.sum())
+
+    def _memo(self, key, compute):
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+    def hour_of_day(self, fill=None):
+        """
+        Local clock hour (0-23) per timestamp, i.e. in the offset the value was
+        written with (naive values: as written). Invalid entries get fill, or the
+        current local hour if fill is None (the historical process_data behaviour).
+        """
+        hours = self._memo("hour_of_day", lambda: ((self.seconds + self.offsets) // SECONDS_PER_HOUR) % 24).copy()
+        if not self.valid.all():
+            hours[~self.valid] = datetime.now().hour if fill is None else fill
+        return hours
+
+    def buckets(self, size_seconds):
+        """Start of the size_seconds-wide bucket for each timestamp, as datetime64[s] (NaT if invalid)."""
+        def compute():
+            starts = (self.seconds - self.seconds % size_seconds).astype("datetime64[s]")
+            starts[~self.valid] = np.datetime64("NaT")
+            return starts
+        return self._memo(("buckets", size_seconds), compute)
+
+    def minute_buckets(self, minutes=1):
+        return self.buckets(minutes * SECONDS_PER_MINUTE)
+
+    def hour_buckets(self, hours=1):
+        return self.buckets(hours * SECONDS_PER_HOUR)
+
+    def dates(self):
+        """UTC calendar date per timestamp, as datetime64[D] (NaT if invalid)."""
+        return self._memo("dates", lambda: self.buckets(SECONDS_PER_DAY).astype("datetime64[D]"))
+
+    def timestamps(self):
+        """Timestamps as datetime64[s] (UTC, naive), NaT where invalid."""
+        return self.buckets(1)
+
+    def __repr__(self):
+        return f"TimeColumn(rows={len(self)}, invalid={self.invalid_count})"
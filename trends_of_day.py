@@ -2,6 +2,8 @@ import os
 from dotenv import load_dotenv
 from fetchers import TwitterFetcher, InstagramFetcher, NewsFetcher
 from collections import Counter
+from location_resolver import LocationResolver
+from time_model import TimeColumn
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +16,7 @@ INDIAN_LOCATIONS = [
     "Varanasi", "Agra", "Udaipur", "Shimla", "Ladakh", "Mysore", "Ooty", "Darjeeling",
     "Andaman", "Kolkata", "Chennai", "Hyderabad", "Pune", "Amritsar", "Jaisalmer"
 ]
+INDIAN_LOCATION_RESOLVER = LocationResolver(dict.fromkeys(INDIAN_LOCATIONS))
 
 from textblob import TextBlob
 
@@ -30,26 +33,26 @@ def analyze_trends():
 
     print("\n--- Analyzing Twitter Data ---")
     
+    # Parse every created_at in one call (strings from mock data, datetimes from the API)
+    times = TimeColumn.parse([tweet['created_at'] for tweet in tweets])
+    if times.invalid_count:
+        print(f"Warning: {times.invalid_count} tweets have an unparseable created_at; using the current hour for them.")
+    hours = times.hour_of_day()
+
     # Group by location
     location_data = {}
     
-    for tweet in tweets:
+    for tweet, hour in zip(tweets, hours.tolist()):
         loc = tweet['location']
         if loc == "Unknown":
             continue
         
-        # Filter for Indian locations
-        # Simple check: is the location in our list? (Case insensitive partial match could be better but exact match for now)
-        is_indian = False
-        for indian_loc in INDIAN_LOCATIONS:
-            if indian_loc.lower() in loc.lower():
-                is_indian = True
-                # Normalize location name to the one in our list for cleaner grouping
-                loc = indian_loc 
-                break
-        
-        if not is_indian:
+        # Filter for Indian locations (case-insensitive partial match, cached per raw string)
+        indian_loc = INDIAN_LOCATION_RESOLVER.match(loc)
+        if indian_loc is None:
             continue
+        # Normalize location name to the one in our list for cleaner grouping
+        loc = indian_loc
             
         if loc not in location_data:
             location_data[loc] = {
@@ -64,21 +67,6 @@ def analyze_trends():
         blob = TextBlob(tweet['text'])
         sentiment = blob.sentiment.polarity
         
-        # Hourly Analysis
-        # Handle both datetime objects (real API) and strings (mock data)
-        created_at = tweet['created_at']
-        if isinstance(created_at, str):
-            from datetime import datetime
-            # Handle ISO format from mock data
-            try:
-                dt = datetime.fromisoformat(created_at)
-            except ValueError:
-                dt = datetime.now() # Fallback
-        else:
-            dt = created_at
-            
-        hour = dt.hour
-        
         location_data[loc]["tweets"].append(tweet)
         location_data[loc]["total_likes"] += tweet['likes']
         location_data[loc]["total_retweets"] += tweet['retweets']
@@ -0,0 +1,482 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from time_model import TimeColumn, parse_timestamps
+
+# Fields always decoded as timestamps / integer counts, whatever their values look like
+TIME_FIELDS = ("created_at",)
+COUNT_FIELDS = ("likes", "retweets", "replies", "quotes")
+
+
+def _infer_kind(name, values):
+    if name in TIME_FIELDS:
+        return "time"
+    if name in COUNT_FIELDS:
+        return "count"
+    kinds = set(map(type, values))
+    kinds.discard(type(None))
+    if not kinds or kinds == {str}:
+        return "str"
+    if kinds <= {int, np.int64, np.int32}:
+        return "count"
+    if kinds <= {float, int, np.float64}:
+        return "float"
+    return "object"
+
+
+def _encode_time(values):
+    """(epoch seconds IntegerArray, int32 UTC offsets or None if every value is naive/UTC)."""
+    seconds, valid, offsets = parse_timestamps(values)
+    return pd.arrays.IntegerArray(seconds, ~valid), offsets.astype(np.int32) if offsets.any() else None
+
+
+def _offset_suffix(offset):
+    """ISO 8601 suffix for a UTC offset in seconds, as datetime.isoformat() writes it."""
+    sign = "+" if offset >= 0 else "-"
+    hours, minutes = divmod(abs(int(offset)) // 60, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def _encode(kind, values):
+    """Encode one column of Python values according to its kind."""
+    if kind == "time":
+        return _encode_time(values)[0]
+    if kind == "count":
+        try:
+            data = np.asarray(values, dtype=np.int64)
+            mask = np.zeros(len(data), dtype=bool)
+        except (TypeError, ValueError):
+            nullable = pd.array(values, dtype="Int64")
+            data = nullable.to_numpy(dtype=np.int64, na_value=0)
+            mask = nullable.isna()
+        bounds = np.iinfo(np.int32)
+        if not len(data) or (bounds.min <= data.min() and data.max() <= bounds.max):
+            data = data.astype(np.int32)
+        return pd.arrays.IntegerArray(data, mask)
+    if kind == "str":
+        return pd.Categorical(values)
+    if kind == "float":
+        return np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.asarray(values, dtype=object)
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _union_categoricals(parts):
+    """
+    Concatenate categoricals with different vocabularies: one factorize over all the
+    vocabularies gives every part's old code -> merged code table, so the cost is one
+    hash pass over the categories however many parts there are. Categories keep
+    first-appearance order, like union_categoricals(ignore_order=True).
+    """
+    if all(p.dtype == parts[0].dtype for p in parts[1:]):
+        # Shared vocabulary (e.g. generator chunks): nothing to remap
+        return pd.Categorical.from_codes(np.concatenate([p.codes for p in parts]), dtype=parts[0].dtype)
+    vocabularies = [np.asarray(p.categories, dtype=object) for p in parts]
+    merged_codes, categories = pd.factorize(np.concatenate(vocabularies))
+    offsets = np.cumsum([0] + [len(v) for v in vocabularies])
+    codes = np.concatenate([
+        np.where(p.codes < 0, -1, merged_codes[offset + np.maximum(p.codes, 0)])
+        for p, offset in zip(parts, offsets)
+    ])
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def factorize_column(values):
+    """
+    (codes, uniques) for a column, reusing existing dictionary encoding when the
+    column is already categorical. Missing values get their own code, so callers can
+    run per-distinct-value work over uniques and broadcast with uniques[codes].
+    """
+    if isinstance(values, pd.Categorical):
+        codes = values.codes
+        uniques = np.asarray(values.categories, dtype=object)
+        if (codes < 0).any():
+            uniques = np.append(uniques, None)
+            codes = np.where(codes < 0, len(uniques) - 1, codes)
+        return codes, uniques
+    return pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+
+
+class TweetRow:
+    """
+    Lightweight view of one tweet inside a TweetBatch.
+    Supports the dict-style access legacy code uses (row["text"], row.get("likes")),
+    attribute access (row.text) and to_dict() for a real legacy record.
+    """
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key):
+        if key not in self._batch.columns:
+            raise KeyError(key)
+        return self._batch.value(key, self._index)
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __contains__(self, key):
+        return key in self._batch.columns
+
+    def get(self, key, default=None):
+        if key not in self._batch.columns:
+            return default
+        return self._batch.value(key, self._index)
+
+    def keys(self):
+        return list(self._batch.columns)
+
+    def to_dict(self):
+        return {key: self._batch.value(key, self._index) for key in self._batch.columns}
+
+    def __repr__(self):
+        return f"TweetRow({self.to_dict()!r})"
+
+
+class TweetBatch:
+    """
+    Struct-of-arrays container for tweets, used as the internal exchange format
+    between the fetchers, TweetGenerator and process_data.
+
+    Column storage:
+    - created_at: nullable int64 epoch seconds (naive timestamps read as UTC wall-clock);
+      for aware timestamps the UTC offset each was written with is kept in
+      time_offsets, so they come back in their own offset
+    - likes / retweets / replies / quotes and other int fields: nullable Int32/Int64 arrays
+    - string fields: pandas Categorical (int codes + one shared vocabulary)
+    - anything else: float64 or object arrays
+
+    from_records()/to_records() convert from/to the legacy list-of-dicts format. Keys
+    missing from some records come back as None, and timestamps are rounded to whole
+    seconds and returned as ISO strings.
+    """
+
+    def __init__(self, columns=None, tz_aware=False, time_offsets=None):
+        self.columns = dict(columns or {})
+        self.tz_aware = tz_aware
+        self.time_offsets = dict(time_offsets or {})
+        lengths = {len(col) for col in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"TweetBatch columns have different lengths: {sorted(lengths)}")
+        self._length = lengths.pop() if lengths else 0
+
+    # --- construction -------------------------------------------------------------
+
+    @classmethod
+    def from_columns(cls, columns, tz_aware=None):
+        """Build a batch from {field: list of Python values}, encoding each column by kind."""
+        encoded = {}
+        offsets = {}
+        for name, values in columns.items():
+            values = list(values) if not isinstance(values, (list, np.ndarray)) else values
+            kind = _infer_kind(name, values)
+            if kind == "time":
+                encoded[name], column_offsets = _encode_time(values)
+                if column_offsets is not None:
+                    offsets[name] = column_offsets
+            else:
+                encoded[name] = _encode(kind, values)
+        if tz_aware is None:
+            created_at = columns.get("created_at")
+            tz_aware = bool(
+                "created_at" in offsets
+                or (created_at is not None and len(created_at) and getattr(created_at[0], "tzinfo", None))
+            )
+        return cls(encoded, tz_aware=tz_aware, time_offsets=offsets)
+
+    @classmethod
+    def from_records(cls, tweets):
+        """Build a batch from the legacy list of tweet dicts."""
+        if isinstance(tweets, cls):
+            return tweets
+        tweets = list(tweets)
+        fields = {}
+        for tweet in tweets:
+            for key in tweet:
+                fields.setdefault(key, None)
+        return cls.from_columns({key: [tweet.get(key) for tweet in tweets] for key in fields})
+
+    @classmethod
+    def concat(cls, batches):
+        """Concatenate batches in order; fields missing from a batch are filled with NA."""
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls()
+        if len(batches) == 1:
+            return batches[0]
+        fields = {}
+        for batch in batches:
+            for key in batch.columns:
+                fields.setdefault(key, None)
+        columns = {}
+        for key in fields:
+            parts = [b.columns[key] if key in b.columns else b._missing(key, batches) for b in batches]
+            if isinstance(parts[0], pd.Categorical):
+                columns[key] = _union_categoricals(parts)
+            elif isinstance(parts[0], np.ndarray):
+                columns[key] = np.concatenate(parts)
+            else:
+                columns[key] = pd.concat([pd.Series(p) for p in parts], ignore_index=True).array
+        offsets = {
+            key: np.concatenate([b._offsets(key) for b in batches])
+            for key in fields if any(key in b.time_offsets for b in batches)
+        }
+        return cls(columns, tz_aware=any(b.tz_aware for b in batches), time_offsets=offsets)
+
+    def _missing(self, key, batches):
+        """An all-NA column shaped like `key` in the other batches."""
+        template = next(b.columns[key] for b in batches if key in b.columns)
+        if isinstance(template, pd.Categorical):
+            return pd.Categorical([None] * len(self), categories=template.categories)
+        if isinstance(template, np.ndarray):
+            return np.full(len(self), np.nan if template.dtype.kind == "f" else None, dtype=template.dtype)
+        return pd.array([None] * len(self), dtype=template.dtype)
+
+    def with_column(self, name, values):
+        """New batch with one column added or replaced; a scalar is broadcast to every row."""
+        if np.isscalar(values) or values is None:
+            values = [values] * len(self)
+        columns = dict(self.columns)
+        offsets = dict(self.time_offsets)
+        offsets.pop(name, None)
+        kind = _infer_kind(name, values)
+        if kind == "time":
+            columns[name], column_offsets = _encode_time(values)
+            if column_offsets is not None:
+                offsets[name] = column_offsets
+        else:
+            columns[name] = _encode(kind, values)
+        return TweetBatch(columns, tz_aware=self.tz_aware, time_offsets=offsets)
+
+    def take(self, indices):
+        """Row subset (or reordering) by integer positions."""
+        indices = np.asarray(indices)
+        return TweetBatch(
+            {key: col[indices] for key, col in self.columns.items()},
+            tz_aware=self.tz_aware,
+            time_offsets={key: offsets[indices] for key, offsets in self.time_offsets.items()},
+        )
+
+    # --- access -------------------------------------------------------------------
+
+    @property
+    def fields(self):
+        return list(self.columns)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield TweetRow(self, i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(self._length)[index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return TweetRow(self, index)
+
+    def value(self, key, index):
+        """Decoded Python value of one cell."""
+        col = self.columns[key]
+        if isinstance(col, pd.Categorical):
+            code = col.codes[index]
+            return None if code < 0 else col.categories[code]
+        value = col[index]
+        if value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+            return None
+        if key in TIME_FIELDS:
+            return self._format_time(int(value), int(self._offsets(key)[index]))
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    def _format_time(self, seconds, offset=0):
+        stamp = datetime.fromtimestamp(seconds, tz=timezone(timedelta(seconds=offset)))
+        return stamp.isoformat() if self.tz_aware else stamp.replace(tzinfo=None).isoformat()
+
+    def _offsets(self, name):
+        """UTC offset seconds per row of a time column (zeros when it was all naive/UTC)."""
+        offsets = self.time_offsets.get(name)
+        return np.zeros(len(self), dtype=np.int32) if offsets is None else offsets
+
+    def epoch_seconds(self, name="created_at"):
+        """(int64 epoch seconds, valid mask) for a time column."""
+        col = self.columns[name]
+        return col.to_numpy(dtype=np.int64, na_value=0), ~col.isna()
+
+    def times(self, name="created_at"):
+        """A time column as a TimeColumn (hour/date/minute buckets on demand)."""
+        return TimeColumn(*self.epoch_seconds(name), offsets=self._offsets(name))
+
+    def categorical(self, name):
+        """The dictionary-encoded column itself (codes + vocabulary), for per-distinct-value work."""
+        col = self.columns[name]
+        return col if isinstance(col, pd.Categorical) else pd.Categorical(self.column(name))
+
+    def column(self, name):
+        """
+        Whole column decoded for DataFrame construction: str/object arrays for strings,
+        int64 arrays for complete counts, object arrays with None where values are missing.
+        """
+        col = self.columns[name]
+        if isinstance(col, pd.Categorical):
+            if len(col.categories) == 0:
+                return np.full(len(col), None, dtype=object)
+            categories = pd.Series(np.asarray(col.categories, dtype=object)).array
+            return categories.take(col.codes, allow_fill=True)
+        if name in TIME_FIELDS:
+            return self._objects(name)
+        if isinstance(col, np.ndarray):
+            return col
+        if col.isna().any():
+            return col.to_numpy(dtype=object, na_value=None)
+        return col.to_numpy(dtype=np.int64)
+
+    def _objects(self, name):
+        """Column as a Python-object ndarray with None for missing values."""
+        col = self.columns[name]
+        if isinstance(col, pd.Categorical):
+            # Code -1 (missing) indexes the trailing None
+            return np.append(np.asarray(col.categories, dtype=object), None)[col.codes]
+        if name in TIME_FIELDS:
+            seconds, valid = self.epoch_seconds(name)
+            offsets = self._offsets(name)
+            stamps = np.datetime_as_string((seconds + offsets).astype("datetime64[s]")).astype(object)
+            if self.tz_aware:
+                # Local clock time plus its own offset, one suffix string per distinct offset
+                uniques, inverse = np.unique(offsets, return_inverse=True)
+                stamps = stamps + np.array([_offset_suffix(o) for o in uniques], dtype=object)[inverse]
+            stamps[~valid] = None
+            return stamps
+        if isinstance(col, np.ndarray):
+            return col.astype(object)
+        return col.to_numpy(dtype=object, na_value=None)
+
+    def to_records(self):
+        """Legacy list of tweet dicts."""
+        keys = list(self.columns)
+        decoded = [self._objects(key).tolist() for key in keys]
+        return [dict(zip(keys, values)) for values in zip(*decoded)]
+
+    def to_frame(self):
+        """DataFrame with one column per field; strings stay categorical."""
+        return pd.DataFrame(dict(self.columns))
+
+    # --- persistence ----------------------------------------------------------------
+
+    def save(self, path):
+        """
+        Write the batch to a compressed .npz file: categorical codes + vocabularies,
+        integer data + null masks and float arrays are stored as-is, so loading
+        needs no re-encoding. Object columns are stored as JSON text.
+        """
+        arrays = {}
+        layout = []
+        for name, col in self.columns.items():
+            if isinstance(col, pd.Categorical):
+                layout.append([name, "categorical"])
+                arrays[f"{name}.codes"] = col.codes
+                arrays[f"{name}.categories"] = np.asarray(col.categories, dtype=str)
+            elif isinstance(col, pd.arrays.IntegerArray):
+                layout.append([name, "integer"])
+                arrays[f"{name}.data"] = col.to_numpy(dtype=col.dtype.numpy_dtype, na_value=0)
+                arrays[f"{name}.mask"] = np.asarray(col.isna())
+            elif col.dtype.kind == "f":
+                layout.append([name, "float"])
+                arrays[f"{name}.data"] = col
+            else:
+                layout.append([name, "object"])
+                arrays[f"{name}.data"] = np.array(json.dumps([_jsonable(v) for v in col.tolist()]))
+        for name, offsets in self.time_offsets.items():
+            arrays[f"{name}.offsets"] = offsets
+        arrays["__layout__"] = np.array(json.dumps({
+            "columns": layout, "tz_aware": self.tz_aware, "time_offsets": sorted(self.time_offsets),
+        }))
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Read a batch written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            layout = json.loads(str(data["__layout__"]))
+            columns = {}
+            for name, kind in layout["columns"]:
+                if kind == "categorical":
+                    columns[name] = pd.Categorical.from_codes(
+                        data[f"{name}.codes"], categories=data[f"{name}.categories"].astype(object)
+                    )
+                elif kind == "integer":
+                    columns[name] = pd.arrays.IntegerArray(data[f"{name}.data"], data[f"{name}.mask"])
+                elif kind == "float":
+                    columns[name] = data[f"{name}.data"]
+                else:
+                    columns[name] = np.asarray(json.loads(str(data[f"{name}.data"])), dtype=object)
+            offsets = {name: data[f"{name}.offsets"] for name in layout.get("time_offsets", [])}
+        return cls(columns, tz_aware=layout["tz_aware"], time_offsets=offsets)
+
+    def memory_bytes(self):
+        """Approximate payload size of all columns, vocabularies included."""
+        total = 0
+        for col in self.columns.values():
+            if isinstance(col, pd.Categorical):
+                total += col.codes.nbytes + int(pd.Series(col.categories).memory_usage(deep=True))
+            else:
+                total += col.nbytes
+        return total + sum(offsets.nbytes for offsets in self.time_offsets.values())
+
+    def __repr__(self):
+        return f"TweetBatch({self._length} tweets, fields={self.fields})"
+
+
+class TweetBatchBuilder:
+    """
+    Accumulates tweets column by column, so generators never allocate a dict per tweet.
+    build() returns a TweetBatch; records() returns the legacy list of dicts.
+    """
+
+    def __init__(self):
+        self._columns = {}
+        self._length = 0
+
+    def append(self, **fields):
+        for key, value in fields.items():
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = [None] * self._length
+            column.append(value)
+        self._length += 1
+        if len(fields) != len(self._columns):
+            for column in self._columns.values():
+                if len(column) < self._length:
+                    column.append(None)
+
+    def __len__(self):
+        return self._length
+
+    def build(self):
+        return TweetBatch.from_columns(self._columns)
+
+    def records(self):
+        keys = list(self._columns)
+        return [dict(zip(keys, values)) for values in zip(*self._columns.values())]
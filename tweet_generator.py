@@ -1,5 +1,126 @@
-import random
-from datetime import datetime, timedelta
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from tweet_batch import TweetBatch
+from workload_profiles import (
+    draw_bursts,
+    draw_diurnal_times,
+    heavy_tailed_likes,
+    heavy_tailed_users,
+    pick_entities,
+    resolve_workload,
+    slice_edges,
+    slice_sizes,
+)
+
+EPOCH = datetime(1970, 1, 1)
+DEFAULT_CHUNK_SIZE = 100_000
+SHARD_SECONDS = {"hour": 3600, "day": 86400}
+
+SEXES = ["M", "F", "Other"]
+AGE_GROUPS = ["18-24", "25-34", "35-44", "45+"]
+
+# Per-topic engagement and audience mix: base likes range, likes multiplier range,
+# retweet ratio range, sex weights, age-group weights, user name prefix
+TOPIC_PROFILES = {
+    "travel": {"likes": (50, 1000), "like_mult": (0.8, 1.5), "retweet_ratio": (0.1, 0.3),
+               "sex_weights": [4, 4, 1], "age_weights": [3, 4, 2, 1], "user_prefix": "Traveler"},
+    "politics": {"likes": (100, 1500), "like_mult": (0.8, 1.5), "retweet_ratio": (0.1, 0.35),
+                 "sex_weights": [5, 3, 1], "age_weights": [2, 4, 3, 2], "user_prefix": "Voter"},
+    "sports": {"likes": (100, 2000), "like_mult": (0.8, 1.5), "retweet_ratio": (0.15, 0.4),
+               "sex_weights": [4, 3, 1], "age_weights": [3, 4, 2, 1], "user_prefix": "Fan"},
+    "cinema": {"likes": (50, 1200), "like_mult": (0.8, 1.6), "retweet_ratio": (0.1, 0.35),
+               "sex_weights": [4, 4, 1], "age_weights": [3, 4, 2, 1], "user_prefix": "MovieFan"},
+}
+
+# Cinema tweet texts, rendered per (movie, location)
+CINEMA_TEMPLATES = [
+    "Watching {movie} in {loc} tonight! #{industry}",
+    "{movie} buzz in {loc} is unreal right now. #{industry}",
+    "Debating {movie} with friends in {loc} – what a film! #{industry}",
+    "{movie} shows almost full in {loc}. Hype is real. #{industry}",
+    "Tickets for {movie} sold out in {loc}! #{industry}",
+]
+
+
+def _window(from_date, end_date):
+    """[start, end] datetimes of a generation window; defaults to today up to now."""
+    now = datetime.now()
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0) if from_date is None else datetime.combine(from_date, datetime.min.time())
+    end = now if end_date is None else datetime.combine(end_date, datetime.max.time())
+    return start, end
+
+
+def _window_seconds(from_date, end_date):
+    """(start, end) of a generation window as epoch seconds; end may be fractional."""
+    start, end = _window(from_date, end_date)
+    start_s = int((start - EPOCH).total_seconds())
+    return start_s, start_s + (end - start).total_seconds()
+
+
+def _draw_times(rng, count, start_s, end_s, align_fill_to_hour=False):
+    """
+    Epoch seconds for the window [start_s, end_s]: at least count // hours tweets in
+    every hour (in hour order), then uniform fill up to count. Returns an int64 array
+    of max(count, hours * per_hour) timestamps, all inside the window.
+    """
+    span = end_s - start_s
+    # Whole hours only: a trailing partial hour is left to the uniform fill, and a
+    # window shorter than an hour (a generator chunk) is covered as one short "hour"
+    total_hours = max(1, int((span + 1) // 3600))
+    min_per_hour = max(1, count // total_hours)
+    hour_offsets = np.arange(total_hours, dtype=np.int64) * 3600
+    widths = np.minimum(3600, int(span) - hour_offsets + 1)
+    covered = start_s + np.repeat(hour_offsets, min_per_hour)
+    covered += rng.integers(0, np.repeat(widths, min_per_hour))
+    fill = start_s + (rng.random(max(0, count - len(covered))) * span).astype(np.int64)
+    if align_fill_to_hour:
+        fill = fill - fill % 3600 + rng.integers(0, 3600, len(fill))
+    # Hour-aligned fill can still cross the edges of a window that doesn't start on the hour
+    return np.clip(np.concatenate([covered, fill]), start_s, int(end_s))
+
+
+def _chunk_seed(seed, index):
+    """Independent seed for chunk `index`: derived from seed alone, so any chunk can be regenerated by itself."""
+    return np.random.SeedSequence(entropy=seed, spawn_key=(index,))
+
+
+def _dictionary(vocabulary):
+    """
+    (code remap, CategoricalDtype) for a rendered vocabulary that may repeat strings:
+    codes into the vocabulary map to dtype codes through the remap array.
+    """
+    remap, categories = pd.factorize(np.asarray(vocabulary, dtype=object))
+    return remap, pd.CategoricalDtype(categories)
+
+
+def _categorical(codes, dictionary):
+    remap, dtype = dictionary
+    return pd.Categorical.from_codes(remap[codes], dtype=dtype)
+
+
+def _force(codes, forced):
+    """codes with every row where forced >= 0 replaced by forced."""
+    return codes if forced is None else np.where(forced >= 0, forced, codes)
+
+
+def _pick_within(rng, group, group_sizes):
+    """Uniform index within each row's group, for groups of different sizes."""
+    return (rng.random(len(group)) * group_sizes[group]).astype(np.int64)
+
+
+def _flatten(groups):
+    """(flat list, start offset of each group) for a list of lists."""
+    sizes = np.array([len(g) for g in groups], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    return [item for g in groups for item in g], sizes, offsets
+
+
 
 class TweetGenerator:
     """Generates large volumes of realistic mock tweet data"""
@@ -372,311 +493,326 @@ class TweetGenerator:
     ]
 
     @staticmethod
-    def generate_travel_tweets(count=5000, from_date=None, end_date=None):
-        """Generate travel tweets"""
-        tweets = []
-        locations = list(TweetGenerator.TRAVEL_TEMPLATES.keys())
-        now = datetime.now()
-        
-        # Use provided dates or default to today
-        if from_date is None:
-            from_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
-            from_date = datetime.combine(from_date, datetime.min.time())
-        
-        if end_date is None:
-            end_date = now
+    @lru_cache(maxsize=None)
+    def _vocabulary(topic):
+        """
+        Every text a topic can produce, rendered once per process: the finite
+        template x entity combinations, grouped so draws only pick codes.
+        Returns a dict of dictionaries, group sizes/offsets and lookup arrays.
+        """
+        if topic == "travel":
+            locations = list(TweetGenerator.TRAVEL_TEMPLATES.keys())
+            groups = [[t.format(loc=loc) for t in TweetGenerator.TRAVEL_TEMPLATES[loc]] for loc in locations]
+            vocab = {"entities": locations}
+        elif topic == "politics":
+            parties = list(TweetGenerator.POLITICS_TEMPLATES.values())
+            politicians = list(TweetGenerator.POLITICIAN_TEMPLATES.values())
+            locations = list(TweetGenerator.POLITICS_LOCATIONS)
+            groups = parties + politicians
+            vocab = {
+                "parties": len(parties),
+                "politicians": len(politicians),
+                "entities": list(TweetGenerator.POLITICS_TEMPLATES) + list(TweetGenerator.POLITICIAN_TEMPLATES),
+            }
+        elif topic == "sports":
+            locations = list(TweetGenerator.TRAVEL_TEMPLATES.keys())
+            groups = list(TweetGenerator.SPORTS_TEMPLATES.values())
+            vocab = {"entities": list(TweetGenerator.SPORTS_TEMPLATES)}
         else:
-            end_date = datetime.combine(end_date, datetime.max.time())
-        
-        # Guarantee at least N tweets per hour in range
-        total_hours = int(((end_date - from_date).total_seconds()) // 3600) + 1
-        min_per_hour = max(1, count // max(1, total_hours))
-        for h in range(total_hours):
-            this_hour = from_date + timedelta(hours=h)
-            for _ in range(min_per_hour):
-                loc = random.choice(locations)
-                template = random.choice(TweetGenerator.TRAVEL_TEMPLATES[loc])
-                text = template.format(loc=loc)
-                # Random minute/second within hour
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                created_at = this_hour.replace(minute=minute, second=second)
-                base_likes = random.randint(50, 1000)
-                likes = int(base_likes * random.uniform(0.8, 1.5))
-                retweets = int(likes * random.uniform(0.1, 0.3))
-                # Mock basic user metadata for demographics
-                user_id = f"u{random.randint(1, 500000)}"
-                sex = random.choices(["M", "F", "Other"], weights=[4, 4, 1])[0]
-                age_group = random.choices(["18-24", "25-34", "35-44", "45+"], weights=[3, 4, 2, 1])[0]
-                tweets.append({
-                    "text": text,
-                    "location": loc,
-                    "likes": likes,
-                    "retweets": retweets,
-                    "created_at": created_at.isoformat(),
-                    # user-level fields
-                    "user_id": user_id,
-                    "user_name": f"Traveler {user_id}",
-                    "user_sex": sex,
-                    "user_age_group": age_group,
-                    "user_location_raw": f"{loc}, India",
-                })
-        # Fill remaining tweets randomly
-        while len(tweets) < count:
-            loc = random.choice(locations)
-            template = random.choice(TweetGenerator.TRAVEL_TEMPLATES[loc])
-            text = template.format(loc=loc)
-            rand_seconds = random.uniform(0, (end_date - from_date).total_seconds())
-            created_at = from_date + timedelta(seconds=rand_seconds)
-            base_likes = random.randint(50, 1000)
-            likes = int(base_likes * random.uniform(0.8, 1.5))
-            retweets = int(likes * random.uniform(0.1, 0.3))
-            user_id = f"u{random.randint(1, 500000)}"
-            sex = random.choices(["M", "F", "Other"], weights=[4, 4, 1])[0]
-            age_group = random.choices(["18-24", "25-34", "35-44", "45+"], weights=[3, 4, 2, 1])[0]
-            tweets.append({
-                "text": text,
-                "location": loc,
-                "likes": likes,
-                "retweets": retweets,
-                "created_at": created_at.isoformat(),
-                "user_id": user_id,
-                "user_name": f"Traveler {user_id}",
-                "user_sex": sex,
-                "user_age_group": age_group,
-                "user_location_raw": f"{loc}, India",
-            })
-        return tweets
-    
+            movies = list(TweetGenerator.CINEMA_MOVIES.keys())
+            locations = list(dict.fromkeys(
+                loc for meta in TweetGenerator.CINEMA_MOVIES.values() for loc in meta["locations"]
+            ))
+            # One group of rendered texts per (movie, hub location) pair
+            pairs = [(m, loc) for m in movies for loc in TweetGenerator.CINEMA_MOVIES[m]["locations"]]
+            groups = [
+                [t.format(movie=m, loc=loc, industry=TweetGenerator.CINEMA_MOVIES[m]["industry"].lower()) for t in CINEMA_TEMPLATES]
+                for m, loc in pairs
+            ]
+            hubs_per_movie = np.array([len(TweetGenerator.CINEMA_MOVIES[m]["locations"]) for m in movies], dtype=np.int64)
+            vocab = {
+                "entities": movies,
+                "movies": pd.CategoricalDtype(movies),
+                "industries": _dictionary([TweetGenerator.CINEMA_MOVIES[m]["industry"] for m in movies]),
+                "hubs_per_movie": hubs_per_movie,
+                "first_pair": np.concatenate([[0], np.cumsum(hubs_per_movie)[:-1]]),
+                "pair_loc": np.array([locations.index(loc) for _, loc in pairs], dtype=np.int64),
+            }
+        templates, sizes, offsets = _flatten(groups)
+        vocab.update(
+            text=_dictionary(templates),
+            sizes=sizes,
+            offsets=offsets,
+            locations=pd.CategoricalDtype(locations),
+            user_locations=pd.CategoricalDtype([f"{loc}, India" for loc in locations]),
+        )
+        return vocab
+
+    # Each _draw_<topic> picks the topic's primary entity (location, party/politician,
+    # sport, movie) per tweet, Zipf-skewed when skew is set; rows with forced >= 0 (viral
+    # burst tweets) get that entity instead.
+
     @staticmethod
-    def generate_politics_tweets(count=5000, from_date=None, end_date=None):
-        """Generate politics tweets"""
-        tweets = []
-        parties = list(TweetGenerator.POLITICS_TEMPLATES.keys())
-        politicians = list(TweetGenerator.POLITICIAN_TEMPLATES.keys())
-        politics_locs = list(TweetGenerator.POLITICS_LOCATIONS)
-        now = datetime.now()
-        
-        # Use provided dates or default to today
-        if from_date is None:
-            from_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    def _draw_travel(rng, n, skew=None, forced=None):
+        vocab = TweetGenerator._vocabulary("travel")
+        loc = _force(pick_entities(rng, len(vocab["entities"]), n, skew), forced)
+        text = vocab["offsets"][loc] + _pick_within(rng, loc, vocab["sizes"])
+        return _categorical(text, vocab["text"]), loc, vocab, {}
+
+    @staticmethod
+    def _draw_politics(rng, n, skew=None, forced=None):
+        vocab = TweetGenerator._vocabulary("politics")
+        loc = pick_entities(rng, len(vocab["locations"].categories), n, skew)
+        if skew is None:
+            # 60% party templates, 40% politician templates
+            speaker = np.where(
+                rng.random(n) < 0.6,
+                rng.integers(0, vocab["parties"], n),
+                vocab["parties"] + rng.integers(0, vocab["politicians"], n),
+            )
         else:
-            from_date = datetime.combine(from_date, datetime.min.time())
-        
-        if end_date is None:
-            end_date = now
+            speaker = pick_entities(rng, len(vocab["entities"]), n, skew)
+        speaker = _force(speaker, forced)
+        text = vocab["offsets"][speaker] + _pick_within(rng, speaker, vocab["sizes"])
+        return _categorical(text, vocab["text"]), loc, vocab, {}
+
+    @staticmethod
+    def _draw_sports(rng, n, skew=None, forced=None):
+        vocab = TweetGenerator._vocabulary("sports")
+        sport = _force(pick_entities(rng, len(vocab["sizes"]), n, skew), forced)
+        text = vocab["offsets"][sport] + _pick_within(rng, sport, vocab["sizes"])
+        loc = pick_entities(rng, len(vocab["locations"].categories), n, skew)
+        return _categorical(text, vocab["text"]), loc, vocab, {}
+
+    @staticmethod
+    def _draw_cinema(rng, n, skew=None, forced=None):
+        vocab = TweetGenerator._vocabulary("cinema")
+        movie = _force(pick_entities(rng, len(vocab["entities"]), n, skew), forced)
+        pair = vocab["first_pair"][movie] + _pick_within(rng, movie, vocab["hubs_per_movie"])
+        text = vocab["offsets"][pair] + _pick_within(rng, pair, vocab["sizes"])
+        extra = {
+            "movie": pd.Categorical.from_codes(movie, dtype=vocab["movies"]),
+            "industry": _categorical(movie, vocab["industries"]),
+        }
+        return _categorical(text, vocab["text"]), vocab["pair_loc"][pair], vocab, extra
+
+    @staticmethod
+    def _generate(topic, count, from_date, end_date, as_batch=False, as_frame=False, rng=None, seed=None,
+                  workload=None):
+        """
+        Vectorized generator shared by every topic: each field is drawn for all tweets
+        at once from one numpy Generator and stored straight into TweetBatch columns.
+        The same seed, window and workload always produce the same tweets.
+        """
+        rng = np.random.default_rng(seed) if rng is None else rng
+        start_s, end_s = _window_seconds(from_date, end_date)
+        batch = TweetGenerator._draw_slice(topic, rng, count, start_s, end_s, resolve_workload(workload))
+        if as_batch:
+            return batch
+        return batch.to_frame() if as_frame else batch.to_records()
+
+    @staticmethod
+    def _draw_slice(topic, rng, count, start_s, end_s, workload, window=None):
+        """
+        count tweets in [start_s, end_s]. window is the whole generation window
+        (start, stop, total) when this is one chunk/shard of it, so viral bursts land
+        in the same place however the window is cut.
+        """
+        if not workload:
+            seconds = _draw_times(rng, count, start_s, end_s, align_fill_to_hour=(topic == "cinema"))
+            return TweetGenerator._build_batch(topic, rng, seconds)
+        burst_seconds, burst_entities, burst_boosts = draw_bursts(
+            rng, workload, count, start_s, int(end_s), window or (start_s, int(end_s) + 1, count),
+            TweetGenerator._vocabulary(topic)["entities"],
+        )
+        base = count - len(burst_seconds)
+        if workload.get("diurnal"):
+            seconds = draw_diurnal_times(rng, base, start_s, int(end_s), workload["diurnal"])
         else:
-            end_date = datetime.combine(end_date, datetime.max.time())
-        
-        total_hours = int(((end_date - from_date).total_seconds()) // 3600) + 1
-        min_per_hour = max(1, count // max(1, total_hours))
-        for h in range(total_hours):
-            this_hour = from_date + timedelta(hours=h)
-            for _ in range(min_per_hour):
-                loc = random.choice(politics_locs)
-                if random.random() < 0.6:
-                    party = random.choice(parties)
-                    text = random.choice(TweetGenerator.POLITICS_TEMPLATES[party])
-                else:
-                    politician = random.choice(politicians)
-                    text = random.choice(TweetGenerator.POLITICIAN_TEMPLATES[politician])
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                created_at = this_hour.replace(minute=minute, second=second)
-                base_likes = random.randint(100, 1500)
-                likes = int(base_likes * random.uniform(0.8, 1.5))
-                retweets = int(likes * random.uniform(0.1, 0.35))
-                user_id = f"u{random.randint(1, 500000)}"
-                sex = random.choices(["M", "F", "Other"], weights=[5, 3, 1])[0]
-                age_group = random.choices(["18-24", "25-34", "35-44", "45+"], weights=[2, 4, 3, 2])[0]
-                tweets.append({
-                    "text": text,
-                    "location": loc,
-                    "likes": likes,
-                    "retweets": retweets,
-                    "created_at": created_at.isoformat(),
-                    "user_id": user_id,
-                    "user_name": f"Voter {user_id}",
-                    "user_sex": sex,
-                    "user_age_group": age_group,
-                    "user_location_raw": f"{loc}, India",
-                })
-        while len(tweets) < count:
-            loc = random.choice(politics_locs)
-            if random.random() < 0.6:
-                party = random.choice(parties)
-                text = random.choice(TweetGenerator.POLITICS_TEMPLATES[party])
-            else:
-                politician = random.choice(politicians)
-                text = random.choice(TweetGenerator.POLITICIAN_TEMPLATES[politician])
-            rand_seconds = random.uniform(0, (end_date - from_date).total_seconds())
-            created_at = from_date + timedelta(seconds=rand_seconds)
-            base_likes = random.randint(100, 1500)
-            likes = int(base_likes * random.uniform(0.8, 1.5))
-            retweets = int(likes * random.uniform(0.1, 0.35))
-            user_id = f"u{random.randint(1, 500000)}"
-            sex = random.choices(["M", "F", "Other"], weights=[5, 3, 1])[0]
-            age_group = random.choices(["18-24", "25-34", "35-44", "45+"], weights=[2, 4, 3, 2])[0]
-            tweets.append({
-                "text": text,
-                "location": loc,
-                "likes": likes,
-                "retweets": retweets,
-                "created_at": created_at.isoformat(),
-                "user_id": user_id,
-                "user_name": f"Voter {user_id}",
-                "user_sex": sex,
-                "user_age_group": age_group,
-                "user_location_raw": f"{loc}, India",
-            })
-        return tweets
-    
+            seconds = _draw_times(rng, base, start_s, end_s, align_fill_to_hour=(topic == "cinema"))
+        base = len(seconds)
+        return TweetGenerator._build_batch(
+            topic, rng, np.concatenate([seconds, burst_seconds]), workload,
+            forced=np.concatenate([np.full(base, -1, dtype=np.int64), burst_entities]),
+            boost=np.concatenate([np.ones(base), burst_boosts]),
+        )
+
     @staticmethod
-    def generate_sports_tweets(count=5000, from_date=None, end_date=None):
-        """Generate sports tweets"""
-        tweets = []
-        sports = list(TweetGenerator.SPORTS_TEMPLATES.keys())
-        travel_locs = list(TweetGenerator.TRAVEL_TEMPLATES.keys())
-        now = datetime.now()
-        
-        # Use provided dates or default to today
-        if from_date is None:
-            from_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    def _build_batch(topic, rng, seconds, workload=None, forced=None, boost=None):
+        """Draw every non-time field for tweets at the given epoch seconds into a TweetBatch."""
+        workload = workload or {}
+        profile = TOPIC_PROFILES[topic]
+        n = len(seconds)
+
+        draw = getattr(TweetGenerator, f"_draw_{topic}")
+        text, loc, vocab, extra = draw(rng, n, workload.get("entity_zipf"), forced)
+
+        lo, hi = profile["likes"]
+        if workload.get("engagement_tail"):
+            likes = heavy_tailed_likes(rng, lo, n, workload["engagement_tail"])
         else:
-            from_date = datetime.combine(from_date, datetime.min.time())
-        
-        if end_date is None:
-            end_date = now
+            likes = (rng.integers(lo, hi + 1, n) * rng.uniform(*profile["like_mult"], n)).astype(np.int64)
+        if boost is not None:
+            likes = (likes * boost).astype(np.int64)
+        retweets = (likes * rng.uniform(*profile["retweet_ratio"], n)).astype(np.int64)
+
+        # Format each distinct user id once and store per-tweet codes into that vocabulary
+        if workload.get("user_zipf"):
+            numbers = heavy_tailed_users(rng, n, workload["user_zipf"])
         else:
-            end_date = datetime.combine(end_date, datetime.max.time())
-        
-        total_hours = int(((end_date - from_date).total_seconds()) // 3600) + 1
-        min_per_hour = max(1, count // max(1, total_hours))
-        for h in range(total_hours):
-            this_hour = from_date + timedelta(hours=h)
-            for _ in range(min_per_hour):
-                sport = random.choice(sports)
-                text = random.choice(TweetGenerator.SPORTS_TEMPLATES[sport])
-                loc = random.choice(travel_locs)
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                created_at = this_hour.replace(minute=minute, second=second)
-                base_likes = random.randint(100, 2000)
-                likes = int(base_likes * random.uniform(0.8, 1.5))
-                retweets = int(likes * random.uniform(0.15, 0.4))
-                user_id = f"u{random.randint(1, 500000)}"
-                sex = random.choices(["M", "F", "Other"], weights=[4, 3, 1])[0]
-                age_group = random.choices(["18-24", "25-34", "35-44", "45+"], weights=[3, 4, 2, 1])[0]
-                tweets.append({
-                    "text": text,
-                    "location": loc,
-                    "likes": likes,
-                    "retweets": retweets,
-                    "created_at": created_at.isoformat(),
-                    "user_id": user_id,
-                    "user_name": f"Fan {user_id}",
-                    "user_sex": sex,
-                    "user_age_group": age_group,
-                    "user_location_raw": f"{loc}, India",
-                })
-        while len(tweets) < count:
-            sport = random.choice(sports)
-            text = random.choice(TweetGenerator.SPORTS_TEMPLATES[sport])
-            loc = random.choice(travel_locs)
-            rand_seconds = random.uniform(0, (end_date - from_date).total_seconds())
-            created_at = from_date + timedelta(seconds=rand_seconds)
-            base_likes = random.randint(100, 2000)
-            likes = int(base_likes * random.uniform(0.8, 1.5))
-            retweets = int(likes * random.uniform(0.15, 0.4))
-            user_id = f"u{random.randint(1, 500000)}"
-            sex = random.choices(["M", "F", "Other"], weights=[4, 3, 1])[0]
-            age_group = random.choices(["18-24", "25-34", "35-44", "45+"], weights=[3, 4, 2, 1])[0]
-            tweets.append({
-                "text": text,
-                "location": loc,
-                "likes": likes,
-                "retweets": retweets,
-                "created_at": created_at.isoformat(),
-                "user_id": user_id,
-                "user_name": f"Fan {user_id}",
-                "user_sex": sex,
-                "user_age_group": age_group,
-                "user_location_raw": f"{loc}, India",
-            })
-        return tweets
+            numbers = rng.integers(1, 500001, n)
+        user_numbers, user_codes = np.unique(numbers, return_inverse=True)
+        user_ids = [f"u{number}" for number in user_numbers.tolist()]
+        user_names = [f"{profile['user_prefix']} {user_id}" for user_id in user_ids]
+
+        sex_p = np.asarray(profile["sex_weights"], dtype=float)
+        age_p = np.asarray(profile["age_weights"], dtype=float)
+        no_nulls = np.zeros(n, dtype=bool)
+        columns = {
+            "text": text,
+            "location": pd.Categorical.from_codes(loc, dtype=vocab["locations"]),
+            "likes": pd.arrays.IntegerArray(likes.astype(np.int32), no_nulls),
+            "retweets": pd.arrays.IntegerArray(retweets.astype(np.int32), no_nulls),
+            "created_at": pd.arrays.IntegerArray(seconds, no_nulls.copy()),
+            "user_id": pd.Categorical.from_codes(user_codes, categories=user_ids),
+            "user_name": pd.Categorical.from_codes(user_codes, categories=user_names),
+            "user_sex": pd.Categorical.from_codes(rng.choice(len(SEXES), n, p=sex_p / sex_p.sum()), categories=SEXES),
+            "user_age_group": pd.Categorical.from_codes(
+                rng.choice(len(AGE_GROUPS), n, p=age_p / age_p.sum()), categories=AGE_GROUPS
+            ),
+            "user_location_raw": pd.Categorical.from_codes(loc, dtype=vocab["user_locations"]),
+            **extra,
+        }
+        return TweetBatch(columns)
 
     @staticmethod
-    def generate_cinema_tweets(count=5000, from_date=None, end_date=None):
-        """Generate cinema/movie discussion tweets."""
-        tweets = []
-        movies = list(TweetGenerator.CINEMA_MOVIES.keys())
-        now = datetime.now()
-
-        # Use provided dates or default to today
-        if from_date is None:
-            from_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
-            from_date = datetime.combine(from_date, datetime.min.time())
+    def iter_tweets(topic, count, from_date=None, end_date=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, as_frame=False,
+                    workload=None):
+        """
+        Lazily generate count tweets as TweetBatch chunks of chunk_size rows (DataFrames
+        when as_frame=True), so memory stays bounded by one chunk whatever the count.
 
-        if end_date is None:
-            end_date = now
+        The window is split into one contiguous time slice per chunk (of equal diurnal
+        volume under a diurnal workload), so chunks come out in time order. Chunk i is
+        drawn from a seed derived from (seed, i), which makes every chunk reproducible
+        on its own for a given seed.
+        """
+        if topic not in TOPIC_PROFILES:
+            raise ValueError(f"Unknown topic: {topic}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        if count <= 0:
+            return
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        workload = resolve_workload(workload)
+        start_s, end_s = _window_seconds(from_date, end_date)
+        window = (start_s, int(end_s) + 1, count)
+        chunks = max(1, -(-count // chunk_size))
+        # Whole-second slice edges; each chunk ends the second before the next one starts
+        edges = slice_edges(window, chunks, workload)
+        for i in range(chunks):
+            size = min(chunk_size, count - i * chunk_size)
+            batch = _generate_slice(
+                topic, seed, i, size, int(edges[i]), int(max(edges[i], edges[i + 1] - 1)), workload, window
+            )
+            yield batch.to_frame() if as_frame else batch
+
+    @staticmethod
+    def generate_sharded(topic, count, from_date=None, end_date=None, shard="day", workers=None, seed=None,
+                         as_batch=False, as_frame=False, workload=None):
+        """
+        Generate count tweets by splitting the window into day (or hour) shards and
+        drawing each shard in a process pool, then concatenating them in time order.
+
+        Shard i gets a share of count proportional to its length (or diurnal volume) and a seed derived
+        from (seed, i), so the result for a given seed is identical for any number of
+        workers (workers=1 runs in-process; None uses every CPU).
+        """
+        if topic not in TOPIC_PROFILES:
+            raise ValueError(f"Unknown topic: {topic}")
+        if shard not in SHARD_SECONDS:
+            raise ValueError(f"shard must be one of {sorted(SHARD_SECONDS)}")
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        workload = resolve_workload(workload)
+        start_s, end_s = _window_seconds(from_date, end_date)
+        stop = int(end_s) + 1
+        width = SHARD_SECONDS[shard]
+        # Shard edges fall on day/hour boundaries; the first and last shard may be partial
+        edges = np.unique(np.concatenate([[start_s], np.arange(start_s - start_s % width + width, stop, width), [stop]]))
+        window = (start_s, stop, count)
+        sizes = slice_sizes(edges, window, workload)
+        jobs = [
+            (topic, seed, i, int(size), int(edges[i]), int(edges[i + 1] - 1), workload, window)
+            for i, size in enumerate(sizes) if size > 0
+        ]
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(jobs) == 1:
+            shards = [_generate_slice(*job) for job in jobs]
         else:
-            end_date = datetime.combine(end_date, datetime.max.time())
-
-        total_hours = int(((end_date - from_date).total_seconds()) // 3600) + 1
-        min_per_hour = max(1, count // max(1, total_hours))
-
-        def _make_tweet(movie_name, loc, this_hour):
-            meta = TweetGenerator.CINEMA_MOVIES[movie_name]
-            industry = meta["industry"]
-            # simple natural-language templates
-            templates = [
-                "Watching {movie} in {loc} tonight! #{industry}",
-                "{movie} buzz in {loc} is unreal right now. #{industry}",
-                "Debating {movie} with friends in {loc} – what a film! #{industry}",
-                "{movie} shows almost full in {loc}. Hype is real. #{industry}",
-                "Tickets for {movie} sold out in {loc}! #{industry}",
-            ]
-            text = random.choice(templates).format(movie=movie_name, loc=loc, industry=industry.lower())
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-            created_at = this_hour.replace(minute=minute, second=second)
-            base_likes = random.randint(50, 1200)
-            likes = int(base_likes * random.uniform(0.8, 1.6))
-            retweets = int(likes * random.uniform(0.1, 0.35))
-            user_id = f"u{random.randint(1, 500000)}"
-            sex = random.choices(["M", "F", "Other"], weights=[4, 4, 1])[0]
-            age_group = random.choices(["18-24", "25-34", "35-44", "45+"], weights=[3, 4, 2, 1])[0]
-            return {
-                "text": text,
-                "location": loc,
-                "likes": likes,
-                "retweets": retweets,
-                "created_at": created_at.isoformat(),
-                "user_id": user_id,
-                "user_name": f"MovieFan {user_id}",
-                "user_sex": sex,
-                "user_age_group": age_group,
-                "user_location_raw": f"{loc}, India",
-                "movie": movie_name,
-                "industry": industry,
-            }
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                # map() returns results in submission (time) order
+                shards = list(pool.map(_generate_slice, *zip(*jobs), chunksize=max(1, len(jobs) // (4 * workers))))
+        batch = TweetBatch.concat(shards)
+        if as_batch:
+            return batch
+        return batch.to_frame() if as_frame else batch.to_records()
+
+    @staticmethod
+    def generate_travel_tweets(count=5000, from_date=None, end_date=None, as_batch=False, as_frame=False, seed=None,
+                               chunk_size=None, workload=None):
+        """
+        Generate travel tweets (a TweetBatch when as_batch=True, a DataFrame when as_frame=True).
+        With chunk_size, returns an iterator of chunks instead (see iter_tweets);
+        workload selects a traffic profile from workload_profiles.WORKLOADS.
+        """
+        if chunk_size:
+            return TweetGenerator.iter_tweets("travel", count, from_date, end_date, chunk_size, seed, as_frame, workload)
+        return TweetGenerator._generate("travel", count, from_date, end_date, as_batch, as_frame, seed=seed, workload=workload)
+
+    @staticmethod
+    def generate_politics_tweets(count=5000, from_date=None, end_date=None, as_batch=False, as_frame=False, seed=None,
+                                 chunk_size=None, workload=None):
+        """
+        Generate politics tweets (a TweetBatch when as_batch=True, a DataFrame when as_frame=True).
+        With chunk_size, returns an iterator of chunks instead (see iter_tweets);
+        workload selects a traffic profile from workload_profiles.WORKLOADS.
+        """
+        if chunk_size:
+            return TweetGenerator.iter_tweets("politics", count, from_date, end_date, chunk_size, seed, as_frame, workload)
+        return TweetGenerator._generate("politics", count, from_date, end_date, as_batch, as_frame, seed=seed, workload=workload)
+
+    @staticmethod
+    def generate_sports_tweets(count=5000, from_date=None, end_date=None, as_batch=False, as_frame=False, seed=None,
+                               chunk_size=None, workload=None):
+        """
+        Generate sports tweets (a TweetBatch when as_batch=True, a DataFrame when as_frame=True).
+        With chunk_size, returns an iterator of chunks instead (see iter_tweets);
+        workload selects a traffic profile from workload_profiles.WORKLOADS.
+        """
+        if chunk_size:
+            return TweetGenerator.iter_tweets("sports", count, from_date, end_date, chunk_size, seed, as_frame, workload)
+        return TweetGenerator._generate("sports", count, from_date, end_date, as_batch, as_frame, seed=seed, workload=workload)
+
+    @staticmethod
+    def generate_cinema_tweets(count=5000, from_date=None, end_date=None, as_batch=False, as_frame=False, seed=None,
+                               chunk_size=None, workload=None):
+        """
+        Generate cinema/movie discussion tweets (a TweetBatch when as_batch=True, a DataFrame when as_frame=True).
+        With chunk_size, returns an iterator of chunks instead (see iter_tweets);
+        workload selects a traffic profile from workload_profiles.WORKLOADS.
+        """
+        if chunk_size:
+            return TweetGenerator.iter_tweets("cinema", count, from_date, end_date, chunk_size, seed, as_frame, workload)
+        return TweetGenerator._generate("cinema", count, from_date, end_date, as_batch, as_frame, seed=seed, workload=workload)
+
 
-        # Ensure dense hourly coverage
-        for h in range(total_hours):
-            this_hour = from_date + timedelta(hours=h)
-            for _ in range(min_per_hour):
-                movie_name = random.choice(movies)
-                loc = random.choice(TweetGenerator.CINEMA_MOVIES[movie_name]["locations"])
-                tweets.append(_make_tweet(movie_name, loc, this_hour))
-
-        # Fill remaining tweets randomly across window
-        while len(tweets) < count:
-            movie_name = random.choice(movies)
-            loc = random.choice(TweetGenerator.CINEMA_MOVIES[movie_name]["locations"])
-            rand_seconds = random.uniform(0, (end_date - from_date).total_seconds())
-            created_at = from_date + timedelta(seconds=rand_seconds)
-            tweets.append(_make_tweet(movie_name, loc, created_at))
-
-        return tweets
+def _generate_slice(topic, seed, index, count, start_s, end_s, workload=None, window=None):
+    """
+    One independently seeded slice of a chunked or sharded run: count tweets in
+    [start_s, end_s]. Module-level so process pool workers can run it.
+    """
+    rng = np.random.default_rng(_chunk_seed(seed, index))
+    return TweetGenerator._draw_slice(topic, rng, count, start_s, end_s, workload or {}, window)
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Profile fields taken from a Twitter v2 user object
+USER_FIELDS = ("name", "username", "location", "description")
+
+
+def _field(user, name):
+    return user.get(name) if isinstance(user, dict) else getattr(user, name, None)
+
+
+class UserProfileCache:
+    """
+    LRU/TTL cache of author profiles keyed by author id.
+
+    merge() takes the users of an author_id expansion (tweepy User objects or v2
+    dicts) and keeps their name, username, location and description; enrich() adds
+    derived demographics (e.g. sex, age_group) from slower sources, and those survive
+    later merges of the same author. A profile is served for ttl seconds after its
+    last merge; at most max_items authors are kept.
+    """
+
+    def __init__(self, max_items=50_000, ttl=24 * 3600):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _live(self, key, now):
+        profile = self._profiles.get(key)
+        if profile is None:
+            return None
+        if now - profile["cached_at"] >= self.ttl:
+            del self._profiles[key]
+            return None
+        self._profiles.move_to_end(key)
+        return profile
+
+    def get(self, author_id):
+        """Cached profile dict for author_id, or None."""
+        if author_id is None:
+            return None
+        with self._lock:
+            profile = self._live(str(author_id), time.time())
+            if profile is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(profile)
+
+    def missing(self, author_ids):
+        """The distinct ids of author_ids without a live profile, in order."""
+        now = time.time()
+        with self._lock:
+            return [
+                author_id for author_id in dict.fromkeys(a for a in author_ids if a is not None)
+                if self._live(str(author_id), now) is None
+            ]
+
+    def merge(self, users):
+        """Store or refresh the profiles of users (keeping enriched fields)."""
+        now = time.time()
+        with self._lock:
+            for user in users or []:
+                author_id = _field(user, "id")
+                if author_id is None:
+                    continue
+                key = str(author_id)
+                profile = self._profiles.pop(key, None) or {}
+                profile.update({name: _field(user, name) for name in USER_FIELDS})
+                profile["cached_at"] = now
+                self._profiles[key] = profile
+            while len(self._profiles) > self.max_items:
+                self._profiles.popitem(last=False)
+
+    def enrich(self, author_id, **fields):
+        """Attach derived fields (e.g. sex="F", age_group="25-34") to a cached author; False if not cached."""
+        with self._lock:
+            profile = self._profiles.get(str(author_id))
+            if profile is None:
+                return False
+            profile.update(fields)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self):
+        return {"profiles": len(self._profiles), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def __repr__(self):
+        return f"UserProfileCache(profiles={len(self)}, ttl={self.ttl})"
@@ -0,0 +1,220 @@
+from functools import lru_cache
+
+import numpy as np
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+# Relative tweet volume per hour of day: quiet overnight, a lunch bump and an evening peak
+DIURNAL_CURVE = [
+    0.35, 0.22, 0.15, 0.12, 0.12, 0.18, 0.35, 0.60, 0.80, 0.90, 0.95, 1.00,
+    1.10, 1.05, 0.95, 0.90, 0.95, 1.05, 1.25, 1.45, 1.55, 1.40, 1.00, 0.60,
+]
+
+# Named workload profiles for TweetGenerator (workload=<name> or a dict of the same keys):
+#   diurnal       - 24 hour-of-day volume weights (None: timestamps spread evenly)
+#   entity_zipf   - Zipf exponent for location/party/sport/movie popularity, most popular first
+#   engagement_tail - Pareto shape for likes (smaller = heavier tail); None keeps the uniform draw
+#   user_zipf     - Zipf-Mandelbrot exponent for tweets per user; None draws users uniformly
+#   bursts        - viral bursts: {"entity": name or None (most popular), "onset": fraction of
+#                   the window, "decay_minutes": e-folding time, "share": fraction of the
+#                   tweets, "boost": engagement multiplier}
+WORKLOADS = {
+    "uniform": {},
+    "diurnal": {"diurnal": DIURNAL_CURVE},
+    "skewed": {"entity_zipf": 1.2, "engagement_tail": 1.6, "user_zipf": 1.1},
+    "viral": {
+        "bursts": [{"entity": None, "onset": 0.5, "decay_minutes": 45, "share": 0.15, "boost": 8.0}],
+    },
+    "production": {
+        "diurnal": DIURNAL_CURVE,
+        "entity_zipf": 1.1,
+        "engagement_tail": 1.8,
+        "user_zipf": 1.1,
+        "bursts": [
+            {"entity": None, "onset": 0.35, "decay_minutes": 30, "share": 0.05, "boost": 10.0},
+            {"entity": None, "onset": 0.8, "decay_minutes": 120, "share": 0.08, "boost": 4.0},
+        ],
+    },
+}
+
+BURST_DEFAULTS = {"entity": None, "onset": 0.5, "decay_minutes": 60, "share": 0.1, "boost": 5.0}
+MAX_LIKES = 50_000_000
+# Zipf-Mandelbrot rank offset for user activity, so the busiest user is heavy but not dominant
+USER_RANK_OFFSET = 50
+
+
+def resolve_workload(workload):
+    """A workload name or dict -> profile dict (None and "uniform" give {})."""
+    if workload is None:
+        return {}
+    if isinstance(workload, str):
+        if workload not in WORKLOADS:
+            raise ValueError(f"Unknown workload: {workload} (expected one of {sorted(WORKLOADS)})")
+        return WORKLOADS[workload]
+    unknown = set(workload) - {"diurnal", "entity_zipf", "engagement_tail", "user_zipf", "bursts"}
+    if unknown:
+        raise ValueError(f"Unknown workload keys: {sorted(unknown)}")
+    curve = workload.get("diurnal")
+    if curve is not None and (len(curve) != 24 or min(curve) <= 0):
+        raise ValueError("diurnal must be 24 positive hour-of-day weights")
+    bursts = _bursts(workload)
+    if any(not 0 <= b["onset"] < 1 or b["decay_minutes"] <= 0 for b in bursts):
+        raise ValueError("burst onset must be in [0, 1) and decay_minutes positive")
+    if sum(b["share"] for b in bursts) > 1:
+        raise ValueError("burst shares add up to more than 1")
+    return dict(workload)
+
+
+def _bursts(workload):
+    return [{**BURST_DEFAULTS, **burst} for burst in workload.get("bursts", [])]
+
+
+def is_uniform_in_time(workload):
+    return not workload.get("diurnal") and not workload.get("bursts")
+
+
+# --- expected volume over time ---------------------------------------------------------
+# A generation window is (start, stop, total): epoch seconds [start, stop) and the
+# number of tweets in it. Chunked and sharded runs cut it into slices using the expected
+# tweet volume, so each slice reproduces its part of the diurnal curve and bursts.
+
+def diurnal_mass(seconds, curve):
+    """Integral of the hour-of-day weight curve from the epoch to each time, in weight x seconds."""
+    curve = np.asarray(curve, dtype=float)
+    at_hour = np.concatenate([[0.0], np.cumsum(curve) * SECONDS_PER_HOUR])
+    days, rest = np.divmod(np.asarray(seconds, dtype=np.int64), SECONDS_PER_DAY)
+    hours, into_hour = np.divmod(rest, SECONDS_PER_HOUR)
+    return days * at_hour[-1] + at_hour[hours] + into_hour * curve[hours]
+
+
+def _burst_cdf(burst, window, seconds):
+    """Unnormalized share of a burst's tweets before each time: 1 - exp(-(t - onset) / decay)."""
+    start, stop, _ = window
+    onset = start + burst["onset"] * (stop - start)
+    elapsed = np.maximum(0.0, np.asarray(seconds, dtype=float) - onset)
+    return 1.0 - np.exp(-elapsed / (burst["decay_minutes"] * 60.0))
+
+
+def _burst_fraction(burst, window, seconds):
+    """Fraction of a burst's tweets before each time; the burst is cut off at the window end."""
+    start, stop, _ = window
+    low, high = _burst_cdf(burst, window, [start, stop])
+    return (_burst_cdf(burst, window, seconds) - low) / (high - low)
+
+
+def expected_volume(seconds, window, workload):
+    """Expected number of tweets generated in [start, t) for each time t of the window."""
+    start, stop, total = window
+    seconds = np.asarray(seconds)
+    curve = workload.get("diurnal")
+    if curve:
+        base_start, base_stop = diurnal_mass([start, stop], curve)
+        base = (diurnal_mass(seconds, curve) - base_start) / (base_stop - base_start)
+    else:
+        base = (seconds - start) / (stop - start)
+    bursts = _bursts(workload)
+    volume = total * (1.0 - sum(b["share"] for b in bursts)) * base
+    for burst in bursts:
+        volume = volume + total * burst["share"] * _burst_fraction(burst, window, seconds)
+    return volume
+
+
+def slice_edges(window, parts, workload):
+    """parts + 1 whole-second edges cutting the window into slices of equal expected volume."""
+    start, stop, total = window
+    if is_uniform_in_time(workload):
+        return start + (stop - start) * np.arange(parts + 1, dtype=np.int64) // parts
+    grid = [np.arange(start - start % SECONDS_PER_HOUR, stop + SECONDS_PER_HOUR, SECONDS_PER_HOUR)]
+    for burst in _bursts(workload):
+        # A finer grid over each burst's first ten decay times, where volume changes fastest
+        onset = start + burst["onset"] * (stop - start)
+        grid.append(onset + burst["decay_minutes"] * 60.0 * np.linspace(0, 10, 400))
+    grid = np.unique(np.clip(np.concatenate(grid), start, stop))
+    volume = expected_volume(grid, window, workload)
+    edges = np.round(np.interp(total * np.arange(parts + 1) / parts, volume, grid)).astype(np.int64)
+    edges[0], edges[-1] = start, stop
+    return np.maximum.accumulate(edges)
+
+
+def slice_sizes(edges, window, workload):
+    """Tweets per slice between consecutive edges, in proportion to expected volume."""
+    start, stop, total = window
+    if is_uniform_in_time(workload):
+        cumulative = total * (edges - start) // (stop - start)
+    else:
+        cumulative = np.floor(expected_volume(edges, window, workload)).astype(np.int64)
+        cumulative[-1] = total
+    return np.diff(cumulative)
+
+
+def draw_diurnal_times(rng, count, start_s, end_s, curve):
+    """count epoch seconds in [start_s, end_s], spread over its hours by the hour-of-day curve."""
+    first_hour = start_s - start_s % SECONDS_PER_HOUR
+    hour_starts = np.maximum(np.arange(first_hour, end_s + 1, SECONDS_PER_HOUR, dtype=np.int64), start_s)
+    hour_ends = np.minimum(hour_starts - hour_starts % SECONDS_PER_HOUR + SECONDS_PER_HOUR, end_s + 1)
+    widths = hour_ends - hour_starts
+    weights = np.asarray(curve, dtype=float)[(hour_starts // SECONDS_PER_HOUR) % 24] * widths
+    per_hour = rng.multinomial(count, weights / weights.sum())
+    return np.repeat(hour_starts, per_hour) + rng.integers(0, np.repeat(widths, per_hour))
+
+
+def draw_bursts(rng, workload, count, start_s, end_s, window, entities):
+    """
+    The viral burst tweets of the window that fall in the slice [start_s, end_s]:
+    each burst contributes share x total tweets over the whole window, decaying
+    exponentially from its onset. Returns (epoch seconds, entity codes, engagement
+    multipliers), at most count rows.
+    """
+    window_start, window_stop, total = window
+    seconds, codes, boosts = [], [], []
+    remaining = count
+    for burst in _bursts(workload):
+        low, high = _burst_cdf(burst, window, [start_s, end_s + 1])
+        fraction = _burst_fraction(burst, window, [start_s, end_s + 1])
+        rows = min(remaining, int(round(burst["share"] * total * (fraction[1] - fraction[0]))))
+        if rows <= 0:
+            continue
+        remaining -= rows
+        onset = window_start + burst["onset"] * (window_stop - window_start)
+        offsets = -burst["decay_minutes"] * 60.0 * np.log1p(-rng.uniform(low, high, rows))
+        seconds.append(np.clip((onset + offsets).astype(np.int64), start_s, end_s))
+        codes.append(np.full(rows, 0 if burst["entity"] is None else entities.index(burst["entity"]), dtype=np.int64))
+        boosts.append(np.full(rows, float(burst["boost"])))
+    if not seconds:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.concatenate(seconds), np.concatenate(codes), np.concatenate(boosts)
+
+
+# --- popularity and engagement ---------------------------------------------------------
+
+def zipf_weights(k, exponent, offset=0):
+    """Zipf(-Mandelbrot) probabilities for ranks 1..k: 1 / (rank + offset) ** exponent."""
+    weights = 1.0 / (np.arange(1, k + 1) + offset) ** exponent
+    return weights / weights.sum()
+
+
+def pick_entities(rng, k, n, exponent=None):
+    """n codes in [0, k): uniform, or Zipf-ranked in declaration order when exponent is set."""
+    if exponent is None:
+        return rng.integers(0, k, n)
+    return rng.choice(k, n, p=zipf_weights(k, exponent))
+
+
+def heavy_tailed_likes(rng, low, n, shape):
+    """Pareto-distributed likes with minimum `low`, capped at MAX_LIKES."""
+    return np.minimum(low * (1.0 + rng.pareto(shape, n)), MAX_LIKES).astype(np.int64)
+
+
+@lru_cache(maxsize=8)
+def _user_cdf(exponent, user_space):
+    return np.cumsum(zipf_weights(user_space, exponent, offset=USER_RANK_OFFSET))
+
+
+def heavy_tailed_users(rng, n, exponent, user_space=500_000):
+    """
+    User numbers in [1, user_space] with Zipf-Mandelbrot activity: user 1 posts the
+    most, and a long tail of users post once or twice.
+    """
+    cdf = _user_cdf(exponent, user_space)
+    return np.minimum(np.searchsorted(cdf, rng.random(n) * cdf[-1]), user_space - 1) + 1